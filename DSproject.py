@@ -1,55 +1,465 @@
 # ------------------- IMPORTS & SETUP -------------------
+# The profiler is imported first so the other imports are measured too
+from salary_profile import PROFILER
+from salary_trace import TRACER
+import os
 import sys
-import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
-from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QLabel,
-    QPushButton, QStackedWidget, QListWidget, QListWidgetItem, QTableWidget,
-    QTableWidgetItem, QFileDialog, QComboBox, QHeaderView, QCheckBox, QMessageBox
-)
-from PyQt5.QtGui import QFont
-from PyQt5.QtCore import Qt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import LabelEncoder
-
-# ------------------- LOAD DATA -------------------
-def load_data(path):
-    df = pd.read_csv(path)
-    df.fillna('', inplace=True)
-    return df
+import time
+import bisect
+import threading
+from collections import OrderedDict, deque
+with PROFILER.phase("import numpy/pandas"):
+    import numpy as np
+    import pandas as pd
+with PROFILER.phase("import PyQt5"):
+    from PyQt5.QtWidgets import (
+        QApplication, QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QLabel,
+        QPushButton, QStackedWidget, QListWidget, QListWidgetItem, QTableView,
+        QFileDialog, QComboBox, QHeaderView, QCheckBox, QMessageBox, QProgressDialog
+    )
+    from PyQt5.QtGui import QFont
+    from PyQt5.QtCore import (
+        Qt, QObject, QThread, QTimer, QFileSystemWatcher, pyqtSignal, QAbstractTableModel, QModelIndex
+    )
+with PROFILER.phase("import salary modules"):
+    from salary_data import load_data, FEATURE_COLS, TARGET_COL
+    from salary_backend import PandasBackend, ArrowBackend, choose_backend, SERVICE_ENV
+    from salary_forest import FlatForest
+    from salary_insights import median_table, update_median_table, peer_median
+    from salary_ingest import Ingestor, append_frame
+    from salary_aggregates import AggregateCache, warm_in_background
+    from salary_charts import CHART_TYPES, CHART_COLUMNS, CHART_AGGREGATES, chart_data, draw_chart
+    from salary_export import EXPORT_FORMATS, export_frames, format_for_path
+    from salary_model import (
+        ModelStore, model_key, training_digest, fit_encoders, extend_encoders, copy_encoders,
+        encode_frame, train_model, refresh_model, TRAIN_SAMPLE_ROWS
+    )
+# matplotlib and sklearn are not imported here: matplotlib loads on a
+# background thread once the window is up (or on the first chart), and
+# sklearn only ever loads on the model thread.
+
+DATA_PATH = "salaries.csv"
+# Files landing in the watched directory are picked up after this quiet period
+INGEST_DEBOUNCE_MS = 1000
 
 # ------------------- DYNAMIC PLOT WINDOW -------------------
 class PlotWindow(QWidget):
-    def __init__(self, title, fig):
+    # Owns one Figure/canvas pair for its whole life; charts are redrawn into
+    # it rather than creating a new figure per click.
+    def __init__(self, figsize=(9, 6)):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
         super().__init__()
-        self.setWindowTitle(title)
         self.setGeometry(200, 200, 950, 680)
         layout = QVBoxLayout(self)
-        canvas = FigureCanvas(fig)
+        self.figure = Figure(figsize=figsize)
+        self.canvas = FigureCanvas(self.figure)
         # Apply 19px font to everything in the chart window
-        canvas.setStyleSheet("font-size: 19px;")
-        layout.addWidget(canvas)
+        self.canvas.setStyleSheet("font-size: 19px;")
+        layout.addWidget(self.canvas)
         self.setLayout(layout)
+        self.signature = None
+        self.artists = {}
+
+    def reset(self, signature):
+        self.figure.clear()
+        self.signature = signature
+        self.artists = {}
+        return self.figure.add_subplot()
+
+    def present(self, title):
+        self.setWindowTitle(title)
         self.show()
+        self.raise_()
+
+    def release(self):
+        self.figure.clear()
+        self.close()
+        self.deleteLater()
+
+# ------------------- CHART SURFACE POOL -------------------
+class ChartPool:
+    # A few chart windows keyed by slot (one per chart type, plus the second
+    # pie). The least recently used window is released past max_windows.
+    def __init__(self, max_windows=3, history=200):
+        self.max_windows = max_windows
+        self.windows = OrderedDict()
+        self.history = deque(maxlen=history)
+
+    def acquire(self, slot, figsize=(9, 6)):
+        win = self.windows.pop(slot, None)
+        if win is None:
+            win = PlotWindow(figsize)
+        self.windows[slot] = win
+        while len(self.windows) > self.max_windows:
+            _, old = self.windows.popitem(last=False)
+            old.release()
+        return win
+
+    def record(self, win, chart, total_s, draw_s, reused):
+        self.history.append({
+            "chart": chart,
+            "total_ms": round(total_s * 1e3, 2),
+            "draw_ms": round(draw_s * 1e3, 2),
+            "figure_bytes": figure_bytes(win),
+            "artists": len(win.figure.findobj()),
+            "reused_artists": reused,
+        })
+        return self.history[-1]
+
+    def stats(self):
+        return list(self.history)
+
+def figure_bytes(win):
+    # Raster buffer held by the Agg canvas; dominates a figure's footprint
+    try:
+        return win.canvas.buffer_rgba().nbytes
+    except AttributeError:
+        return 0
+
+# ------------------- VIRTUAL TABLE MODEL -------------------
+class SalaryTableModel(QAbstractTableModel):
+    # Serves cells straight from the column arrays; the view only asks for
+    # what is on screen, so row count does not affect memory or scroll speed.
+    def __init__(self, df, encoders):
+        super().__init__()
+        self.sort_state = None
+        self._load(df, encoders)
+
+    def _load(self, df, encoders):
+        self.columns = list(df.columns)
+        self.arrays = []
+        self.labels = []
+        for col in self.columns:
+            s = df[col]
+            if col in encoders:
+                self.arrays.append(s.to_numpy())
+                self.labels.append(np.asarray(encoders[col].classes_, dtype=object))
+            elif isinstance(s.dtype, pd.CategoricalDtype):
+                # Missing values are code -1, which indexes the trailing ''
+                self.arrays.append(s.cat.codes.to_numpy())
+                self.labels.append(np.append(s.cat.categories.astype(str).to_numpy(dtype=object), ""))
+            else:
+                self.arrays.append(s.to_numpy())
+                self.labels.append(None)
+        self.rows = np.arange(len(df))
+
+    def set_frame(self, df, encoders, rows):
+        # After an ingest: new column arrays, same columns and sort order
+        self.beginResetModel()
+        self._load(df, encoders)
+        self.rows = np.asarray(rows)
+        if self.sort_state is not None:
+            self.rows = self._sorted(self.rows, *self.sort_state)
+        self.endResetModel()
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self.rows = np.asarray(rows)
+        if self.sort_state is not None:
+            self.rows = self._sorted(self.rows, *self.sort_state)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        col = index.column()
+        value = self.arrays[col][self.rows[index.row()]]
+        labels = self.labels[col]
+        if labels is not None:
+            return str(labels[value])
+        return str(value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.columns[section]
+        return str(section + 1)
+
+    def sort_key(self, col):
+        labels = self.labels[col]
+        if labels is None:
+            return self.arrays[col]
+        # Codes are not guaranteed to follow label order, so sort by label rank
+        rank = np.empty(len(labels), dtype=np.int64)
+        rank[np.argsort(labels.astype(str), kind="stable")] = np.arange(len(labels))
+        return rank[self.arrays[col]]
+
+    def _sorted(self, rows, col, order):
+        keys = self.sort_key(col)[rows]
+        idx = np.argsort(keys, kind="stable")
+        if order == Qt.DescendingOrder:
+            idx = idx[::-1]
+        return rows[idx]
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        if column < 0:
+            # Unsorted: back to file order
+            self.sort_state = None
+            self.rows = np.sort(self.rows)
+        else:
+            self.sort_state = (column, order)
+            self.rows = self._sorted(self.rows, column, order)
+        self.layoutChanged.emit()
+
+# ------------------- PAGED TABLE MODEL -------------------
+class PagedTableModel(QAbstractTableModel):
+    # Out-of-core counterpart of SalaryTableModel: the row count and pages of
+    # decoded rows come from the query backend, and only the last few pages
+    # are kept, so scrolling a filtered view reads one row group at a time.
+    PAGE_ROWS = 500
+    MAX_PAGES = 8
+
+    def __init__(self, backend):
+        super().__init__()
+        self.backend = backend
+        self.columns = backend.columns
+        self.filters = {}
+        self.n_rows = 0
+        self.pages = OrderedDict()
+
+    def set_filters(self, filters):
+        self.beginResetModel()
+        self.filters = dict(filters)
+        self.n_rows = self.backend.count(self.filters)
+        self.pages.clear()
+        self.endResetModel()
+
+    def page(self, number):
+        if number not in self.pages:
+            start = number * self.PAGE_ROWS
+            with TRACER.span("backend.page", start=start):
+                self.pages[number] = self.backend.page(self.filters, start, start + self.PAGE_ROWS)
+            while len(self.pages) > self.MAX_PAGES:
+                self.pages.popitem(last=False)
+        self.pages.move_to_end(number)
+        return self.pages[number]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.n_rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        number, offset = divmod(index.row(), self.PAGE_ROWS)
+        frame = self.page(number)
+        if offset >= len(frame):
+            return None
+        return str(frame.iat[offset, index.column()])
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.columns[section]
+        return str(section + 1)
+
+# ------------------- BACKGROUND MODEL TRAINING -------------------
+class ModelTrainer(QThread):
+    # Loads the stored forest, or trains and stores one on a miss. Either
+    # way sklearn is only imported on this thread. Given a base model, it
+    # warm-starts extra trees on the frame instead (after an ingest).
+    trained = pyqtSignal(object, object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, frame, store, key, encoders, params, base=None):
+        super().__init__()
+        self.frame = frame
+        self.store = store
+        self.key = key
+        self.encoders = encoders
+        self.params = params
+        self.base = base
+
+    def run(self):
+        try:
+            model = None
+            if self.base is not None:
+                with TRACER.span("refresh_model", rows=len(self.frame)):
+                    model = refresh_model(self.base, self.frame)
+                self.save(model)
+            elif self.key is not None:
+                with TRACER.span("load_model"):
+                    model = self.store.load_model(self.key)
+            if model is None:
+                with TRACER.span("train_model", rows=len(self.frame)):
+                    model = train_model(self.frame, self.params, n_jobs=-1)
+                self.save(model)
+            flat = FlatForest(model)
+        except Exception as exc:
+            self.failed.emit(str(exc))
+            return
+        self.trained.emit(model, flat)
+
+    def save(self, model):
+        if self.key is None:
+            return
+        try:
+            self.store.save(self.key, self.encoders, model)
+        except OSError:
+            pass  # still usable for this session, just not persisted
+
+# ------------------- BACKGROUND EXPORT -------------------
+class ExportWorker(QThread):
+    progressed = pyqtSignal(int, int)
+    done = pyqtSignal(bool, str)
+
+    def __init__(self, chunks, total, columns, path, fmt):
+        super().__init__()
+        self.chunks = chunks
+        self.total = total
+        self.columns = columns
+        self.path = path
+        self.fmt = fmt
+        self.cancel_requested = False
+
+    def cancel(self):
+        self.cancel_requested = True
+
+    def run(self):
+        try:
+            with TRACER.span("export_frames", rows=self.total, fmt=self.fmt):
+                ok = export_frames(self.chunks, self.total, self.columns, self.path, self.fmt,
+                                   progress=self.progressed.emit,
+                                   is_cancelled=lambda: self.cancel_requested)
+        except Exception as exc:
+            self.done.emit(False, str(exc))
+            return
+        self.done.emit(ok, "")
+
+# ------------------- EVENT LOOP LAG MONITOR -------------------
+class EventLoopMonitor(QObject):
+    # A timer that should fire every interval_ms: when it fires late, the
+    # UI thread was busy for the difference, and the tracer records a stall
+    # against whichever handlers ran in that window.
+    def __init__(self, tracer, interval_ms=50, parent=None):
+        super().__init__(parent)
+        self.tracer = tracer
+        self.interval = interval_ms / 1e3
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.tick)
+        self.last = None
+
+    def start(self):
+        self.last = time.perf_counter()
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def tick(self):
+        now = time.perf_counter()
+        expected = self.last + self.interval
+        if (now - expected) * 1e3 > self.tracer.stall_ms:
+            self.tracer.stall(expected, now)
+        self.last = now
+
+def preload_chart_modules():
+    # Warm the import cache so the first Visualize click does not pay for it
+    import matplotlib.figure  # noqa: F401
+    from matplotlib import colormaps  # noqa: F401
 
 # ------------------- MAIN APPLICATION CLASS -------------------
 class Dashboard(QMainWindow):
-    def __init__(self):
+    def __init__(self, data_path=DATA_PATH, watch_dir=None, backend=None, service=None):
         super().__init__()
+        self.data_path = data_path
         self.setWindowTitle("Data Science Salary Analytics Dashboard")
         self.setGeometry(100, 60, 1350, 800)
         self.apply_styles()
-        self.df = load_data("salaries.csv")
-        self.init_label_encoders()
-        self._init_ui()
+        self.agg_cache = AggregateCache()
+        self.chart_pool = ChartPool()
+        # Pages query self.backend; self.df only exists in the in-memory mode
+        service = service or os.environ.get(SERVICE_ENV)
+        if service:
+            self.init_thin_client(service)
+        elif choose_backend(self.data_path, backend) == "arrow":
+            self.init_out_of_core()
+        else:
+            self.init_in_memory(watch_dir)
+        self.loop_monitor = EventLoopMonitor(TRACER, parent=self)
+        with PROFILER.phase("_init_ui"):
+            self._init_ui()
+        if TRACER.enabled:
+            self.loop_monitor.start()
+        self.init_ingest_watch()
+        warm_in_background(self.agg_cache, self.backend)
+
+    def init_in_memory(self, watch_dir):
+        self.ingestor = Ingestor(self.data_path, watch_dir)
+        with PROFILER.phase("load_data"):
+            self.df = load_data(self.data_path)
+            # Rows ingested in earlier sessions, in the order they arrived
+            replayed = self.ingestor.replay(self.df.columns)
+            if replayed:
+                self.df = append_frame(self.df, pd.concat(replayed, ignore_index=True))
+        with PROFILER.phase("init_label_encoders"):
+            self.init_label_encoders()
+        with PROFILER.phase("derived indexes"):
+            self.backend = PandasBackend(self.df, self.encoders)
+            self.salary_medians = median_table(self.df)
+
+    def init_out_of_core(self):
+        # Rows stay in a Parquet copy of the CSV; memory holds the encoders,
+        # a training sample and whatever aggregates the views ask for
+        self.ingestor = None
+        self.df = None
+        with PROFILER.phase("open dataset"):
+            self.backend = ArrowBackend.from_csv(self.data_path)
+        with PROFILER.phase("init_label_encoders"):
+            self.init_label_encoders()
+        self.salary_medians = median_table(self.train_sample)
+
+    def init_thin_client(self, url):
+        # Data, aggregates and the forest live in a salary_service.py process
+        # shared by every analyst; this window sends queries and draws
+        self.ingestor = None
+        self.df = None
+        with PROFILER.phase("connect service"):
+            # asyncio, http.client and pyarrow load only in thin-client mode
+            from salary_service import RemoteBackend
+            self.backend = RemoteBackend(url)
+        self.encoders = self.backend.encoders
+        self.label_codes = {col: {label: i for i, label in enumerate(enc.classes_)}
+                            for col, enc in self.encoders.items()}
+        self.salary_medians = self.backend.medians
+        self.model_params = self.backend.model_info["params"]
+        self.refresh_pending = False
+        self.trainer = None
+        # Predictions are batched on the service, from the same label codes
+        self.predictor = self.fast_predictor = self.backend
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if "first window" not in PROFILER.marks:
+            # Runs once the event loop has painted the window
+            QTimer.singleShot(0, self.on_first_window)
+
+    def on_first_window(self):
+        PROFILER.mark("first window")
+        PROFILER.write()
+        threading.Thread(target=preload_chart_modules, daemon=True).start()
+        # Pick up files that arrived while the app was closed
+        if self.ingestor is not None:
+            self.ingest_timer.start()
 
     # --------------- STYLE OVERRIDE ---------------
     def apply_styles(self):
         self.setStyleSheet("""
             QMainWindow { background-color: #102032; font-size: 1.45em; }
-            QLabel, QCheckBox, QComboBox, QPushButton, QTableWidget, QTableWidgetItem {
+            QLabel, QCheckBox, QComboBox, QPushButton, QTableView {
                 font-size: 1.45em;
             }
             QComboBox, QLineEdit {
@@ -57,7 +467,7 @@ class Dashboard(QMainWindow):
                 max-width: 420px;
                 font-weight: 600;
             }
-            QTableWidget {
+            QTableView {
                 background: #1a2938;
                 gridline-color: #28f0cf;
                 alternate-background-color: #17344a;
@@ -79,18 +489,135 @@ class Dashboard(QMainWindow):
 
     # --------------- LABEL ENCODERS & MODEL ---------------
     def init_label_encoders(self):
-        self.encoders = {}
-        cols = ["job_title", "experience_level", "company_size", "employment_type",
-                "employee_residence", "company_location"]
-        for col in cols:
-            le = LabelEncoder()
-            self.df[col] = le.fit_transform(self.df[col].astype(str))
-            self.encoders[col] = le
-        X = self.df[["job_title", "experience_level", "company_size", "employment_type",
-                     "remote_ratio", "employee_residence", "company_location"]]
-        y = self.df["salary_in_usd"]
-        self.predictor = RandomForestRegressor(n_estimators=50, random_state=42)
-        self.predictor.fit(X, y)
+        self.predictor = None
+        self.fast_predictor = None
+        self.refresh_pending = False
+        self.model_store = ModelStore.for_dataset(self.data_path)
+        # Defaults, or whatever salary_tune.py last promoted
+        self.model_params = self.model_store.active_params()
+        key = self.current_model_key()
+        encoders = self.model_store.load_encoders(key) if key is not None else None
+        # Encoders are cheap and every page needs them; only the forest waits
+        if self.df is not None:
+            self.encoders = encoders or fit_encoders(self.df)
+            encode_frame(self.df, self.encoders)
+        else:
+            self.encoders = encoders or self.backend.fit_encoders()
+            self.backend.encoders = self.encoders
+            self.train_sample = encode_frame(self.backend.sample(TRAIN_SAMPLE_ROWS), self.encoders)
+        self.label_codes = {col: {label: i for i, label in enumerate(enc.classes_)}
+                            for col, enc in self.encoders.items()}
+        self.start_trainer(key)
+
+    def current_model_key(self):
+        # Base file plus everything ingested so far, or the sample it was trained on
+        try:
+            n_rows = len(self.df) if self.df is not None else self.backend.n_rows
+            digest = training_digest(self.data_path, self.ingestor, n_rows)
+        except OSError:
+            return None
+        return model_key(digest, self.model_params)
+
+    def start_trainer(self, key, base=None):
+        # Copy-on-write selection: no data is copied unless the frame changes
+        frame = (self.df if self.df is not None else self.train_sample)[FEATURE_COLS + [TARGET_COL]]
+        self.trainer = ModelTrainer(frame, self.model_store, key, copy_encoders(self.encoders),
+                                    self.model_params, base)
+        self.trainer.trained.connect(self.on_model_trained)
+        self.trainer.failed.connect(self.on_model_failed)
+        self.trainer.start()
+
+    def on_model_trained(self, model, flat):
+        PROFILER.mark("model ready")
+        self.predictor = model
+        self.fast_predictor = flat
+        if hasattr(self, "pred_btn"):
+            self.pred_btn.setEnabled(True)
+            self.pred_status.setText(f"Model ready ({len(model.estimators_)} trees, {self.backend.n_rows:,} rows).")
+        if self.refresh_pending:
+            self.refresh_pending = False
+            self.schedule_model_refresh()
+
+    def schedule_model_refresh(self):
+        # One refresh at a time; ingests during a run are folded into the next
+        if self.trainer.isRunning():
+            self.refresh_pending = True
+            return
+        self.start_trainer(self.current_model_key(), base=self.predictor)
+        if hasattr(self, "pred_status"):
+            self.pred_status.setText("Refreshing the model with new records… predictions use the previous one meanwhile.")
+
+    def on_model_failed(self, message):
+        if hasattr(self, "pred_status"):
+            self.pred_status.setText(f"Model training failed: {message}")
+
+    # --------------- INCREMENTAL INGESTION ---------------
+    def init_ingest_watch(self):
+        if self.ingestor is None:
+            return
+        self.ingest_timer = QTimer(self)
+        self.ingest_timer.setSingleShot(True)
+        self.ingest_timer.setInterval(INGEST_DEBOUNCE_MS)
+        self.ingest_timer.timeout.connect(self.ingest_new_data)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.ingest_timer.start)
+        self.watcher.fileChanged.connect(self.ingest_timer.start)
+        self.watch_paths()
+
+    def watch_paths(self):
+        # Also watch each CSV so rows appended to a known file are noticed
+        if os.path.isdir(self.ingestor.watch_dir):
+            watched = set(self.watcher.directories()) | set(self.watcher.files())
+            fresh = [p for p in [self.ingestor.watch_dir] + self.ingestor.files() if p not in watched]
+            if fresh:
+                self.watcher.addPaths(fresh)
+
+    @TRACER.traced()
+    def ingest_new_data(self):
+        if self.ingestor is None:
+            return
+        self.watch_paths()
+        batches = self.ingestor.scan(self.df.columns)
+        warnings = self.ingestor.take_warnings()
+        if not batches:
+            if warnings:
+                self.statusBar().showMessage("Ingest skipped: " + "; ".join(warnings))
+            return
+        new = pd.concat([b["frame"] for b in batches], ignore_index=True)
+        # New labels get the next codes; existing codes never move
+        added = extend_encoders(self.encoders, new)
+        encode_frame(new, self.encoders)
+        with TRACER.span("backend.append", rows=len(new)):
+            self.backend.append(new)
+            self.df = self.backend.df
+        with TRACER.span("update derived indexes"):
+            self.salary_medians = update_median_table(self.salary_medians, self.df, self.backend.index, new)
+            self.agg_cache.invalidate()
+        self.ingestor.commit(batches)
+        self.add_labels(added)
+        self.table_model.set_frame(self.df, self.encoders, self.filtered_rows())
+        if self.stack.currentWidget() is self.insights_page:
+            self.refresh_insights()
+        if self.predictor is not None or self.trainer.isRunning():
+            self.schedule_model_refresh()
+        files = ", ".join(sorted({b["name"] for b in batches}))
+        note = f" ({'; '.join(warnings)})" if warnings else ""
+        self.statusBar().showMessage(f"Ingested {len(new):,} new rows from {files}; {len(self.df):,} rows total{note}")
+
+    def add_labels(self, added):
+        for col, labels in added.items():
+            codes = self.label_codes[col]
+            for label in labels:
+                codes[label] = len(codes)
+            combo = {"job_title": getattr(self, "combo_job", None),
+                     "experience_level": getattr(self, "combo_exp", None)}.get(col)
+            if combo is not None:
+                # Filter lists stay alphabetical after "All"
+                for label in labels:
+                    items = [combo.itemText(i) for i in range(1, combo.count())]
+                    combo.insertItem(bisect.bisect(items, label) + 1, label)
+            if col in getattr(self, "pred_options", {}):
+                self.pred_options[col].addItems(labels)
 
     # --------------- MAIN UI LAYOUT INIT ---------------
     def _init_ui(self):
@@ -99,19 +626,17 @@ class Dashboard(QMainWindow):
 
         menu = QListWidget()
         menu.setFixedWidth(250)
-        for name in ["View Data", "Graphs & Trends", "Insights", "Salary Predictor", "Exit"]:
+        for name in ["View Data", "Graphs & Trends", "Insights", "Salary Predictor", "Diagnostics", "Exit"]:
             QListWidgetItem(name, menu)
         menu.setCurrentRow(0)
         menu.currentRowChanged.connect(self.display_section)
 
         self.stack = QStackedWidget()
-        self.sections = [
-            self.page_table(),
-            self.page_charts(),
-            self.page_insights(),
-            self.page_predictor(),
-            self.page_exit()
-        ]
+        self.sections = []
+        for builder in [self.page_table, self.page_charts, self.page_insights,
+                        self.page_predictor, self.page_diagnostics, self.page_exit]:
+            with PROFILER.phase(builder.__name__), TRACER.span(builder.__name__):
+                self.sections.append(builder())
         for sec in self.sections:
             self.stack.addWidget(sec)
 
@@ -139,7 +664,12 @@ class Dashboard(QMainWindow):
         self.setCentralWidget(main_widget)
 
     # --------------- NAVIGATION ---------------
+    @TRACER.traced()
     def display_section(self, idx):
+        if self.stack.widget(idx) is self.insights_page:
+            self.refresh_insights()
+        elif self.stack.widget(idx) is self.diagnostics_page:
+            self.refresh_diagnostics()
         self.stack.setCurrentIndex(idx)
 
     # --------------- PAGE: DATA TABLE VIEW ---------------
@@ -166,50 +696,86 @@ class Dashboard(QMainWindow):
         export_btn = QPushButton("Export this View")
         export_btn.clicked.connect(self.handle_export_data_table)
         filt_layout.addWidget(export_btn)
+        ingest_btn = QPushButton("Check for New Data")
+        ingest_btn.clicked.connect(self.ingest_new_data)
+        if self.ingestor is not None:
+            ingest_btn.setToolTip(f"Load new CSV files and rows from {self.ingestor.watch_dir}")
+        else:
+            ingest_btn.setEnabled(False)
+            ingest_btn.setToolTip("Ingestion needs the in-memory backend")
+        filt_layout.addWidget(ingest_btn)
         layout.addLayout(filt_layout)
-        self.table = QTableWidget()
+        self.table = QTableView()
+        if self.backend.in_memory:
+            self.table_model = SalaryTableModel(self.df, self.encoders)
+            self.table.setModel(self.table_model)
+            self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+            self.table.setSortingEnabled(True)
+        else:
+            # Sorting would mean a full scan per click; pages stay in file order
+            self.table_model = PagedTableModel(self.backend)
+            self.table.setModel(self.table_model)
         self.table.setAlternatingRowColors(True)
+        self.table.setStyleSheet("font-size:1.33em;color:#e0ecec;background:#1a2938;")
+        header = self.table.horizontalHeader()
+        header.setStyleSheet("QHeaderView::section { background-color: #e0ecec; color: #000000; font-size: 1.3em; font-weight: bold; }")
+        header.setSectionResizeMode(QHeaderView.Stretch)
+        # Fixed row heights keep scrolling O(visible rows)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         layout.addWidget(self.table)
         widget.setLayout(layout)
         self.refresh_table()
         return widget
 
+    # The View Data filters apply to the table, export and charts alike
+    def active_filter(self):
+        return {
+            "job_title": self.combo_job.currentText() if hasattr(self, "combo_job") else "All",
+            "experience_level": self.combo_exp.currentText() if hasattr(self, "combo_exp") else "All",
+        }
+
+    def filtered_rows(self):
+        return self.backend.rows(self.active_filter())
+
+    @TRACER.traced()
     def refresh_table(self):
-        job = self.combo_job.currentText() if hasattr(self, "combo_job") else "All"
-        exp = self.combo_exp.currentText() if hasattr(self, "combo_exp") else "All"
-        df = self.df.copy()
-        if job != "All":
-            job_code = list(self.encoders["job_title"].classes_).index(job)
-            df = df[df["job_title"] == job_code]
-        if exp != "All":
-            exp_code = list(self.encoders["experience_level"].classes_).index(exp)
-            df = df[df["experience_level"] == exp_code]
-        view = df.head(500)
-        cols = list(view.columns)
-        self.table.setRowCount(len(view))
-        self.table.setColumnCount(len(cols))
-        self.table.setHorizontalHeaderLabels(cols)
-        self.table.setStyleSheet("font-size:1.33em;color:#e0ecec;background:#1a2938;")
-        header = self.table.horizontalHeader()
-        header.setStyleSheet("QHeaderView::section { background-color: #e0ecec; color: #000000; font-size: 1.3em; font-weight: bold; }")
-        for i, (_, row) in enumerate(view.iterrows()):
-            for j, col in enumerate(cols):
-                self.table.setItem(i, j, QTableWidgetItem(str(row[col])))
-        self.table.resizeColumnsToContents()
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        if not self.backend.in_memory:
+            with TRACER.span("backend.count"):
+                self.table_model.set_filters(self.active_filter())
+            return
+        with TRACER.span("filter_index.select"):
+            rows = self.filtered_rows()
+        with TRACER.span("table_model.set_rows", rows=len(rows)):
+            self.table_model.set_rows(rows)
 
+    @TRACER.traced()
     def handle_export_data_table(self):
-        path, _ = QFileDialog.getSaveFileName(self, "Save CSV", "", "CSV Files (*.csv)")
+        if getattr(self, "export_worker", None) is not None and self.export_worker.isRunning():
+            QMessageBox.information(self, "Export Running", "Wait for the current export to finish or cancel it.")
+            return
+        path, chosen = QFileDialog.getSaveFileName(self, "Export View", "", ";;".join(EXPORT_FORMATS.values()))
         if not path: return
-        job, exp = self.combo_job.currentText(), self.combo_exp.currentText()
-        df = self.df.copy()
-        if job != "All":
-            job_code = list(self.encoders["job_title"].classes_).index(job)
-            df = df[df["job_title"] == job_code]
-        if exp != "All":
-            exp_code = list(self.encoders["experience_level"].classes_).index(exp)
-            df = df[df["experience_level"] == exp_code]
-        df.to_csv(path, index=False)
+        fmt = format_for_path(path)
+        if fmt == "csv" and not path.lower().endswith(".csv"):
+            # No known extension typed: follow the chosen file type
+            fmt = next((k for k, label in EXPORT_FORMATS.items() if label == chosen), "csv")
+            path += "." + fmt
+        filters = self.active_filter()
+        total = self.backend.count(filters)
+        self.export_progress = QProgressDialog("Exporting rows…", "Cancel", 0, max(total, 1), self)
+        self.export_progress.setWindowTitle("Export this View")
+        self.export_progress.setWindowModality(Qt.WindowModal)
+        self.export_progress.setMinimumDuration(300)
+        self.export_worker = ExportWorker(self.backend.iter_frames(filters), total, self.backend.columns, path, fmt)
+        self.export_worker.progressed.connect(lambda done, total: self.export_progress.setValue(done))
+        self.export_worker.done.connect(self.on_export_done)
+        self.export_progress.canceled.connect(self.export_worker.cancel)
+        self.export_worker.start()
+
+    def on_export_done(self, ok, error):
+        self.export_progress.reset()
+        if error:
+            QMessageBox.warning(self, "Export Failed", error)
 
     # --------------- PAGE: GRAPHS & TRENDS ---------------
     def page_charts(self):
@@ -225,9 +791,7 @@ class Dashboard(QMainWindow):
 
         self.chart_type_combo = QComboBox()
         self.chart_type_combo.setStyleSheet("color:#102032; font-size:19px; min-width:200px; height:35px;")
-        self.chart_type_combo.addItems([
-            "Histogram", "Boxplot", "Line", "Bar", "Pie"
-        ])
+        self.chart_type_combo.addItems(CHART_TYPES)
         control_layout.addWidget(self.chart_type_combo)
 
         select_cols_lbl = QLabel("Select Columns:")
@@ -244,6 +808,9 @@ class Dashboard(QMainWindow):
         control_layout.addWidget(self.visualize_btn)
         control_layout.addStretch()
         layout.addLayout(control_layout)
+        self.render_stats_lbl = QLabel("")
+        self.render_stats_lbl.setStyleSheet("color:#9fb8c8;font-size:15px;")
+        layout.addWidget(self.render_stats_lbl)
         widget.setLayout(layout)
         self.chart_type_combo.currentIndexChanged.connect(self.update_column_options)
         self.update_column_options(0)
@@ -257,72 +824,94 @@ class Dashboard(QMainWindow):
         self.check_boxes = []
         chart_type = self.chart_type_combo.currentText()
         if chart_type == "Pie":
-            for col in self.df.columns:
+            for col in self.backend.columns:
                 cb = QCheckBox(col)
                 cb.setChecked(col == "job_title")
                 cb.setStyleSheet("color:#fff;font-size:19px;")
                 self.cols_checks_layout.addWidget(cb)
                 self.check_boxes.append(cb)
         else:
-            wanted_types = {
-                "Histogram": ["int64", "float64"],
-                "Boxplot": ["int64", "float64", "object"],
-                "Line": ["int64", "float64", "object"],
-                "Bar": ["int64", "float64", "object"]
-            }
-            dtypes = wanted_types.get(chart_type, ["int64", "float64", "object"])
-            for col in self.df.columns:
-                coltype = str(self.df[col].dtype)
-                if coltype in dtypes:
+            numeric_only = chart_type == "Histogram"
+            numeric = set(self.backend.numeric_columns)
+            for col in self.backend.columns:
+                if not numeric_only or col in numeric:
                     cb = QCheckBox(col)
                     cb.setChecked(col == "salary_in_usd" or col == "job_title")
                     cb.setStyleSheet("color:#fff;font-size:19px;")
                     self.cols_checks_layout.addWidget(cb)
                     self.check_boxes.append(cb)
 
+    @TRACER.traced()
     def show_selected_chart(self):
         chart_type = self.chart_type_combo.currentText()
         checked_cols = [cb.text() for cb in self.check_boxes if cb.isChecked()]
-        fig, ax = plt.subplots(figsize=(9, 6))
-        df = self.df
         if not checked_cols:
             QMessageBox.warning(self, "Field Selection Needed", "Select at least one column to visualize the chart.")
             return
-        if chart_type == "Histogram" and len(checked_cols) == 1:
-            sns.histplot(df[checked_cols[0]], kde=True, ax=ax, color="#22e6af")
-            ax.set_title(f"Histogram of {checked_cols[0]}", color="#0ff7dc")
-        elif chart_type == "Boxplot" and len(checked_cols) == 2:
-            sns.boxplot(data=df, x=checked_cols[0], y=checked_cols[1], ax=ax, palette="Spectral")
-            ax.set_title(f"Boxplot: {checked_cols[1]} by {checked_cols[0]}", color="#0ff7dc")
-        elif chart_type == "Line" and len(checked_cols) == 2:
-            xs = df.groupby(checked_cols[0])[checked_cols[1]].mean()
-            ax.plot(xs.index, xs.values, marker="o", color="#02e6be", linewidth=3.5)
-            ax.set_title(f"{checked_cols[1]} over {checked_cols[0]}", color="#0ff7dc")
-        elif chart_type == "Bar" and len(checked_cols) == 2:
-            gr = df.groupby(checked_cols[0])[checked_cols[1]].mean().sort_values(ascending=False)
-            ax.bar(gr.index.astype(str), gr.values, color="#c568ff")
-            ax.set_title(f"Bar Chart: Avg. {checked_cols[1]} by {checked_cols[0]}", color="#0ff7dc")
-            ax.set_xticklabels(gr.index, rotation=32, ha="right")
-        elif chart_type == "Pie":
-            for idx, col in enumerate(checked_cols):
-                vals = df[col].value_counts()
-                ax.pie(vals, labels=vals.index, autopct='%1.1f%%', startangle=140, textprops={'color':"#111"})
-                ax.axis('equal')
-                ax.set_title(f"Pie of {col}", color="#0ff7dc")
-                if idx + 1 < len(checked_cols):
-                    fig2, ax2 = plt.subplots(figsize=(7.5, 6))
-                    vals2 = df[checked_cols[idx+1]].value_counts()
-                    ax2.pie(vals2, labels=vals2.index, autopct='%1.1f%%', startangle=140, textprops={'color':"#111"})
-                    ax2.axis('equal')
-                    ax2.set_title(f"Pie of {checked_cols[idx+1]}", color="#0ff7dc")
-                    PlotWindow(f"{chart_type} - {checked_cols[idx+1]}", fig2)
-                break
-        else:
+        if chart_type != "Pie" and len(checked_cols) != CHART_COLUMNS[chart_type]:
             QMessageBox.warning(self, "Select Valid Columns",
                 "Histogram/Pie: 1 col | Boxplot/Line/Bar: 2 cols (group, value)")
             return
-        fig.tight_layout()
-        self.plot_win = PlotWindow(f"{chart_type} - {checked_cols}", fig)
+        filters = self.active_filter()
+        # Aggregates come from the cache; the backend only computes on a miss
+        def agg(kind, cols):
+            with TRACER.span("aggregate", kind=kind, cols=cols):
+                return self.agg_cache.query(self.backend, kind, cols, filters)
+        if chart_type == "Pie":
+            # First column in the main chart window, the second in its own
+            for slot, col in zip(["Pie", "Pie-2"], checked_cols[:2]):
+                t0 = time.perf_counter()
+                vals = agg(CHART_AGGREGATES["Pie"], [col])
+                self.render_chart(slot, "Pie", [col], vals, t0, f"{chart_type} - {col}" if slot == "Pie-2" else None)
+            return
+        t0 = time.perf_counter()
+        data = chart_data(chart_type, agg(CHART_AGGREGATES[chart_type], checked_cols))
+        self.render_chart(chart_type, chart_type, checked_cols, data, t0)
+
+    def render_chart(self, slot, chart_type, cols, data, t0, title=None):
+        win = self.chart_pool.acquire(slot, figsize=(7.5, 6) if slot == "Pie-2" else (9, 6))
+        win.present(title or f"{chart_type} - {cols}")
+        signature = (chart_type, tuple(cols))
+        t_draw = time.perf_counter()
+        reused = win.signature == signature and self.update_chart(win, chart_type, data)
+        if not reused:
+            with TRACER.span("draw_chart", chart=chart_type):
+                ax = win.reset(signature)
+                draw_chart(ax, chart_type, cols, data, win.artists)
+                win.figure.tight_layout()
+        with TRACER.span("canvas.draw", reused=reused):
+            win.canvas.draw()
+        now = time.perf_counter()
+        stat = self.chart_pool.record(win, f"{chart_type} {cols}", now - t0, now - t_draw, reused)
+        if hasattr(self, "render_stats_lbl"):
+            self.render_stats_lbl.setText(
+                f"Last render: {stat['total_ms']:.1f} ms ({stat['draw_ms']:.1f} ms drawing), "
+                f"figure {stat['figure_bytes'] / 1e6:.1f} MB")
+        self.plot_win = win
+
+    def update_chart(self, win, chart_type, data):
+        # Same chart and columns with new data (e.g. another filter): move the
+        # existing artists when the shape allows, otherwise ask for a redraw.
+        ax = win.figure.axes[0] if win.figure.axes else None
+        if ax is None:
+            return False
+        if chart_type == "Line":
+            win.artists["line"].set_data(data.index, data.values)
+        elif chart_type == "Bar" and list(data.index) == win.artists.get("labels"):
+            for rect, height in zip(win.artists["bars"], data.values):
+                rect.set_height(height)
+        elif chart_type == "Histogram" and len(data["counts"]) == len(win.artists["bars"]):
+            edges = data["edges"]
+            for rect, x, w, h in zip(win.artists["bars"], edges[:-1], np.diff(edges), data["counts"]):
+                rect.set_x(x)
+                rect.set_width(w)
+                rect.set_height(h)
+            win.artists["kde"].set_data(data["kde_x"], data["kde_y"])
+        else:
+            return False
+        ax.relim()
+        ax.autoscale_view()
+        return True
 
     # --------------- PAGE: INSIGHTS (PROFESSIONAL VISUALS) ---------------
     def page_insights(self):
@@ -330,7 +919,9 @@ class Dashboard(QMainWindow):
         layout = QVBoxLayout()
         layout.setAlignment(Qt.AlignTop)
         layout.addSpacing(10)
-        df = self.df
+        self.insights_scope_lbl = QLabel("")
+        self.insights_scope_lbl.setStyleSheet("color:#9fb8c8;font-size:15px;")
+        layout.addWidget(self.insights_scope_lbl)
         # Card 1: Top Paying Roles
         card1 = QWidget()
         card1.setStyleSheet(
@@ -339,11 +930,7 @@ class Dashboard(QMainWindow):
         )
         lbl1 = QLabel("💸 <b>Top 5 Highest Paying Roles</b>")
         lbl1.setStyleSheet("font-size: 19px; font-weight:bold; color:#fff;")
-        labels_jobs = self.encoders["job_title"].classes_
-        job_mean = df.groupby("job_title")["salary_in_usd"].mean().sort_values(ascending=False)[:5]
-        job_mean_names = [labels_jobs[i] for i in job_mean.index]
-        valstr = "<br>".join([f"<b>{j}</b>: <span style='font-size:19px;color:#00ffc0;'>${int(s):,}</span>" for j, s in zip(job_mean_names, job_mean)])
-        msg1 = QLabel(valstr)
+        msg1 = QLabel("")
         msg1.setTextFormat(Qt.RichText)
         msg1.setStyleSheet("font-size: 19px;")
         card1_lay = QVBoxLayout(); card1_lay.addWidget(lbl1); card1_lay.addWidget(msg1)
@@ -356,11 +943,7 @@ class Dashboard(QMainWindow):
         )
         lbl2 = QLabel("🌎 <b>Top 5 Countries by Avg. Salary</b>")
         lbl2.setStyleSheet("font-size:19px;font-weight:bold; color:#fff;")
-        labels_countries = self.encoders["employee_residence"].classes_
-        country_mean = df.groupby("employee_residence")["salary_in_usd"].mean().sort_values(ascending=False)[:5]
-        country_mean_names = [labels_countries[i] for i in country_mean.index]
-        valstr2 = "<br>".join([f"<b>{c}</b>: <span style='font-size:19px;color:#e184ff;'>${int(s):,}</span>" for c, s in zip(country_mean_names, country_mean)])
-        msg2 = QLabel(valstr2)
+        msg2 = QLabel("")
         msg2.setTextFormat(Qt.RichText)
         msg2.setStyleSheet("font-size: 19px;")
         card2_lay = QVBoxLayout(); card2_lay.addWidget(lbl2); card2_lay.addWidget(msg2)
@@ -371,10 +954,8 @@ class Dashboard(QMainWindow):
             "background:#1c2439; border-radius:13px; padding:16px; margin-bottom:7px;"
             "box-shadow: 0 0 8px #1de9b6;"
         )
-        n_jobs = df["job_title"].nunique()
-        n_countries = df["employee_residence"].nunique()
-        jobs_lbl = QLabel(f"📊 <b>Distinct Roles:</b> <span style=\"font-size:19px;color:#6be97a;\">{n_jobs}</span>")
-        ctry_lbl = QLabel(f"🗺️ <b>Distinct Countries:</b> <span style=\"font-size:19px;color:#24fbff;\">{n_countries}</span>")
+        jobs_lbl = QLabel("")
+        ctry_lbl = QLabel("")
         jobs_lbl.setStyleSheet("font-size:19px;"); ctry_lbl.setStyleSheet("font-size:19px;")
         card3_lay = QVBoxLayout(); card3_lay.addWidget(jobs_lbl); card3_lay.addWidget(ctry_lbl)
         card3.setLayout(card3_lay)
@@ -383,8 +964,35 @@ class Dashboard(QMainWindow):
         layout.addWidget(card3)
         layout.addSpacing(25)
         widget.setLayout(layout)
+        self.insights_page = widget
+        self.insight_labels = (msg1, msg2, jobs_lbl, ctry_lbl)
+        # Out of core the cards are a scan, so they wait until the page is opened
+        if self.backend.in_memory:
+            self.refresh_insights()
         return widget
 
+    def insights_for_view(self):
+        # In memory, whole-dataset cards read the incrementally maintained
+        # store; a filtered view builds (and caches) a store over its rows only
+        filters = self.active_filter()
+        store = self.agg_cache.query(self.backend, "insights", [], filters)
+        if all(v == "All" for v in filters.values()):
+            return store, "All records"
+        scope = ", ".join(f"{k.replace('_', ' ')}: {v}" for k, v in filters.items() if v != "All")
+        return store, f"View Data filter ({scope})"
+
+    @TRACER.traced()
+    def refresh_insights(self):
+        store, scope = self.insights_for_view()
+        msg1, msg2, jobs_lbl, ctry_lbl = self.insight_labels
+        labels_jobs = self.encoders["job_title"].classes_
+        labels_countries = self.encoders["employee_residence"].classes_
+        msg1.setText("<br>".join([f"<b>{labels_jobs[j]}</b>: <span style='font-size:19px;color:#00ffc0;'>${int(s):,}</span>" for j, s in store.top_k("job_title", 5)]))
+        msg2.setText("<br>".join([f"<b>{labels_countries[c]}</b>: <span style='font-size:19px;color:#e184ff;'>${int(s):,}</span>" for c, s in store.top_k("employee_residence", 5)]))
+        jobs_lbl.setText(f"📊 <b>Distinct Roles:</b> <span style=\"font-size:19px;color:#6be97a;\">{store.distinct('job_title')}</span>")
+        ctry_lbl.setText(f"🗺️ <b>Distinct Countries:</b> <span style=\"font-size:19px;color:#24fbff;\">{store.distinct('employee_residence')}</span>")
+        self.insights_scope_lbl.setText(f"Showing: {scope} — {store.n_rows:,} rows")
+
     # --------------- PAGE: ENGAGING SALARY PREDICTOR ---------------
     def page_predictor(self):
         widget = QWidget()
@@ -443,36 +1051,121 @@ class Dashboard(QMainWindow):
             "color:#f7ff94; font-size:19px; background: #204440;"
             "font-family: 'Consolas', monospace; border-radius:7px;"
         )
+        # Training may still be running in the background on first launch
+        self.pred_btn = pred_btn
+        self.pred_status = QLabel("")
+        self.pred_status.setStyleSheet("color:#f7ff94; font-size:19px; font-family: 'Consolas', monospace;")
+        if self.predictor is None:
+            pred_btn.setEnabled(False)
+            self.pred_status.setText("Model warming up… predictions unlock once the model is loaded.")
+        elif self.trainer is None:
+            self.pred_status.setText(f"Predictions from {self.backend.url} ({self.backend.model_info['trees']} trees).")
+        # Label -> code dictionaries (self.label_codes) are built once and
+        # extended on ingest, instead of list.index per click
+        self.pred_options = options
+        codes = self.label_codes
+        @TRACER.traced("do_predict")
         def do_predict():
-            vals = []
-            for col in [
-                "job_title", "experience_level", "company_size", "employment_type",
-                "remote_ratio", "employee_residence", "company_location"
-            ]:
-                if col == "remote_ratio":
-                    vals.append(int(options[col].currentText()))
-                else:
-                    val = options[col].currentText()
-                    code = list(self.encoders[col].classes_).index(val)
-                    vals.append(code)
-            arr = pd.DataFrame([vals], columns=[
-                "job_title", "experience_level", "company_size", "employment_type",
-                "remote_ratio", "employee_residence", "company_location"
-            ])
-            pred = int(self.predictor.predict(arr)[0])
-            import random
-            step = random.randint(-1100, 1100)
-            color = "#21fa81" if step > 0 else "#ff3e3e"
-            indicator.setText(
-                f"<span style='color:{color};'>{'▲' if step>0 else '▼'} ${abs(step):,} | Δ</span>")
+            if self.fast_predictor is None:
+                return
+            vals = tuple(
+                int(options[col].currentText()) if col == "remote_ratio"
+                else codes[col][options[col].currentText()]
+                for col in FEATURE_COLS
+            )
+            # Flattened forest behind an LRU cache: same estimate as predictor.predict,
+            # plus the P10-P90 band of the individual trees
+            with TRACER.span("forest.interval_one"):
+                summary = self.fast_predictor.interval_one(vals)
+            pred = int(summary["mean"])
+            job, exp = options["job_title"].currentText(), options["experience_level"].currentText()
+            median = peer_median(self.salary_medians, codes["job_title"][job], codes["experience_level"][exp])
+            band = f"P10–P90 ${int(summary['low']):,} – ${int(summary['high']):,}"
+            if median is None:
+                indicator.setText(f"{band} | no {job} / {exp} records to compare")
+            else:
+                delta = pred - int(median)
+                color = "#21fa81" if delta >= 0 else "#ff3e3e"
+                indicator.setText(
+                    f"{band} | <span style='color:{color};'>{'▲' if delta >= 0 else '▼'} ${abs(delta):,}</span>"
+                    f" vs median ${int(median):,} for {job} / {exp}")
             pred_label.setText(f"Estimated Salary: ${pred:,}")
         pred_btn.clicked.connect(do_predict)
         layout.addWidget(pred_btn)
+        layout.addWidget(self.pred_status)
         layout.addWidget(pred_label)
         layout.addWidget(indicator)
         widget.setLayout(layout)
         return widget
 
+    # --------------- PAGE: DIAGNOSTICS ---------------
+    def page_diagnostics(self):
+        widget = QWidget()
+        layout = QVBoxLayout()
+        layout.setAlignment(Qt.AlignTop)
+        controls = QHBoxLayout()
+        self.trace_check = QCheckBox("Record timings")
+        self.trace_check.setStyleSheet("color:#fff;font-size:19px;font-weight:bold;")
+        self.trace_check.setChecked(TRACER.enabled)
+        self.trace_check.toggled.connect(self.set_tracing)
+        controls.addWidget(self.trace_check)
+        controls.addStretch()
+        for text, handler in [("Refresh", self.refresh_diagnostics), ("Clear", self.clear_diagnostics),
+                              ("Export Trace", self.handle_export_trace)]:
+            btn = QPushButton(text)
+            btn.clicked.connect(handler)
+            controls.addWidget(btn)
+        layout.addLayout(controls)
+        mono = "font-family:'Consolas',monospace;font-size:15px;color:#e0ecec;background:#172230;border-radius:10px;padding:14px;"
+        spans_title = QLabel("Handler timings (ms)")
+        spans_title.setStyleSheet("color:#0ff7dc;font-size:19px;font-weight:bold;")
+        self.diag_spans_lbl = QLabel("")
+        self.diag_spans_lbl.setStyleSheet(mono)
+        self.diag_spans_lbl.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        stalls_title = QLabel(f"UI stalls over {TRACER.stall_ms:.0f} ms")
+        stalls_title.setStyleSheet("color:#0ff7dc;font-size:19px;font-weight:bold;")
+        self.diag_stalls_lbl = QLabel("")
+        self.diag_stalls_lbl.setStyleSheet(mono)
+        self.diag_stalls_lbl.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        for w in (spans_title, self.diag_spans_lbl, stalls_title, self.diag_stalls_lbl):
+            layout.addWidget(w)
+        layout.addStretch()
+        widget.setLayout(layout)
+        self.diagnostics_page = widget
+        self.refresh_diagnostics()
+        return widget
+
+    def set_tracing(self, on):
+        TRACER.enabled = on
+        if on:
+            self.loop_monitor.start()
+        else:
+            self.loop_monitor.stop()
+        self.refresh_diagnostics()
+
+    def refresh_diagnostics(self):
+        if not TRACER.enabled and not TRACER.spans:
+            self.diag_spans_lbl.setText("Timing is off. Tick \"Record timings\" (or start with SALARY_TRACE=1).")
+            self.diag_stalls_lbl.setText("")
+            return
+        self.diag_spans_lbl.setText(TRACER.format_summary())
+        self.diag_stalls_lbl.setText(TRACER.format_stalls())
+
+    def clear_diagnostics(self):
+        TRACER.clear()
+        self.refresh_diagnostics()
+
+    def handle_export_trace(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Trace", "salary_trace.json", "Chrome trace (*.json)")
+        if not path: return
+        try:
+            TRACER.export(path)
+        except OSError as exc:
+            QMessageBox.warning(self, "Export Failed", str(exc))
+            return
+        QMessageBox.information(self, "Trace Exported",
+            f"Wrote {len(TRACER.spans):,} spans to {path}.\nOpen it in chrome://tracing or ui.perfetto.dev.")
+
     # --------------- PAGE: EXIT ---------------
     def page_exit(self):
         widget = QWidget()
@@ -495,8 +1188,14 @@ class Dashboard(QMainWindow):
 
 # ------------------- MAIN EXECUTION -------------------
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = Dashboard()
+    with PROFILER.phase("QApplication"):
+        app = QApplication(sys.argv)
+    with PROFILER.phase("Dashboard"):
+        window = Dashboard()
     window.show()
-    sys.exit(app.exec_())
+    code = app.exec_()
+    # Let an in-flight training run finish and persist instead of killing the thread
+    if window.trainer is not None:
+        window.trainer.wait()
+    sys.exit(code)
 
@@ -0,0 +1,134 @@
+# ------------------- IMPORTS & SETUP -------------------
+import threading
+from collections import OrderedDict
+import pandas as pd
+from salary_summaries import histogram_summary, box_summary
+from salary_insights import InsightStore
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 256
+# Chart configurations analysts open first; computed right after load
+WARM_CONFIGS = [
+    ("mean", ("job_title", "salary_in_usd")),
+    ("mean", ("experience_level", "salary_in_usd")),
+    ("mean", ("company_location", "salary_in_usd")),
+]
+
+# ------------------- AGGREGATES -------------------
+def group_mean(df, group_col, value_col):
+    return df.groupby(group_col, observed=True)[value_col].mean()
+
+def value_counts(df, col):
+    return df[col].value_counts()
+
+def histogram(df, col):
+    return histogram_summary(df[col])
+
+def insights(df):
+    return InsightStore.from_frame(df)
+
+AGGREGATES = {
+    "mean": group_mean,
+    "counts": value_counts,
+    "hist": histogram,
+    "box": box_summary,
+    "insights": insights,
+}
+
+def filter_key(filters):
+    return tuple(sorted((k, v) for k, v in filters.items() if v not in (None, "All")))
+
+def _nbytes(value):
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+    if isinstance(value, dict):
+        return sum(_nbytes(v) for v in value.values())
+    if isinstance(value, list):
+        return sum(_nbytes(v) for v in value)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    nbytes = getattr(value, "nbytes", None)
+    if nbytes is not None:
+        return int(nbytes)
+    return 64  # scalars and labels: flat estimate
+
+# ------------------- LRU CACHE -------------------
+class AggregateCache:
+    # Keys are (aggregate kind, columns, filter key); Line and Bar share the
+    # same group mean, so entries are keyed by what was computed rather than
+    # by the widget that asked for it.
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+            self.misses += 1
+            return None
+
+    def put(self, key, value, generation=None):
+        size = _nbytes(value)
+        with self.lock:
+            # Drop results computed against data that has since been replaced
+            if generation is not None and generation != self.generation:
+                return
+            if size > self.max_bytes:
+                return
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (value, size)
+            self.total_bytes += size
+            while self.entries and (self.total_bytes > self.max_bytes or len(self.entries) > self.max_entries):
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.total_bytes -= evicted
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            generation = self.generation
+            value = compute()
+            self.put(key, value, generation)
+        return value
+
+    def aggregate(self, df, kind, cols, filters=None):
+        key = (kind, tuple(cols), filter_key(filters or {}))
+        return self.get_or_compute(key, lambda: AGGREGATES[kind](df() if callable(df) else df, *cols))
+
+    def query(self, backend, kind, cols, filters=None):
+        # Same keys as aggregate(); the backend computes on a miss, pushing
+        # the filter and the aggregation down to where the data lives
+        key = (kind, tuple(cols), filter_key(filters or {}))
+        return self.get_or_compute(key, lambda: backend.aggregate(kind, list(cols), filters or {}))
+
+    def invalidate(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+            self.generation += 1
+
+    def stats(self):
+        with self.lock:
+            return {"entries": len(self.entries), "bytes": self.total_bytes,
+                    "hits": self.hits, "misses": self.misses}
+
+# ------------------- BACKGROUND WARMING -------------------
+def warm(cache, backend, configs=WARM_CONFIGS):
+    for kind, cols in configs:
+        if all(c in backend.columns for c in cols):
+            cache.query(backend, kind, cols)
+
+def warm_in_background(cache, backend, configs=WARM_CONFIGS):
+    thread = threading.Thread(target=warm, args=(cache, backend, configs), daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,432 @@
+# ------------------- IMPORTS & SETUP -------------------
+import os
+import sys
+import time
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from salary_data import (
+    load_data, cache_dir, dataset_fingerprint, CACHE_VERSION, CATEGORICAL_COLS, NUMERIC_COLS, ENCODED_COLS, TARGET_COL
+)
+from salary_model import CategoryEncoder, fit_encoders, extend_encoders, encode_frame
+from salary_filter import FilterIndex
+from salary_insights import InsightStore, INSIGHT_GROUP_COLS
+from salary_aggregates import AGGREGATES, filter_key
+from salary_summaries import histogram_summary, box_summary
+from salary_export import decode_chunk, iter_chunks
+from salary_ingest import Ingestor, append_frame
+
+# "pandas", "arrow" or "auto" (arrow once the CSV is larger than OUT_OF_CORE_BYTES)
+BACKEND_ENV = "SALARY_BACKEND"
+# Set to a salary_service.py URL (e.g. http://127.0.0.1:8765) to run the
+# dashboard as a thin client; lives here so the dashboard can check it
+# without importing the service
+SERVICE_ENV = "SALARY_SERVICE"
+OUT_OF_CORE_BYTES = 2 * 1024 ** 3
+ROW_GROUP_ROWS = 256_000
+SCAN_BATCH_ROWS = 256_000
+# Histogram bins and box statistics above this many rows are estimated from
+# a uniform sample; histogram counts and every other aggregate stay exact
+SUMMARY_SAMPLE_ROWS = 2_000_000
+MAX_PAGE_INDEXES = 16
+MAX_CACHED_ROW_GROUPS = 4
+
+def _have_arrow():
+    try:
+        import pyarrow.dataset  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def choose_backend(csv_path, requested=None):
+    name = requested or os.environ.get(BACKEND_ENV) or "auto"
+    if name == "auto":
+        try:
+            big = os.path.getsize(csv_path) > OUT_OF_CORE_BYTES
+        except OSError:
+            big = False
+        name = "arrow" if big and _have_arrow() else "pandas"
+    if name not in ("pandas", "arrow"):
+        raise ValueError(f"Unknown query backend: {name}")
+    return name
+
+# ------------------- IN-MEMORY BACKEND -------------------
+class PandasBackend:
+    # The whole label-encoded frame in memory. Filters go through the
+    # posting-list index, aggregates run on the selected rows and the
+    # unfiltered insight cards come from the incrementally kept store.
+    in_memory = True
+
+    def __init__(self, df, encoders, index=None, insights=None):
+        self.df = df
+        self.encoders = encoders
+        self.index = index or FilterIndex(df, encoders)
+        self.insights = insights or InsightStore.from_frame(df)
+
+    @property
+    def columns(self):
+        return list(self.df.columns)
+
+    @property
+    def numeric_columns(self):
+        # Label codes are integers too, but not quantities to bin
+        return [c for c in self.df.columns
+                if c not in self.encoders and pd.api.types.is_numeric_dtype(self.df[c])]
+
+    @property
+    def n_rows(self):
+        return len(self.df)
+
+    def rows(self, filters):
+        return self.index.select(filters)
+
+    def frame(self, filters):
+        if not filter_key(filters):
+            return self.df
+        return self.df.iloc[self.rows(filters)]
+
+    def count(self, filters):
+        return len(self.rows(filters))
+
+    def distinct(self, col):
+        # Labels with at least one row, sorted like ArrowBackend.distinct
+        present = np.diff(self.index.offsets[col]) > 0
+        return sorted(label for label, keep in zip(self.index.labels[col], present) if keep)
+
+    def aggregate(self, kind, cols, filters):
+        if kind == "insights" and not filter_key(filters):
+            return self.insights
+        return AGGREGATES[kind](self.frame(filters), *cols)
+
+    def page(self, filters, start, stop):
+        return decode_chunk(self.df.iloc[self.rows(filters)[start:stop]], self.encoders)
+
+    def iter_frames(self, filters, chunk_rows=SCAN_BATCH_ROWS):
+        # Rows are selected now, so an ingest during the export is not seen
+        return iter_chunks(self.df, self.rows(filters), self.encoders, chunk_rows)
+
+    def sample(self, n, seed=0):
+        return self.df if len(self.df) <= n else self.df.sample(n, random_state=seed)
+
+    def append(self, new):
+        # new is already label-encoded with (possibly extended) encoders
+        self.df = append_frame(self.df, new)
+        self.index.append(new, self.encoders)
+        self.insights.append(new)
+
+# ------------------- PARQUET CONVERSION -------------------
+def dataset_parquet_path(csv_path, digest):
+    # Not "<stem>-v..." so load_data's cache pruning leaves it alone
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(cache_dir(csv_path), f"{stem}.dataset-v{CACHE_VERSION}-{digest}.parquet")
+
+def csv_to_parquet(csv_path, out_path, row_group_rows=ROW_GROUP_ROWS):
+    # Streams the CSV block by block into row groups; memory stays at a few
+    # blocks whatever the file size. Row-group min/max statistics are what
+    # lets filters skip data later.
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+    header = pd.read_csv(csv_path, nrows=0).columns
+    types = {col: pa.string() for col in CATEGORICAL_COLS if col in header}
+    types.update({col: pa.int64() for col in NUMERIC_COLS if col in header})
+    reader = pacsv.open_csv(csv_path, read_options=pacsv.ReadOptions(block_size=1 << 24),
+                            convert_options=pacsv.ConvertOptions(column_types=types))
+    tmp = out_path + ".tmp"
+    try:
+        with pq.ParquetWriter(tmp, reader.schema) as writer:
+            for batch in reader:
+                writer.write_batch(batch, row_group_size=row_group_rows)
+        os.replace(tmp, out_path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return out_path
+
+# ------------------- OUT-OF-CORE BACKEND -------------------
+class ArrowBackend:
+    # Queries a Parquet copy of the dataset with pyarrow.dataset. Filters
+    # become dataset expressions (row groups are skipped on statistics and
+    # only the projected columns are read), group-bys run per batch and
+    # their partial sums are merged, and table pages read one row group.
+    # Results use the same label codes as the in-memory backend.
+    in_memory = False
+
+    def __init__(self, parquet_path, encoders=None):
+        import pyarrow.dataset as ds
+        self.path = parquet_path
+        self.dataset = ds.dataset(parquet_path, format="parquet")
+        self.encoders = encoders
+        self.n_rows = self.dataset.count_rows()
+        self.page_indexes = OrderedDict()
+        self.row_groups = OrderedDict()
+
+    @classmethod
+    def from_csv(cls, csv_path, encoders=None):
+        path = dataset_parquet_path(csv_path, dataset_fingerprint(csv_path))
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            csv_to_parquet(csv_path, path)
+        return cls(path, encoders)
+
+    @property
+    def columns(self):
+        return list(self.dataset.schema.names)
+
+    @property
+    def numeric_columns(self):
+        import pyarrow as pa
+        return [f.name for f in self.dataset.schema if pa.types.is_integer(f.type) or pa.types.is_floating(f.type)]
+
+    # ------------------- SCANNING -------------------
+    def expression(self, filters):
+        import pyarrow.dataset as ds
+        expr = None
+        for col, label in filter_key(filters or {}):
+            term = ds.field(col) == label
+            expr = term if expr is None else expr & term
+        return expr
+
+    def batches(self, filters, columns):
+        return self.dataset.to_batches(columns=list(columns), filter=self.expression(filters),
+                                       batch_size=SCAN_BATCH_ROWS)
+
+    def frames(self, filters, columns, fraction=None, seed=0):
+        # Projected, filtered pandas frames; fraction keeps a Bernoulli sample
+        rng = np.random.default_rng(seed)
+        for batch in self.batches(filters, columns):
+            if fraction is not None:
+                batch = batch.filter(rng.random(len(batch)) < fraction)
+            if len(batch):
+                yield batch.to_pandas()
+
+    def distinct(self, col):
+        import pyarrow.compute as pc
+        seen = set()
+        for batch in self.batches({}, [col]):
+            seen.update(pc.unique(batch.column(0)).to_pylist())
+        return sorted(v for v in seen if v is not None)
+
+    def fit_encoders(self):
+        # Same sorted classes_ fit_encoders would produce from the full frame
+        self.encoders = {col: CategoryEncoder(self.distinct(col)) for col in ENCODED_COLS}
+        return self.encoders
+
+    def encode(self, frame):
+        for col, encoder in (self.encoders or {}).items():
+            if col in frame.columns:
+                frame[col] = encoder.transform(frame[col])
+        return frame
+
+    def _keyed(self, series):
+        # Group keys as label codes, matching the in-memory aggregates
+        col = series.index.name
+        if self.encoders and col in self.encoders:
+            codes = self.encoders[col].transform(series.index.to_series().astype(str))
+            series.index = pd.Index(codes, name=col)
+        return series
+
+    def count(self, filters):
+        return int(self.page_index(filters)[1][-1])
+
+    # ------------------- AGGREGATES -------------------
+    def aggregate(self, kind, cols, filters):
+        handlers = {
+            "mean": self._group_mean,
+            "counts": self._value_counts,
+            "hist": self._histogram,
+            "box": self._box,
+            "insights": self._insights,
+        }
+        return handlers[kind](filters, *cols)
+
+    def _partials(self, filters, group_col, aggregations, columns):
+        import pyarrow as pa
+        parts = []
+        for batch in self.batches(filters, columns):
+            if len(batch):
+                grouped = pa.Table.from_batches([batch]).group_by(group_col).aggregate(aggregations)
+                parts.append(grouped.to_pandas())
+        if not parts:
+            return None
+        merged = pd.concat(parts, ignore_index=True).dropna(subset=[group_col])
+        return merged.groupby(group_col, sort=True).sum()
+
+    def _group_mean(self, filters, group_col, value_col):
+        merged = self._partials(filters, group_col, [(value_col, "sum"), (value_col, "count")],
+                                {group_col, value_col})
+        if merged is None:
+            return pd.Series(dtype=np.float64, name=value_col, index=pd.Index([], name=group_col))
+        means = merged[f"{value_col}_sum"] / merged[f"{value_col}_count"]
+        means = means[merged[f"{value_col}_count"] > 0].rename(value_col)
+        return self._keyed(means).sort_index()
+
+    def _value_counts(self, filters, col):
+        merged = self._partials(filters, col, [([], "count_all")], [col])
+        if merged is None:
+            return pd.Series(dtype=np.int64, name="count", index=pd.Index([], name=col))
+        counts = merged["count_all"].rename("count")
+        return self._keyed(counts).sort_values(ascending=False, kind="stable")
+
+    def _histogram(self, filters, col):
+        n = self.count(filters)
+        if n <= SUMMARY_SAMPLE_ROWS:
+            values = [f[col] for f in self.frames(filters, [col])]
+            return histogram_summary(pd.concat(values) if values else pd.Series(dtype=np.float64))
+        # Bins and the KDE from a sample, then exact counts in a second pass
+        lo, hi, sample = np.inf, -np.inf, []
+        rng = np.random.default_rng(0)
+        for frame in self.frames(filters, [col]):
+            values = pd.to_numeric(frame[col], errors="coerce").to_numpy(dtype=np.float64)
+            values = values[np.isfinite(values)]
+            if len(values):
+                lo, hi = min(lo, values.min()), max(hi, values.max())
+                keep = rng.random(len(values)) < SUMMARY_SAMPLE_ROWS / n
+                sample.append(values[keep])
+        summary = histogram_summary(pd.Series(np.concatenate(sample)))
+        edges = summary["edges"].copy()
+        edges[0], edges[-1] = min(edges[0], lo), max(edges[-1], hi)
+        counts = np.zeros(len(edges) - 1, dtype=np.int64)
+        for frame in self.frames(filters, [col]):
+            counts += np.histogram(pd.to_numeric(frame[col], errors="coerce").dropna(), bins=edges)[0]
+        total = int(counts.sum())
+        scale = total / max(summary["n"], 1)
+        return dict(summary, edges=edges, counts=counts, kde_y=summary["kde_y"] * scale, n=total)
+
+    def _box(self, filters, group_col, value_col):
+        n = self.count(filters)
+        fraction = None if n <= SUMMARY_SAMPLE_ROWS else SUMMARY_SAMPLE_ROWS / n
+        frames = list(self.frames(filters, [group_col, value_col], fraction))
+        frame = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=[group_col, value_col])
+        frame = frame.dropna(subset=[group_col])
+        if self.encoders and group_col in self.encoders:
+            frame[group_col] = self.encoders[group_col].transform(frame[group_col].astype(str))
+        return box_summary(frame, group_col, value_col)
+
+    def _insights(self, filters):
+        store = InsightStore()
+        for frame in self.frames(filters, INSIGHT_GROUP_COLS + [TARGET_COL]):
+            store.append(self.encode(frame))
+        return store
+
+    # ------------------- PAGED ROWS -------------------
+    def page_index(self, filters):
+        # Row groups that can match the filter (pruned on statistics) and the
+        # running count of matching rows, so row N maps to one row group
+        key = filter_key(filters or {})
+        if key in self.page_indexes:
+            self.page_indexes.move_to_end(key)
+            return self.page_indexes[key]
+        expr = self.expression(filters)
+        groups = [rg for frag in self.dataset.get_fragments(filter=expr)
+                  for rg in frag.split_by_row_group(filter=expr)]
+        # Unfiltered count_rows() on a row-group fragment reports the whole
+        # file, so read those counts from the row-group metadata
+        counts = [rg.count_rows(filter=expr) if expr is not None else sum(r.num_rows for r in rg.row_groups)
+                  for rg in groups]
+        entry = (groups, np.concatenate(([0], np.cumsum(counts, dtype=np.int64))))
+        self.page_indexes[key] = entry
+        while len(self.page_indexes) > MAX_PAGE_INDEXES:
+            self.page_indexes.popitem(last=False)
+        return entry
+
+    def _row_group(self, filters, i):
+        key = (filter_key(filters or {}), i)
+        if key not in self.row_groups:
+            groups, _ = self.page_index(filters)
+            self.row_groups[key] = groups[i].to_table(filter=self.expression(filters))
+            while len(self.row_groups) > MAX_CACHED_ROW_GROUPS:
+                self.row_groups.popitem(last=False)
+        self.row_groups.move_to_end(key)
+        return self.row_groups[key]
+
+    def page(self, filters, start, stop):
+        import pyarrow as pa
+        _, offsets = self.page_index(filters)
+        stop = min(stop, int(offsets[-1]))
+        parts = []
+        i = int(np.searchsorted(offsets, start, side="right")) - 1
+        while start < stop and i < len(offsets) - 1:
+            table = self._row_group(filters, i)
+            lo = start - int(offsets[i])
+            hi = min(stop, int(offsets[i + 1])) - int(offsets[i])
+            parts.append(table.slice(lo, hi - lo))
+            start = int(offsets[i + 1])
+            i += 1
+        if not parts:
+            return self.dataset.schema.empty_table().to_pandas()
+        return pa.concat_tables(parts).to_pandas()
+
+    def iter_frames(self, filters, chunk_rows=SCAN_BATCH_ROWS):
+        for batch in self.dataset.to_batches(filter=self.expression(filters), batch_size=chunk_rows):
+            if len(batch):
+                yield batch.to_pandas()
+
+    def sample(self, n, seed=0):
+        # Exactly min(n, n_rows) rows without replacement, like
+        # PandasBackend.sample: positions are drawn up front and taken out of
+        # each batch as the scan passes them
+        if n >= self.n_rows:
+            frames = list(self.frames({}, self.columns))
+        else:
+            import pyarrow as pa
+            picks = np.sort(np.random.default_rng(seed).choice(self.n_rows, n, replace=False))
+            frames, offset = [], 0
+            for batch in self.batches({}, self.columns):
+                lo, hi = np.searchsorted(picks, [offset, offset + len(batch)])
+                if hi > lo:
+                    frames.append(batch.take(pa.array(picks[lo:hi] - offset)).to_pandas())
+                offset += len(batch)
+        return pd.concat(frames, ignore_index=True) if frames else self.dataset.schema.empty_table().to_pandas()
+
+# ------------------- OPENING A DATASET -------------------
+def open_backend(csv_path, backend=None, watch_dir=None, encoders=None):
+    # The rows a dashboard would show, for processes without one: in memory
+    # the base file plus ingested rows, out of core the base file. Given
+    # encoders (e.g. a stored model's) are extended, so their codes hold.
+    # Returns (backend, encoders).
+    if choose_backend(csv_path, backend) == "arrow":
+        store = ArrowBackend.from_csv(csv_path, encoders)
+        if encoders is None:
+            encoders = store.fit_encoders()
+        return store, encoders
+    df = load_data(csv_path)
+    replayed = Ingestor(csv_path, watch_dir).replay(df.columns)
+    if replayed:
+        df = append_frame(df, pd.concat(replayed, ignore_index=True))
+    if encoders is None:
+        encoders = fit_encoders(df)
+    else:
+        extend_encoders(encoders, df)
+    encode_frame(df, encoders)
+    return PandasBackend(df, encoders), encoders
+
+# ------------------- MAIN EXECUTION -------------------
+if __name__ == "__main__":
+    # Same queries through both backends: results and timings side by side
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else "salaries.csv"
+    df = load_data(csv_path)
+    encoders = fit_encoders(df)
+    encode_frame(df, encoders)
+    backends = {"pandas": PandasBackend(df, encoders), "arrow": ArrowBackend.from_csv(csv_path, encoders)}
+    top_job = encoders["job_title"].classes_[np.bincount(df["job_title"]).argmax()]
+    queries = [
+        ("count", lambda b: b.count({"job_title": top_job})),
+        ("mean", lambda b: b.aggregate("mean", ["experience_level", TARGET_COL], {"job_title": top_job})),
+        ("counts", lambda b: b.aggregate("counts", ["company_size"], {})),
+        ("page", lambda b: b.page({"experience_level": "SE"}, 1000, 1050)),
+    ]
+    for name, query in queries:
+        results = {}
+        for label, backend in backends.items():
+            t0 = time.perf_counter()
+            results[label] = query(backend)
+            print(f"{name:<8}{label:<8}{(time.perf_counter() - t0) * 1e3:>10.2f} ms")
+        a, b = results["pandas"], results["arrow"]
+        if isinstance(a, pd.DataFrame):
+            same = a.astype(str).reset_index(drop=True).equals(b[a.columns].astype(str).reset_index(drop=True))
+        elif isinstance(a, pd.Series):
+            same = np.allclose(a.sort_index().to_numpy(dtype=float), b.sort_index().to_numpy(dtype=float))
+        else:
+            same = a == b
+        print(f"{name:<8}{'match' if same else 'MISMATCH'}")
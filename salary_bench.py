@@ -0,0 +1,312 @@
+# ------------------- IMPORTS & SETUP -------------------
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import numpy as np
+import pandas as pd
+
+# Headless by default: the UI steps run against an offscreen Qt platform
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+BENCH_DIR = ".salary_bench"
+DEFAULT_SIZES = [10_000, 1_000_000, 10_000_000]
+GENERATE_CHUNK_ROWS = 1_000_000
+# Regressions are reported when a step is this much slower than baseline...
+DEFAULT_TOLERANCE = 0.25
+# ...and at least this many seconds slower, so timer noise on tiny steps is ignored
+MIN_REGRESSION_SECONDS = 0.005
+
+# ------------------- SYNTHETIC DATA -------------------
+JOB_TITLES = {
+    "Data Scientist": (1.00, 0.18), "Data Engineer": (0.98, 0.17), "Data Analyst": (0.72, 0.12),
+    "Machine Learning Engineer": (1.15, 0.12), "ML Engineer": (1.12, 0.04), "Research Scientist": (1.22, 0.05),
+    "Analytics Engineer": (0.93, 0.05), "Applied Scientist": (1.25, 0.04), "Data Architect": (1.10, 0.03),
+    "AI Engineer": (1.18, 0.04), "Business Intelligence Analyst": (0.70, 0.03), "Research Engineer": (1.14, 0.03),
+    "Data Science Manager": (1.30, 0.02), "Head of Data": (1.45, 0.01), "Data Specialist": (0.68, 0.02),
+    "Computer Vision Engineer": (1.08, 0.01), "NLP Engineer": (1.10, 0.01), "Data Manager": (0.95, 0.01),
+    "MLOps Engineer": (1.05, 0.01), "Data Science Consultant": (0.90, 0.01),
+}
+EXPERIENCE = {"EN": (0.62, 0.10), "MI": (0.85, 0.25), "SE": (1.08, 0.55), "EX": (1.45, 0.10)}
+EMPLOYMENT = {"FT": 0.975, "CT": 0.01, "PT": 0.01, "FL": 0.005}
+COMPANY_SIZE = {"S": (0.85, 0.07), "M": (1.00, 0.80), "L": (1.05, 0.13)}
+# country: (pay factor, share, currency, USD per unit of currency)
+COUNTRIES = {
+    "US": (1.00, 0.70, "USD", 1.0), "CA": (0.78, 0.05, "CAD", 0.74), "GB": (0.62, 0.06, "GBP", 1.27),
+    "DE": (0.60, 0.03, "EUR", 1.08), "FR": (0.52, 0.02, "EUR", 1.08), "ES": (0.42, 0.02, "EUR", 1.08),
+    "NL": (0.58, 0.01, "EUR", 1.08), "AU": (0.72, 0.02, "AUD", 0.66), "IN": (0.22, 0.03, "INR", 0.012),
+    "BR": (0.25, 0.01, "BRL", 0.19), "PL": (0.35, 0.01, "PLN", 0.25), "PT": (0.33, 0.01, "EUR", 1.08),
+    "MX": (0.30, 0.01, "MXN", 0.058), "IE": (0.60, 0.01, "EUR", 1.08),
+}
+REMOTE = {0: 0.62, 50: 0.05, 100: 0.33}
+YEARS = {2020: 0.02, 2021: 0.05, 2022: 0.12, 2023: 0.25, 2024: 0.33, 2025: 0.23}
+BASE_SALARY_USD = 120_000
+
+def _choice(rng, table, n, weight_index=None):
+    keys = list(table)
+    weights = np.array([table[k] if weight_index is None else table[k][weight_index] for k in keys], dtype=float)
+    idx = rng.choice(len(keys), size=n, p=weights / weights.sum())
+    return np.asarray(keys, dtype=object)[idx], idx
+
+def generate_chunk(rng, n):
+    # Salary is a log-normal around a base scaled by role, seniority, company
+    # size and country, so group means and spreads look like the real export
+    jobs, job_idx = _choice(rng, JOB_TITLES, n, 1)
+    exps, exp_idx = _choice(rng, EXPERIENCE, n, 1)
+    sizes, size_idx = _choice(rng, COMPANY_SIZE, n, 1)
+    residence, res_idx = _choice(rng, COUNTRIES, n, 1)
+    # Most people work for a company in their own country
+    moved = rng.random(n) < 0.06
+    location = residence.copy()
+    location[moved] = _choice(rng, COUNTRIES, int(moved.sum()), 1)[0]
+    factor = (np.array([v[0] for v in JOB_TITLES.values()])[job_idx]
+              * np.array([v[0] for v in EXPERIENCE.values()])[exp_idx]
+              * np.array([v[0] for v in COMPANY_SIZE.values()])[size_idx]
+              * np.array([v[0] for v in COUNTRIES.values()])[res_idx])
+    usd = np.round(BASE_SALARY_USD * factor * rng.lognormal(0.0, 0.28, n), -2).astype(np.int64)
+    usd = np.clip(usd, 15_000, 800_000)
+    currency = np.array([v[2] for v in COUNTRIES.values()], dtype=object)[res_idx]
+    fx = np.array([v[3] for v in COUNTRIES.values()])[res_idx]
+    return pd.DataFrame({
+        "work_year": _choice(rng, YEARS, n)[0].astype(np.int64),
+        "experience_level": exps,
+        "employment_type": _choice(rng, EMPLOYMENT, n)[0],
+        "job_title": jobs,
+        "salary": np.round(usd / fx).astype(np.int64),
+        "salary_currency": currency,
+        "salary_in_usd": usd,
+        "employee_residence": residence,
+        "remote_ratio": _choice(rng, REMOTE, n)[0].astype(np.int64),
+        "company_location": location,
+        "company_size": sizes,
+    })
+
+def generate_salaries(path, n_rows, seed=42, chunk_rows=GENERATE_CHUNK_ROWS):
+    # Writes n_rows in the 11-column salaries.csv schema, chunk by chunk so
+    # 10M rows never sit in memory at once. Same seed, same file.
+    rng = np.random.default_rng(seed)
+    tmp = path + ".part"
+    with open(tmp, "w", newline="") as handle:
+        for start in range(0, n_rows, chunk_rows):
+            chunk = generate_chunk(rng, min(chunk_rows, n_rows - start))
+            chunk.to_csv(handle, index=False, header=(start == 0))
+    os.replace(tmp, path)
+    return path
+
+def dataset_path(n_rows, seed=42, bench_dir=BENCH_DIR):
+    os.makedirs(bench_dir, exist_ok=True)
+    path = os.path.join(bench_dir, f"salaries-{n_rows}-s{seed}.csv")
+    if not os.path.exists(path):
+        generate_salaries(path, n_rows, seed)
+    return path
+
+# ------------------- TIMING -------------------
+def timed(fn, repeat=1):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+class Recorder:
+    def __init__(self, size):
+        self.size = size
+        self.results = []
+
+    def add(self, step, seconds, **extra):
+        self.results.append({"size": self.size, "step": step, "seconds": round(seconds, 6), **extra})
+        print(f"{self.size:>12,} {step:<28}{seconds * 1e3:>12.2f} ms", file=sys.stderr)
+
+# ------------------- CORE CODE PATHS -------------------
+def bench_core(rec, path, repeat, max_train_rows):
+    from salary_data import load_data, dataset_fingerprint, FEATURE_COLS
+    from salary_model import ModelStore, model_key, fit_encoders, encode_frame, train_model
+    from salary_filter import FilterIndex
+    from salary_aggregates import group_mean, value_counts, histogram
+    from salary_summaries import box_summary
+    from salary_insights import InsightStore
+    from salary_forest import FlatForest
+
+    seconds, _ = timed(lambda: load_data(path, use_cache=False))
+    rec.add("load_data_csv", seconds)
+    load_data(path)  # make sure the binary cache exists
+    seconds, df = timed(lambda: load_data(path), repeat)
+    rec.add("load_data_cached", seconds)
+
+    seconds, encoders = timed(lambda: fit_encoders(df))
+    rec.add("fit_encoders", seconds)
+    seconds, _ = timed(lambda: encode_frame(df, encoders))
+    rec.add("encode_frame", seconds)
+
+    train_df = df if len(df) <= max_train_rows else df.sample(max_train_rows, random_state=0)
+    store = ModelStore.for_dataset(path)
+    params = store.active_params()
+    seconds, model = timed(lambda: train_model(train_df, params, n_jobs=-1))
+    rec.add("train_forest", seconds, train_rows=len(train_df))
+    if len(train_df) == len(df):
+        # Lets the UI steps find the model instead of training their own
+        store.save(model_key(dataset_fingerprint(path), params), encoders, model)
+
+    seconds, index = timed(lambda: FilterIndex(df, encoders))
+    rec.add("filter_index_build", seconds)
+    common_job = encoders["job_title"].classes_[np.bincount(df["job_title"]).argmax()]
+    filters = {"job_title": common_job, "experience_level": "SE"}
+    seconds, rows = timed(lambda: index.select(filters), repeat)
+    rec.add("filter_select", seconds, rows=len(rows))
+
+    seconds, _ = timed(lambda: group_mean(df, "job_title", "salary_in_usd"), repeat)
+    rec.add("groupby_mean", seconds)
+    seconds, _ = timed(lambda: value_counts(df, "company_size"), repeat)
+    rec.add("value_counts", seconds)
+    seconds, _ = timed(lambda: histogram(df, "salary_in_usd"), repeat)
+    rec.add("histogram_summary", seconds)
+    seconds, _ = timed(lambda: box_summary(df, "experience_level", "salary_in_usd"), repeat)
+    rec.add("box_summary", seconds)
+    seconds, store = timed(lambda: InsightStore.from_frame(df), repeat)
+    rec.add("insights_build", seconds)
+    seconds, _ = timed(lambda: (store.top_k("job_title", 5), store.top_k("employee_residence", 5)), repeat)
+    rec.add("insights_top_k", seconds)
+
+    flat = FlatForest(model)
+    X = df[FEATURE_COLS].to_numpy()
+    one = tuple(int(v) for v in X[0])
+    seconds, _ = timed(lambda: model.predict(df[FEATURE_COLS].iloc[[0]]), repeat)
+    rec.add("predict_sklearn_row", seconds)
+    seconds, _ = timed(lambda: flat._predict_one(one), repeat)
+    rec.add("predict_flat_row", seconds)
+    batch = X[:100_000]
+    seconds, _ = timed(lambda: flat.predict_interval(batch))
+    rec.add("predict_batch_interval", seconds, rows=len(batch))
+    return df
+
+# ------------------- UI CODE PATHS -------------------
+def bench_ui(rec, path, repeat):
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    import DSproject
+
+    seconds, win = timed(lambda: DSproject.Dashboard(path))
+    rec.add("ui_dashboard_init", seconds)
+    win.trainer.wait()
+    app.processEvents()
+
+    def refresh():
+        win.combo_job.blockSignals(True)
+        win.combo_job.setCurrentIndex(1)
+        win.combo_job.blockSignals(False)
+        win.refresh_table()
+    seconds, _ = timed(refresh, repeat)
+    rec.add("ui_refresh_table", seconds, rows=win.table_model.rowCount())
+    win.combo_job.setCurrentIndex(0)
+
+    def chart(cached):
+        if not cached:
+            win.agg_cache.invalidate()
+        win.show_selected_chart()
+    win.chart_type_combo.setCurrentText("Bar")
+    seconds, _ = timed(lambda: chart(False), repeat)
+    rec.add("ui_chart_bar_cold", seconds)
+    seconds, _ = timed(lambda: chart(True), repeat)
+    rec.add("ui_chart_bar_cached", seconds)
+    win.chart_type_combo.setCurrentText("Boxplot")
+    seconds, _ = timed(lambda: chart(False), repeat)
+    rec.add("ui_chart_boxplot_cold", seconds)
+
+    # The insights page is built once by the dashboard; time the aggregation
+    # behind its cards, cold, for the whole dataset and for a filtered view
+    def insights():
+        win.agg_cache.invalidate()
+        # The in-memory whole-dataset store is maintained on append, not cached
+        store = getattr(win.backend, "insights", None)
+        if store is not None:
+            store.top_cache.clear()
+        win.refresh_insights()
+    for step, job_index in (("ui_insights_all_cold", 0), ("ui_insights_filtered_cold", 1)):
+        win.combo_job.blockSignals(True)
+        win.combo_job.setCurrentIndex(job_index)
+        win.combo_job.blockSignals(False)
+        seconds, _ = timed(insights, repeat)
+        rec.add(step, seconds, rows=win.insights_for_view()[0].n_rows)
+    win.combo_job.setCurrentIndex(0)
+    # Once only: repeats would be answered by the prediction cache
+    seconds, _ = timed(win.pred_btn.click)
+    rec.add("ui_do_predict", seconds)
+    win.close()
+
+# ------------------- BASELINE COMPARISON -------------------
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    base = {(r["size"], r["step"]): r["seconds"] for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        old = base.get((r["size"], r["step"]))
+        if old is None:
+            continue
+        if r["seconds"] > old * (1 + tolerance) and r["seconds"] - old > MIN_REGRESSION_SECONDS:
+            regressions.append({**r, "baseline_seconds": old, "ratio": round(r["seconds"] / old, 2)})
+    return regressions
+
+# ------------------- COMMAND LINE -------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the salary dashboard's code paths on synthetic data.")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="comma-separated row counts (default: 10k, 1M, 10M)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3, help="best-of repeats for the fast steps")
+    parser.add_argument("--max-train-rows", type=int, default=1_000_000,
+                        help="train on a sample above this size (recorded as train_rows)")
+    parser.add_argument("--ui-max-rows", type=int, default=1_000_000,
+                        help="skip the Qt steps above this size")
+    parser.add_argument("--no-ui", action="store_true", help="skip the Qt steps entirely")
+    parser.add_argument("-o", "--output", default=os.path.join(BENCH_DIR, "results.json"),
+                        help="results file (default: %(default)s, next to the generated datasets)")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--save-baseline", help="also write these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s.replace("_", "")) for s in args.sizes.split(",") if s]
+    results = []
+    for size in sizes:
+        t0 = time.perf_counter()
+        path = dataset_path(size, args.seed)
+        rec = Recorder(size)
+        rec.add("dataset_ready", time.perf_counter() - t0)
+        bench_core(rec, path, args.repeat, args.max_train_rows)
+        if not args.no_ui and size <= min(args.ui_max_rows, args.max_train_rows):
+            bench_ui(rec, path, args.repeat)
+        results.extend(rec.results)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        report["regressions"] = regressions
+        for r in regressions:
+            print(f"REGRESSION {r['size']:,} {r['step']}: {r['baseline_seconds'] * 1e3:.2f} ms -> "
+                  f"{r['seconds'] * 1e3:.2f} ms (x{r['ratio']})", file=sys.stderr)
+        status = 1 if regressions else 0
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2)
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
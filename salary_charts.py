@@ -0,0 +1,54 @@
+# ------------------- IMPORTS & SETUP -------------------
+import numpy as np
+
+CHART_TYPES = ["Histogram", "Boxplot", "Line", "Bar", "Pie"]
+# Columns each chart takes: Histogram/Pie one, the others (group, value)
+CHART_COLUMNS = {"Histogram": 1, "Boxplot": 2, "Line": 2, "Bar": 2, "Pie": 1}
+# Aggregate each chart is drawn from; Line and Bar share the group mean
+CHART_AGGREGATES = {"Histogram": "hist", "Boxplot": "box", "Line": "mean", "Bar": "mean", "Pie": "counts"}
+
+# ------------------- CHART DATA -------------------
+def chart_data(chart_type, data):
+    # Per-chart view of a shared aggregate
+    if chart_type == "Bar":
+        return data.sort_values(ascending=False)
+    return data
+
+# ------------------- DRAWING -------------------
+def draw_chart(ax, chart_type, cols, data, artists=None):
+    # Draws one chart onto ax. Artists the dashboard later updates in place
+    # are stored in the artists dict when one is given. No Qt or pyplot, so
+    # it runs the same in a chart window and on a headless Agg canvas.
+    artists = {} if artists is None else artists
+    if chart_type == "Histogram":
+        # Drawn from pre-binned counts and an FFT KDE, not the raw rows
+        edges = data["edges"]
+        artists["bars"] = ax.bar(edges[:-1], data["counts"], width=np.diff(edges), align="edge",
+                                 color="#22e6af", alpha=0.75, edgecolor="#102032", linewidth=0.6)
+        artists["kde"], = ax.plot(data["kde_x"], data["kde_y"], color="#22e6af", linewidth=2)
+        ax.set_xlabel(cols[0])
+        ax.set_ylabel("Count")
+        ax.set_title(f"Histogram of {cols[0]}", color="#0ff7dc")
+    elif chart_type == "Boxplot":
+        boxes = ax.bxp(data, patch_artist=True, showfliers=True)
+        from matplotlib import colormaps
+        colors = colormaps["Spectral"](np.linspace(0, 1, max(len(data), 1)))
+        for patch, color in zip(boxes["boxes"], colors):
+            patch.set_facecolor(color)
+        ax.set_xlabel(cols[0])
+        ax.set_ylabel(cols[1])
+        ax.set_title(f"Boxplot: {cols[1]} by {cols[0]}", color="#0ff7dc")
+    elif chart_type == "Line":
+        artists["line"], = ax.plot(data.index, data.values, marker="o", color="#02e6be", linewidth=3.5)
+        ax.set_title(f"{cols[1]} over {cols[0]}", color="#0ff7dc")
+    elif chart_type == "Bar":
+        artists["bars"] = ax.bar(data.index.astype(str), data.values, color="#c568ff")
+        artists["labels"] = list(data.index)
+        ax.set_title(f"Bar Chart: Avg. {cols[1]} by {cols[0]}", color="#0ff7dc")
+        ax.set_xticks(range(len(data)))
+        ax.set_xticklabels(data.index, rotation=32, ha="right")
+    elif chart_type == "Pie":
+        ax.pie(data, labels=data.index, autopct='%1.1f%%', startangle=140, textprops={'color':"#111"})
+        ax.axis('equal')
+        ax.set_title(f"Pie of {cols[0]}", color="#0ff7dc")
+    return artists
@@ -0,0 +1,187 @@
+# ------------------- IMPORTS & SETUP -------------------
+import io
+import os
+import sys
+import json
+import hashlib
+import pandas as pd
+
+# Bump when SCHEMA or the cleaning steps change so stale caches are ignored
+CACHE_VERSION = 1
+CACHE_DIR_NAME = ".salary_cache"
+
+# ------------------- SCHEMA -------------------
+CATEGORICAL_COLS = [
+    "job_title", "experience_level", "company_size", "employment_type",
+    "employee_residence", "company_location", "salary_currency",
+]
+NUMERIC_COLS = {
+    "work_year": "integer",
+    "salary": "integer",
+    "salary_in_usd": "integer",
+    "remote_ratio": "integer",
+}
+# Text columns the dashboard label-encodes to integer codes
+ENCODED_COLS = [
+    "job_title", "experience_level", "company_size", "employment_type",
+    "employee_residence", "company_location",
+]
+# Columns fed to the salary model, in training order
+FEATURE_COLS = [
+    "job_title", "experience_level", "company_size", "employment_type",
+    "remote_ratio", "employee_residence", "company_location",
+]
+TARGET_COL = "salary_in_usd"
+
+# ------------------- PARSING -------------------
+def _parse_csv(path):
+    header = pd.read_csv(path, nrows=0).columns
+    dtypes = {col: "category" for col in CATEGORICAL_COLS if col in header}
+    return _clean(pd.read_csv(path, dtype=dtypes))
+
+def parse_csv_bytes(data):
+    # Same dtypes and cleaning as a full load, for a slice of CSV text
+    # (header line included) such as rows appended to an ingested file
+    dtypes = {col: "category" for col in CATEGORICAL_COLS}
+    return _clean(pd.read_csv(io.BytesIO(data), dtype=dtypes))
+
+def _clean(df):
+    for col in df.columns:
+        s = df[col]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            if s.isna().any():
+                if "" not in s.cat.categories:
+                    s = s.cat.add_categories([""])
+                s = s.fillna("")
+            df[col] = s
+        elif col in NUMERIC_COLS and pd.api.types.is_numeric_dtype(s):
+            kind = NUMERIC_COLS[col] if not s.isna().any() else "float"
+            df[col] = pd.to_numeric(s, downcast=kind)
+        elif pd.api.types.is_float_dtype(s):
+            df[col] = pd.to_numeric(s, downcast="float")
+        elif pd.api.types.is_integer_dtype(s):
+            df[col] = pd.to_numeric(s, downcast="integer")
+        else:
+            df[col] = s.fillna("")
+    return df
+
+# ------------------- BINARY CACHE -------------------
+def file_digest(path, chunk_size=1 << 20, limit=None):
+    # limit hashes only the first limit bytes (an already ingested prefix)
+    h = hashlib.blake2b(digest_size=16)
+    remaining = float("inf") if limit is None else limit
+    with open(path, "rb") as f:
+        while remaining > 0:
+            chunk = f.read(int(min(chunk_size, remaining)))
+            if not chunk:
+                break
+            h.update(chunk)
+            remaining -= len(chunk)
+    return h.hexdigest()
+
+def cache_dir(path):
+    return os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME)
+
+def _meta_path(path):
+    return os.path.join(cache_dir(path), os.path.basename(path) + ".meta.json")
+
+def _read_meta(path):
+    try:
+        with open(_meta_path(path)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def dataset_fingerprint(path):
+    # Re-hashing a multi-GB CSV on every launch defeats the cache, so the
+    # hash stored alongside a matching size/mtime is trusted as-is.
+    st = os.stat(path)
+    meta = _read_meta(path)
+    if meta.get("size") == st.st_size and meta.get("mtime_ns") == st.st_mtime_ns and meta.get("digest"):
+        return meta["digest"]
+    digest = file_digest(path)
+    os.makedirs(cache_dir(path), exist_ok=True)
+    with open(_meta_path(path), "w") as f:
+        json.dump({"size": st.st_size, "mtime_ns": st.st_mtime_ns, "digest": digest}, f)
+    return digest
+
+def _have_parquet():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def cache_path(path, digest):
+    ext = "parquet" if _have_parquet() else "pkl"
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir(path), f"{stem}-v{CACHE_VERSION}-{digest}.{ext}")
+
+def _read_cache(cpath):
+    if cpath.endswith(".parquet"):
+        return pd.read_parquet(cpath)
+    return pd.read_pickle(cpath)
+
+def _write_cache(df, cpath):
+    tmp = cpath + ".tmp"
+    if cpath.endswith(".parquet"):
+        df.to_parquet(tmp, index=False)
+    else:
+        df.to_pickle(tmp)
+    os.replace(tmp, cpath)
+
+def _prune_cache(path, keep):
+    prefix = os.path.splitext(os.path.basename(path))[0] + "-v"
+    cdir = cache_dir(path)
+    for name in os.listdir(cdir):
+        full = os.path.join(cdir, name)
+        if name.startswith(prefix) and full != keep:
+            try:
+                os.remove(full)
+            except OSError:
+                pass
+
+# ------------------- LOAD DATA -------------------
+def load_data(path, use_cache=True):
+    if not use_cache:
+        return _parse_csv(path)
+    try:
+        digest = dataset_fingerprint(path)
+        cpath = cache_path(path, digest)
+    except OSError:
+        return _parse_csv(path)
+    if os.path.exists(cpath):
+        try:
+            return _read_cache(cpath)
+        except Exception:
+            pass  # corrupt or unreadable cache: fall through and rebuild it
+    df = _parse_csv(path)
+    try:
+        _write_cache(df, cpath)
+        _prune_cache(path, cpath)
+    except OSError:
+        pass  # read-only location: run without a cache
+    return df
+
+# ------------------- MEMORY REPORT -------------------
+def memory_report(df):
+    usage = df.memory_usage(index=False, deep=True)
+    report = pd.DataFrame({
+        "dtype": df.dtypes.astype(str),
+        "bytes": usage,
+    })
+    report["share"] = (report["bytes"] / max(int(report["bytes"].sum()), 1)).round(4)
+    return report.sort_values("bytes", ascending=False)
+
+def format_memory_report(df):
+    report = memory_report(df)
+    lines = [f"{'column':<22}{'dtype':<14}{'bytes':>14}{'share':>9}"]
+    for col, row in report.iterrows():
+        lines.append(f"{col:<22}{row['dtype']:<14}{int(row['bytes']):>14,}{row['share']:>9.1%}")
+    lines.append(f"{'total':<36}{int(report['bytes'].sum()):>14,}")
+    return "\n".join(lines)
+
+# ------------------- MAIN EXECUTION -------------------
+if __name__ == "__main__":
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else "salaries.csv"
+    print(format_memory_report(load_data(csv_path)))
@@ -0,0 +1,106 @@
+# ------------------- IMPORTS & SETUP -------------------
+import os
+import gzip
+import pandas as pd
+
+EXPORT_FORMATS = {
+    "csv": "CSV Files (*.csv)",
+    "csv.gz": "Compressed CSV (*.csv.gz)",
+    "parquet": "Parquet Files (*.parquet)",
+}
+DEFAULT_CHUNK_ROWS = 100_000
+
+def format_for_path(path):
+    lower = path.lower()
+    if lower.endswith(".csv.gz") or lower.endswith(".gz"):
+        return "csv.gz"
+    if lower.endswith(".parquet") or lower.endswith(".pq"):
+        return "parquet"
+    return "csv"
+
+# ------------------- DECODING -------------------
+def decode_chunk(chunk, encoders):
+    # Categorical.from_codes maps the integer codes back to their labels
+    # without building a Python string per cell
+    chunk = chunk.copy()
+    for col, le in encoders.items():
+        if col in chunk.columns:
+            chunk[col] = pd.Categorical.from_codes(chunk[col].to_numpy(), categories=le.classes_)
+    return chunk
+
+def iter_chunks(df, rows, encoders, chunk_rows=DEFAULT_CHUNK_ROWS):
+    for start in range(0, len(rows), chunk_rows):
+        yield decode_chunk(df.iloc[rows[start:start + chunk_rows]], encoders)
+
+# ------------------- WRITERS -------------------
+def _write_csv(chunks, handle, on_chunk):
+    for i, chunk in enumerate(chunks):
+        chunk.to_csv(handle, index=False, header=(i == 0))
+        if not on_chunk(len(chunk)):
+            return False
+    return True
+
+def _write_parquet(chunks, path, on_chunk, columns):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            if not on_chunk(len(chunk)):
+                return False
+        if writer is None:
+            # No matching rows: still produce a valid, empty file
+            pq.write_table(pa.Table.from_pandas(pd.DataFrame(columns=columns)), path)
+        return True
+    finally:
+        if writer is not None:
+            writer.close()
+
+def export_rows(df, rows, encoders, path, fmt=None, chunk_rows=DEFAULT_CHUNK_ROWS,
+                progress=None, is_cancelled=None):
+    # Streams df.iloc[rows] to path chunk by chunk
+    return export_frames(iter_chunks(df, rows, encoders, chunk_rows), len(rows), list(df.columns),
+                         path, fmt, progress, is_cancelled)
+
+def export_frames(chunks, total, columns, path, fmt=None, progress=None, is_cancelled=None):
+    # Writes already decoded frames (from any query backend) to path.
+    # progress(done, total) is called after every chunk; returning early
+    # when is_cancelled() is true leaves no partial file behind. Returns
+    # True when the file is complete.
+    fmt = fmt or format_for_path(path)
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    done = 0
+
+    def on_chunk(n):
+        nonlocal done
+        done += n
+        if progress is not None:
+            progress(done, total)
+        return not (is_cancelled is not None and is_cancelled())
+
+    tmp = path + ".part"
+    try:
+        if fmt == "parquet":
+            ok = _write_parquet(chunks, tmp, on_chunk, columns)
+        else:
+            opener = gzip.open if fmt == "csv.gz" else open
+            with opener(tmp, "wt", newline="") as handle:
+                if total == 0:
+                    pd.DataFrame(columns=columns).to_csv(handle, index=False)
+                    ok = True
+                else:
+                    ok = _write_csv(chunks, handle, on_chunk)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    if not ok:
+        os.remove(tmp)
+        return False
+    os.replace(tmp, path)
+    return True
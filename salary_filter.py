@@ -0,0 +1,165 @@
+# ------------------- IMPORTS & SETUP -------------------
+import sys
+import time
+import numpy as np
+import pandas as pd
+from salary_data import CATEGORICAL_COLS
+
+# ------------------- FILTER INDEX -------------------
+def _column_codes(s, encoder=None):
+    if encoder is not None:
+        # Already label-encoded by the dashboard
+        return s.to_numpy(), list(encoder.classes_)
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        codes = s.cat.codes.to_numpy()
+        labels = [str(c) for c in s.cat.categories]
+        if (codes < 0).any():
+            codes = np.where(codes < 0, len(labels), codes)
+            labels.append("")
+        return codes, labels
+    labels, codes = np.unique(s.astype(str).to_numpy(), return_inverse=True)
+    return codes, list(labels)
+
+class FilterIndex:
+    # Per-category posting lists stored CSR-style: one stable argsort of the
+    # codes plus offsets, so the rows for a label are a contiguous slice.
+    def __init__(self, df, encoders=None, columns=None):
+        encoders = encoders or {}
+        if columns is None:
+            columns = [c for c in CATEGORICAL_COLS if c in df.columns]
+        self.n_rows = len(df)
+        idx_dtype = np.int32 if self.n_rows < 2**31 else np.int64
+        self.codes = {}
+        self.labels = {}
+        self.lookup = {}
+        self.order = {}
+        self.offsets = {}
+        for col in columns:
+            codes, labels = _column_codes(df[col], encoders.get(col))
+            self.codes[col] = codes
+            self.labels[col] = labels
+            self.lookup[col] = {label: i for i, label in enumerate(labels)}
+            self.order[col] = np.argsort(codes, kind="stable").astype(idx_dtype, copy=False)
+            counts = np.bincount(codes, minlength=len(labels))
+            self.offsets[col] = np.concatenate(([0], np.cumsum(counts)))
+
+    def append(self, df, encoders=None):
+        # Adds df's rows after the existing ones. Both the old posting lists
+        # and the new rows' argsort are ordered by code, so they merge by
+        # computing each element's destination: O(rows), no re-sort.
+        encoders = encoders or {}
+        n_old, n_new = self.n_rows, len(df)
+        if n_new == 0:
+            return
+        total = n_old + n_new
+        idx_dtype = np.int32 if total < 2**31 else np.int64
+        for col in self.codes:
+            encoder = encoders.get(col)
+            if encoder is not None:
+                codes = df[col].to_numpy()
+                self.labels[col] = list(encoder.classes_)
+            else:
+                values = df[col].astype(str).to_numpy()
+                for label in pd.unique(values):
+                    if label not in self.lookup[col]:
+                        self.labels[col].append(label)
+            labels = self.labels[col]
+            self.lookup[col] = {label: i for i, label in enumerate(labels)}
+            if encoder is None:
+                codes = pd.Index(labels).get_indexer(values)
+            old_counts = np.zeros(len(labels), dtype=np.int64)
+            old_counts[:len(self.offsets[col]) - 1] = np.diff(self.offsets[col])
+            new_counts = np.bincount(codes, minlength=len(labels))
+            new_order = np.argsort(codes, kind="stable")
+            new_start = np.concatenate(([0], np.cumsum(new_counts)[:-1]))
+            old_end = np.cumsum(old_counts)
+            merged = np.empty(total, dtype=idx_dtype)
+            old_sorted = np.repeat(np.arange(len(labels)), old_counts)
+            merged[np.arange(n_old) + new_start[old_sorted]] = self.order[col]
+            merged[old_end[codes[new_order]] + np.arange(n_new)] = new_order + n_old
+            self.order[col] = merged
+            self.codes[col] = np.concatenate([self.codes[col], codes])
+            self.offsets[col] = np.concatenate(([0], np.cumsum(old_counts + new_counts)))
+        self.n_rows = total
+
+    def code(self, col, label):
+        return self.lookup[col].get(label)
+
+    def posting(self, col, code):
+        start, stop = self.offsets[col][code], self.offsets[col][code + 1]
+        return self.order[col][start:stop]
+
+    def count(self, col, code):
+        return int(self.offsets[col][code + 1] - self.offsets[col][code])
+
+    def select(self, filters):
+        # filters maps column -> label; "All" and None mean unfiltered.
+        # Cost is the smallest posting list plus a gather per extra column.
+        terms = []
+        for col, label in filters.items():
+            if label is None or label == "All":
+                continue
+            code = self.code(col, label)
+            if code is None:
+                return np.empty(0, dtype=np.int64)
+            terms.append((self.count(col, code), col, code))
+        if not terms:
+            return np.arange(self.n_rows)
+        terms.sort()
+        _, col, code = terms[0]
+        rows = self.posting(col, code)
+        for _, col, code in terms[1:]:
+            rows = rows[self.codes[col][rows] == code]
+        return rows
+
+# ------------------- BENCHMARK -------------------
+def _mask_and_copy(df, encoders, job, exp):
+    # The pre-index refresh_table/export path, kept for comparison
+    df = df.copy()
+    if job != "All":
+        job_code = list(encoders["job_title"].classes_).index(job)
+        df = df[df["job_title"] == job_code]
+    if exp != "All":
+        exp_code = list(encoders["experience_level"].classes_).index(exp)
+        df = df[df["experience_level"] == exp_code]
+    return df
+
+def _best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def benchmark(df, encoders, repeat=5):
+    index = FilterIndex(df, encoders)
+    jobs = list(encoders["job_title"].classes_)
+    exps = list(encoders["experience_level"].classes_)
+    counts = pd.Series(df["job_title"]).value_counts()
+    common, rare = jobs[counts.index[0]], jobs[counts.index[-1]]
+    cases = [("All", "All"), (common, "All"), (rare, "All"), ("All", exps[0]), (common, exps[0])]
+    results = []
+    for job, exp in cases:
+        filters = {"job_title": job, "experience_level": exp}
+        rows = index.select(filters)
+        old = _best_of(lambda: _mask_and_copy(df, encoders, job, exp), repeat)
+        new = _best_of(lambda: index.select(filters), repeat)
+        results.append({"job": job, "exp": exp, "rows": len(rows),
+                        "mask_copy_ms": old * 1e3, "index_ms": new * 1e3})
+    return pd.DataFrame(results)
+
+# ------------------- MAIN EXECUTION -------------------
+if __name__ == "__main__":
+    from salary_data import load_data
+    from salary_model import fit_encoders, encode_frame
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else "salaries.csv"
+    frame = load_data(csv_path)
+    encs = fit_encoders(frame)
+    encode_frame(frame, encs)
+    t0 = time.perf_counter()
+    FilterIndex(frame, encs)
+    print(f"index build: {(time.perf_counter() - t0) * 1e3:.1f} ms for {len(frame):,} rows")
+    report = benchmark(frame, encs)
+    report["speedup"] = (report["mask_copy_ms"] / report["index_ms"].clip(lower=1e-6)).round(1)
+    print(report.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
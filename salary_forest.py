@@ -0,0 +1,136 @@
+# ------------------- IMPORTS & SETUP -------------------
+import sys
+import time
+from functools import lru_cache
+import numpy as np
+
+DEFAULT_CACHE_SIZE = 4096
+# Spread of the per-tree estimates reported as the prediction interval
+INTERVAL_QUANTILES = (0.1, 0.9)
+# Above this many rows sklearn's compiled per-tree walk beats the numpy one
+BATCH_ROWS = 256
+
+# ------------------- FLAT FOREST -------------------
+class FlatForest:
+    # A fitted RandomForestRegressor exported to contiguous node arrays.
+    # Every tree's nodes live in one set of arrays; child links are global
+    # indices and leaves point at themselves, so a traversal step is a pair
+    # of fancy-index gathers for all (tree, row) pairs at once.
+    def __init__(self, model, cache_size=DEFAULT_CACHE_SIZE):
+        trees = [est.tree_ for est in model.estimators_]
+        self.trees = trees
+        sizes = np.array([t.node_count for t in trees])
+        offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        self.n_trees = len(trees)
+        self.n_features = model.n_features_in_
+        self.roots = offsets.astype(np.int64)
+        self.max_depth = max(t.max_depth for t in trees)
+        feature, threshold, left, right, missing_left, value = [], [], [], [], [], []
+        for tree, off in zip(trees, offsets):
+            is_leaf = tree.children_left < 0
+            own = np.arange(tree.node_count) + off
+            left.append(np.where(is_leaf, own, tree.children_left + off))
+            right.append(np.where(is_leaf, own, tree.children_right + off))
+            # Leaves compare against +inf so they always "go left" to themselves
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+            # Branch sklearn sends NaN down; older trees have no such array
+            # and reject NaN before reaching a split
+            missing_left.append(getattr(tree, "missing_go_to_left", np.zeros(tree.node_count, dtype=np.uint8)))
+            value.append(tree.value[:, 0, 0])
+        self.feature = np.concatenate(feature).astype(np.int64)
+        self.threshold = np.concatenate(threshold).astype(np.float64)
+        self.left = np.concatenate(left).astype(np.int64)
+        self.right = np.concatenate(right).astype(np.int64)
+        self.missing_left = np.concatenate(missing_left).astype(bool)
+        self.value = np.concatenate(value).astype(np.float64)
+        self.predict_one = lru_cache(maxsize=cache_size)(self._predict_one)
+        self.interval_one = lru_cache(maxsize=cache_size)(self._interval_one)
+
+    @property
+    def nbytes(self):
+        arrays = (self.feature, self.threshold, self.left, self.right, self.missing_left, self.value)
+        return sum(a.nbytes for a in arrays)
+
+    def leaves(self, X):
+        # sklearn evaluates splits on float32 inputs; match it bit for bit
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        n = X.shape[0]
+        nodes = np.repeat(self.roots, n)
+        rows = np.tile(np.arange(n), self.n_trees)
+        has_nan = np.isnan(X).any()
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[nodes]]
+            go_left = x <= self.threshold[nodes]
+            if has_nan:
+                go_left = np.where(np.isnan(x), self.missing_left[nodes], go_left)
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes.reshape(self.n_trees, n)
+
+    def tree_predictions(self, X):
+        # (trees x rows) matrix of per-tree outputs. Interactive calls walk
+        # the flat arrays; large batches hand each Tree the float32 block
+        # directly, skipping the forest-level validation and dispatch.
+        X = np.asarray(X)
+        if X.shape[0] < BATCH_ROWS:
+            return self.value[self.leaves(X)]
+        X32 = np.ascontiguousarray(X, dtype=np.float32)
+        return np.stack([tree.predict(X32).reshape(len(X32), -1)[:, 0] for tree in self.trees])
+
+    def _mean(self, per_tree):
+        # Sum tree by tree in estimator order, as sklearn does, so the
+        # floating-point result is identical rather than merely close
+        total = np.zeros(per_tree.shape[1])
+        for row in per_tree:
+            total += row
+        return total / self.n_trees
+
+    def predict(self, X):
+        return self._mean(self.tree_predictions(X))
+
+    def predict_interval(self, X, quantiles=INTERVAL_QUANTILES):
+        # Mean, quantile band and spread from one trees x rows matrix
+        per_tree = self.tree_predictions(X)
+        low, high = np.quantile(per_tree, quantiles, axis=0)
+        return {"mean": self._mean(per_tree), "low": low, "high": high, "std": per_tree.std(axis=0)}
+
+    def _predict_one(self, features):
+        return float(self.predict(np.asarray([features]))[0])
+
+    def _interval_one(self, features):
+        summary = self.predict_interval(np.asarray([features]))
+        return {k: float(v[0]) for k, v in summary.items()}
+
+# ------------------- VERIFICATION -------------------
+def verify_against(model, X):
+    # Returns the number of rows whose prediction differs from sklearn's
+    flat = FlatForest(model)
+    expected = model.predict(X)
+    got = flat.predict(np.asarray(X))
+    return int(np.count_nonzero(expected != got))
+
+# ------------------- MAIN EXECUTION -------------------
+if __name__ == "__main__":
+    from salary_data import load_data, FEATURE_COLS
+    from salary_model import load_or_train, encode_frame
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else "salaries.csv"
+    encoders, model, _ = load_or_train(csv_path)
+    frame = encode_frame(load_data(csv_path), encoders)[FEATURE_COLS]
+    mismatches = verify_against(model, frame)
+    print(f"{mismatches} of {len(frame):,} predictions differ from sklearn")
+    flat = FlatForest(model)
+    sample = frame.iloc[0]
+    t0 = time.perf_counter()
+    for _ in range(200):
+        model.predict(frame.iloc[[0]])
+    sk = (time.perf_counter() - t0) / 200
+    t0 = time.perf_counter()
+    for _ in range(200):
+        flat._predict_one(tuple(sample))
+    cold = (time.perf_counter() - t0) / 200
+    t0 = time.perf_counter()
+    for _ in range(200):
+        flat.predict_one(tuple(sample))
+    warm = (time.perf_counter() - t0) / 200
+    print(f"single row: sklearn {sk * 1e6:,.0f} us | flat {cold * 1e6:,.0f} us | cached {warm * 1e6:,.1f} us")
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,182 @@
+# ------------------- IMPORTS & SETUP -------------------
+import os
+import sys
+import json
+import hashlib
+import pandas as pd
+from salary_data import cache_dir, file_digest, parse_csv_bytes
+
+INCOMING_DIR_NAME = "incoming"
+
+class IngestError(ValueError):
+    pass
+
+# ------------------- FRAME APPEND -------------------
+def append_frame(df, new):
+    # Categorical columns keep their existing codes: labels only in the new
+    # rows are added after the current categories before concatenating, so
+    # both sides share one dtype and the result stays categorical
+    new = new[list(df.columns)].copy()
+    for col in df.columns:
+        if not isinstance(df[col].dtype, pd.CategoricalDtype):
+            continue
+        incoming = pd.unique(new[col].astype(str))
+        extra = [label for label in incoming if label not in df[col].cat.categories]
+        if extra:
+            df[col] = df[col].cat.add_categories(extra)
+        new[col] = pd.Categorical(new[col].astype(str), categories=df[col].cat.categories)
+    return pd.concat([df, new], ignore_index=True)
+
+# ------------------- FILE HELPERS -------------------
+def _complete_end(path, block=1 << 16):
+    # Byte offset just past the last newline: a row still being written
+    # is left for the next scan
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        while pos > 0:
+            start = max(0, pos - block)
+            f.seek(start)
+            data = f.read(pos - start)
+            nl = data.rfind(b"\n")
+            if nl >= 0:
+                return start + nl + 1
+            pos = start
+    return 0
+
+def _read_span(path, start, end):
+    # Parses bytes [start, end) of a CSV, reusing the file's header line
+    with open(path, "rb") as f:
+        header = f.readline()
+        start = max(start, len(header))
+        if end <= start:
+            return parse_csv_bytes(header)
+        f.seek(start)
+        return parse_csv_bytes(header + f.read(end - start))
+
+# ------------------- INGEST LEDGER -------------------
+class Ingestor:
+    # Tracks which CSV files (and how many bytes of each) from a watched
+    # directory have been merged into a dataset. The ledger lives in the
+    # dataset's cache directory, so a restart replays exactly the rows that
+    # were ingested before and only reads what arrived since.
+    def __init__(self, data_path, watch_dir=None):
+        self.data_path = data_path
+        self.watch_dir = watch_dir or os.path.join(os.path.dirname(os.path.abspath(data_path)), INCOMING_DIR_NAME)
+        stem = os.path.splitext(os.path.basename(data_path))[0]
+        self.ledger_path = os.path.join(cache_dir(data_path), f"{stem}.ingest.json")
+        self.ledger = self._load()
+        self.warnings = []
+
+    def _load(self):
+        try:
+            with open(self.ledger_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.ledger_path), exist_ok=True)
+        tmp = self.ledger_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.ledger, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.ledger_path)
+
+    def files(self):
+        if not os.path.isdir(self.watch_dir):
+            return []
+        return sorted(os.path.join(self.watch_dir, name) for name in os.listdir(self.watch_dir)
+                      if name.lower().endswith(".csv"))
+
+    def fingerprint(self, base_digest):
+        # Identifies base file + ingested rows; equals the base digest until
+        # something is ingested, so existing cached models stay valid
+        if not self.ledger:
+            return base_digest
+        blob = json.dumps([base_digest] + [[name, e["digest"]] for name, e in sorted(self.ledger.items())])
+        return hashlib.blake2b(blob.encode(), digest_size=16).hexdigest()
+
+    def _check_columns(self, name, frame, columns):
+        missing = [c for c in columns if c not in frame.columns]
+        if missing:
+            raise IngestError(f"{name} is missing columns: {', '.join(missing)}")
+
+    def replay(self, columns):
+        # Frames for everything already in the ledger. An entry whose file
+        # was removed or rewritten is dropped, so the next scan() treats a
+        # rewritten file as new and reads it in full.
+        frames, dropped = [], False
+        for name, entry in sorted(self.ledger.items()):
+            path = os.path.join(self.watch_dir, name)
+            try:
+                if file_digest(path, limit=entry["bytes"]) != entry["digest"]:
+                    raise IngestError(f"{name} changed since it was ingested")
+                frame = _read_span(path, 0, entry["bytes"])
+                self._check_columns(name, frame, columns)
+            except (OSError, ValueError) as exc:
+                self.warnings.append(f"{exc}; its rows were not loaded")
+                del self.ledger[name]
+                dropped = True
+                continue
+            frames.append(frame[list(columns)])
+        if dropped:
+            self._save()
+        return frames
+
+    def scan(self, columns):
+        # New files, and rows appended to known ones, as a list of batches:
+        # {"name", "start", "end", "digest", "mtime_ns", "rows", "frame"}.
+        # Nothing is recorded until commit(), so a failed apply is retried.
+        batches = []
+        for path in self.files():
+            name = os.path.basename(path)
+            entry = self.ledger.get(name)
+            try:
+                st = os.stat(path)
+                if entry is not None and entry.get("mtime_ns") == st.st_mtime_ns:
+                    continue
+                end = _complete_end(path)
+                start = 0
+                if entry is not None:
+                    if end < entry["bytes"] or file_digest(path, limit=entry["bytes"]) != entry["digest"]:
+                        self.warnings.append(f"{name} was rewritten, not appended to; restart to reload it")
+                        continue
+                    start = entry["bytes"]
+                if end <= start:
+                    continue
+                frame = _read_span(path, start, end)
+                self._check_columns(name, frame, columns)
+            except (OSError, ValueError) as exc:
+                self.warnings.append(str(exc))
+                continue
+            if len(frame):
+                batches.append({"name": name, "start": start, "end": end,
+                                "digest": file_digest(path, limit=end), "mtime_ns": st.st_mtime_ns,
+                                "rows": len(frame), "frame": frame[list(columns)]})
+        return batches
+
+    def commit(self, batches):
+        for b in batches:
+            rows = self.ledger.get(b["name"], {}).get("rows", 0)
+            self.ledger[b["name"]] = {"bytes": b["end"], "digest": b["digest"],
+                                      "mtime_ns": b["mtime_ns"], "rows": rows + b["rows"]}
+        if batches:
+            self._save()
+
+    def take_warnings(self):
+        warnings, self.warnings = self.warnings, []
+        return warnings
+
+# ------------------- MAIN EXECUTION -------------------
+if __name__ == "__main__":
+    from salary_data import load_data
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else "salaries.csv"
+    ingestor = Ingestor(csv_path, sys.argv[2] if len(sys.argv) > 2 else None)
+    columns = list(load_data(csv_path).columns)
+    print(f"watching {ingestor.watch_dir}")
+    for name, entry in sorted(ingestor.ledger.items()):
+        print(f"ingested {name}: {entry['rows']:,} rows")
+    for b in ingestor.scan(columns):
+        print(f"pending  {b['name']}: {b['rows']:,} new rows (bytes {b['start']:,}-{b['end']:,})")
+    for warning in ingestor.take_warnings():
+        print(f"warning: {warning}")
@@ -0,0 +1,104 @@
+# ------------------- IMPORTS & SETUP -------------------
+import numpy as np
+from salary_data import TARGET_COL
+
+INSIGHT_GROUP_COLS = ["job_title", "employee_residence", "company_location"]
+
+# ------------------- INCREMENTAL INSIGHT STORE -------------------
+class InsightStore:
+    # Running per-group sums and counts indexed by label-encoded code. A code
+    # with a non-zero count is in the distinct set, so appends are a pair of
+    # bincounts over the new rows and reads never touch the dataset.
+    def __init__(self, value_col=TARGET_COL, group_cols=INSIGHT_GROUP_COLS):
+        self.value_col = value_col
+        self.group_cols = list(group_cols)
+        self.sums = {col: np.zeros(0, dtype=np.float64) for col in self.group_cols}
+        self.counts = {col: np.zeros(0, dtype=np.int64) for col in self.group_cols}
+        self.n_rows = 0
+        self.top_cache = {}
+
+    @classmethod
+    def from_frame(cls, df, **kwargs):
+        store = cls(**kwargs)
+        store.append(df)
+        return store
+
+    def append(self, df):
+        if len(df) == 0:
+            return
+        values = df[self.value_col].to_numpy(dtype=np.float64)
+        for col in self.group_cols:
+            codes = df[col].to_numpy()
+            size = max(len(self.counts[col]), int(codes.max()) + 1)
+            sums = np.bincount(codes, weights=values, minlength=size)
+            counts = np.bincount(codes, minlength=size)
+            sums[:len(self.sums[col])] += self.sums[col]
+            counts[:len(self.counts[col])] += self.counts[col]
+            self.sums[col], self.counts[col] = sums, counts
+        self.n_rows += len(df)
+        self.top_cache.clear()
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in self.sums.values()) + sum(a.nbytes for a in self.counts.values())
+
+    def means(self, col):
+        counts = self.counts[col]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts > 0, self.sums[col] / counts, np.nan)
+
+    def distinct(self, col):
+        return int(np.count_nonzero(self.counts[col]))
+
+    def top_k(self, col, k=5):
+        # O(groups), cached until the next append. Ties go to the lower code,
+        # as nlargest does on a groupby mean
+        key = (col, k)
+        if key not in self.top_cache:
+            present = np.flatnonzero(self.counts[col])
+            means = self.means(col)[present]
+            if len(present) > k > 0:
+                # Everything tied with the k-th largest stays a candidate
+                kth = np.partition(means, len(means) - k)[len(means) - k]
+                keep = means >= kth
+                present, means = present[keep], means[keep]
+            order = np.lexsort((present, -means))[:max(k, 0)]
+            self.top_cache[key] = [(int(c), float(m)) for c, m in zip(present[order], means[order])]
+        return self.top_cache[key]
+
+# ------------------- PEER MEDIAN LOOKUP -------------------
+def median_table(df, row_col="job_title", col_col="experience_level", value_col=TARGET_COL):
+    # Median salary per (row code, column code) as a dense 2-D array so the
+    # predictor can compare against peers with one index, not a scan
+    medians = df.groupby([row_col, col_col], observed=True)[value_col].median()
+    rows = medians.index.get_level_values(0).to_numpy()
+    cols = medians.index.get_level_values(1).to_numpy()
+    shape = (int(df[row_col].max()) + 1, int(df[col_col].max()) + 1) if len(df) else (0, 0)
+    table = np.full(shape, np.nan)
+    table[rows, cols] = medians.to_numpy(dtype=np.float64)
+    return table
+
+def update_median_table(table, df, index, new, row_col="job_title", col_col="experience_level",
+                        value_col=TARGET_COL):
+    # After rows are appended to df (and to index, a FilterIndex over df),
+    # recomputes only the cells whose (row, column) pairs the new rows touch
+    if len(new) == 0:
+        return table
+    pairs = np.unique(np.column_stack([new[row_col].to_numpy(), new[col_col].to_numpy()]), axis=0)
+    shape = (max(table.shape[0], int(pairs[:, 0].max()) + 1), max(table.shape[1], int(pairs[:, 1].max()) + 1))
+    if shape != table.shape:
+        grown = np.full(shape, np.nan)
+        grown[:table.shape[0], :table.shape[1]] = table
+        table = grown
+    values = df[value_col].to_numpy(dtype=np.float64)
+    for r, c in pairs:
+        rows = index.posting(row_col, r)
+        rows = rows[index.codes[col_col][rows] == c]
+        table[r, c] = np.median(values[rows])
+    return table
+
+def peer_median(table, row_code, col_code):
+    if 0 <= row_code < table.shape[0] and 0 <= col_code < table.shape[1]:
+        value = table[row_code, col_code]
+        return None if np.isnan(value) else float(value)
+    return None
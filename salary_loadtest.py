@@ -0,0 +1,203 @@
+# ------------------- IMPORTS & SETUP -------------------
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import subprocess
+from urllib.parse import urlsplit, urlencode
+import numpy as np
+from salary_data import FEATURE_COLS, TARGET_COL
+from salary_service import DEFAULT_HOST, DEFAULT_PORT
+
+# Share of each request type; roughly what a room of dashboards sends
+DEFAULT_MIX = {"predict": 0.5, "aggregate": 0.25, "count": 0.1, "rows": 0.1, "insights": 0.05}
+START_TIMEOUT_S = 300
+
+# ------------------- HTTP CLIENT -------------------
+class Connection:
+    # One keep-alive connection, one request in flight, like one dashboard
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=b""):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                          f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        await self.reader.readexactly(length)
+        return status
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+# ------------------- WORKLOAD -------------------
+def build_requests(meta, rng, n_profiles=200):
+    # Request factories per type, drawn from the labels the service reports
+    labels = meta["encoders"]
+    group_cols = [c for c in ("job_title", "experience_level", "company_size", "employee_residence", "work_year")
+                  if c in meta["columns"]]
+    def filters():
+        f = {}
+        if rng.random() < 0.5:
+            f["experience_level"] = rng.choice(labels["experience_level"])
+        if rng.random() < 0.3:
+            f["job_title"] = rng.choice(labels["job_title"])
+        return f
+    # A fixed pool of profiles, so repeats exercise the cache as real use would
+    profiles = [{col: (rng.choice([0, 50, 100]) if col == "remote_ratio" else rng.choice(labels[col]))
+                 for col in FEATURE_COLS} for _ in range(n_profiles)]
+    def predict():
+        return "POST", "/predict", json.dumps({"rows": [rng.choice(profiles)]}).encode()
+    def aggregate():
+        kind = rng.choice(["mean", "mean", "counts", "hist", "box"])
+        if kind == "hist":
+            cols = [TARGET_COL]
+        elif kind == "counts":
+            cols = [rng.choice(group_cols)]
+        else:
+            cols = [rng.choice(group_cols), TARGET_COL]
+        return "GET", "/aggregate?" + urlencode(dict(filters(), kind=kind, cols=",".join(cols))), b""
+    def count():
+        return "GET", "/count?" + urlencode(filters()), b""
+    def rows():
+        start = rng.randrange(0, 20) * 500
+        return "GET", "/rows?" + urlencode(dict(filters(), start=start, stop=start + 500)), b""
+    def insights():
+        return "GET", "/aggregate?" + urlencode(dict(filters(), kind="insights", cols="")), b""
+    return {"predict": predict, "aggregate": aggregate, "count": count, "rows": rows, "insights": insights}
+
+async def run_load(host, port, concurrency, duration, mix, seed=0):
+    # concurrency clients send back-to-back requests for duration seconds.
+    # Returns {type: [latency seconds]} and the error count.
+    rng = random.Random(seed)
+    meta = json.loads(await _get_json(host, port, "/meta"))
+    factories = build_requests(meta, rng)
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    latencies = {n: [] for n in names}
+    errors = {"count": 0}
+    deadline = time.perf_counter() + duration
+
+    async def client(i):
+        conn = Connection(host, port)
+        local = random.Random(seed * 1000 + i)
+        try:
+            while time.perf_counter() < deadline:
+                name = local.choices(names, weights)[0]
+                method, path, body = factories[name]()
+                t0 = time.perf_counter()
+                try:
+                    status = await conn.request(method, path, body)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    conn.close()
+                    conn = Connection(host, port)
+                    status = 0
+                latencies[name].append(time.perf_counter() - t0)
+                if status != 200:
+                    errors["count"] += 1
+        finally:
+            conn.close()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(concurrency)))
+    return latencies, errors["count"], time.perf_counter() - t0
+
+async def _get_json(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    return data.split(b"\r\n\r\n", 1)[1]
+
+# ------------------- REPORT -------------------
+def summarize(latencies, elapsed):
+    rows = []
+    for name, values in list(latencies.items()) + [("all", [v for vs in latencies.values() for v in vs])]:
+        if not values:
+            continue
+        ms = np.asarray(values) * 1e3
+        rows.append({"type": name, "requests": len(ms), "rps": len(ms) / elapsed,
+                     "p50_ms": float(np.percentile(ms, 50)), "p95_ms": float(np.percentile(ms, 95)),
+                     "p99_ms": float(np.percentile(ms, 99)), "max_ms": float(ms.max())})
+    return rows
+
+def format_summary(rows):
+    lines = [f"{'type':<12}{'requests':>10}{'req/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"]
+    for r in rows:
+        lines.append(f"{r['type']:<12}{r['requests']:>10,}{r['rps']:>10,.0f}{r['p50_ms']:>9.2f}"
+                     f"{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['max_ms']:>9.2f}")
+    return "\n".join(lines)
+
+# ------------------- SERVICE PROCESS -------------------
+def start_service(data, host, port, extra_args=()):
+    # Launches salary_service.py and waits until it answers
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "salary_service.py")
+    proc = subprocess.Popen([sys.executable, script, data, "--host", host, "--port", str(port), *extra_args])
+    deadline = time.time() + START_TIMEOUT_S
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"salary_service.py exited with code {proc.returncode}")
+        try:
+            asyncio.run(_get_json(host, port, "/meta"))
+            return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("salary_service.py did not start in time")
+
+# ------------------- COMMAND LINE -------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the salary analytics service.")
+    parser.add_argument("--url", default=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}")
+    parser.add_argument("--serve", metavar="DATA", help="start salary_service.py on this CSV for the run")
+    parser.add_argument("--no-cache", action="store_true", help="with --serve: disable the response cache")
+    parser.add_argument("-c", "--concurrency", type=int, default=32, help="simultaneous clients")
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--mix", type=json.loads, default=DEFAULT_MIX,
+                        help=f"JSON request mix (default: {json.dumps(DEFAULT_MIX)})")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    args = parser.parse_args(argv)
+
+    url = urlsplit(args.url if "//" in args.url else "http://" + args.url)
+    host, port = url.hostname, url.port or DEFAULT_PORT
+    proc = start_service(args.serve, host, port, ["--no-cache"] if args.no_cache else []) if args.serve else None
+    try:
+        latencies, errors, elapsed = asyncio.run(run_load(host, port, args.concurrency, args.duration,
+                                                          args.mix, args.seed))
+        stats = json.loads(asyncio.run(_get_json(host, port, "/stats")))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+    rows = summarize(latencies, elapsed)
+    print(format_summary(rows))
+    batching = stats.get("predict") or {}
+    cache = stats.get("cache") or {}
+    print(f"\n{args.concurrency} clients, {elapsed:.1f}s, {errors} errors | predict batches: "
+          f"{batching.get('batches', 0):,} ({batching.get('rows_per_batch', 0):.1f} rows avg) | "
+          f"cache hits {cache.get('hits', 0):,} / misses {cache.get('misses', 0):,}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"concurrency": args.concurrency, "duration": elapsed, "errors": errors,
+                       "results": rows, "service": stats}, f, indent=2)
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+# ------------------- IMPORTS & SETUP -------------------
+import os
+import copy
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+from salary_data import (
+    dataset_fingerprint, cache_dir, ENCODED_COLS, FEATURE_COLS, TARGET_COL
+)
+
+MODEL_PARAMS = {"n_estimators": 50, "random_state": 42}
+# Bump when encoding or training changes in a way the key would not capture
+MODEL_VERSION = 2
+# Incremental refresh: trees added per ingest, and the size past which the
+# oldest trees are retired
+REFRESH_TREES = 10
+MAX_TREES = 100
+# Out-of-core datasets train on a sample of this many rows
+TRAIN_SAMPLE_ROWS = 1_000_000
+
+# sklearn and joblib are imported where they are used: they cost more than a
+# second at startup and the dashboard only needs them on the training thread.
+
+# ------------------- ENCODING -------------------
+def code_dtype(n_classes):
+    # Smallest signed int that holds every code (and code + 1), as pandas
+    # picks for cat.codes; models cast to float32 when they predict
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_classes < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+class CategoryEncoder:
+    # LabelEncoder-compatible (sorted classes_, same codes) without importing
+    # sklearn. Categorical columns are encoded through their categories, so
+    # no per-row strings are built.
+    def __init__(self, classes=()):
+        self.classes_ = np.asarray(list(classes), dtype=object)
+        self._index = None
+
+    def __getstate__(self):
+        return {"classes_": self.classes_}
+
+    def __setstate__(self, state):
+        self.classes_ = state["classes_"]
+        self._index = None
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = pd.Index(self.classes_)
+        return self._index
+
+    def fit(self, values):
+        s = pd.Series(values)
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            labels = s.cat.remove_unused_categories().cat.categories.astype(str)
+        else:
+            labels = pd.unique(s.astype(str))
+        self.classes_ = np.asarray(sorted(labels), dtype=object)
+        self._index = None
+        return self
+
+    def transform(self, values):
+        s = pd.Series(values)
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            lookup = self.index.get_indexer(s.cat.categories.astype(str))
+            cat_codes = s.cat.codes.to_numpy()
+            codes = np.where(cat_codes < 0, -1, lookup[cat_codes])
+        else:
+            codes = self.index.get_indexer(s.astype(str).to_numpy())
+        if (codes < 0).any():
+            unseen = pd.unique(s[codes < 0].astype(str))[:5]
+            raise ValueError(f"y contains previously unseen labels: {list(unseen)}")
+        return codes.astype(code_dtype(len(self.classes_)))
+
+    def fit_transform(self, values):
+        return self.fit(values).transform(values)
+
+    def extend(self, values):
+        # Appends labels not seen before after the existing ones, so every
+        # existing code keeps its meaning; classes_ is no longer fully sorted
+        s = pd.Series(values)
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            labels = pd.Index(s.cat.remove_unused_categories().cat.categories.astype(str))
+        else:
+            labels = pd.Index(pd.unique(s.astype(str)))
+        added = sorted(labels[self.index.get_indexer(labels) < 0])
+        if added:
+            self.classes_ = np.concatenate([self.classes_, np.asarray(added, dtype=object)])
+            self._index = None
+        return added
+
+def fit_encoders(df):
+    return {col: CategoryEncoder().fit(df[col]) for col in ENCODED_COLS}
+
+def extend_encoders(encoders, df):
+    # Returns {column: labels appended} for columns that gained labels
+    added = {col: encoders[col].extend(df[col]) for col in ENCODED_COLS}
+    return {col: labels for col, labels in added.items() if labels}
+
+def copy_encoders(encoders):
+    return {col: CategoryEncoder(enc.classes_) for col, enc in encoders.items()}
+
+def encode_frame(df, encoders):
+    for col in ENCODED_COLS:
+        df[col] = encoders[col].transform(df[col])
+    return df
+
+# ------------------- TRAINING -------------------
+def train_model(df, params=None, n_jobs=-1):
+    from sklearn.ensemble import RandomForestRegressor
+    params = dict(MODEL_PARAMS if params is None else params)
+    params.setdefault("n_jobs", n_jobs)
+    model = RandomForestRegressor(**params)
+    model.fit(df[FEATURE_COLS], df[TARGET_COL])
+    # Single-row predictions are faster without the joblib pool
+    model.set_params(n_jobs=None)
+    return model
+
+def refresh_model(model, df, extra_trees=REFRESH_TREES, max_trees=MAX_TREES, n_jobs=-1):
+    # Warm start: keeps the fitted trees and grows extra_trees new ones on
+    # the current frame, then drops the oldest beyond max_trees. Works on a
+    # shallow copy so the forest in use is never modified under a reader.
+    from sklearn.utils import check_random_state
+    model = copy.copy(model)
+    model.estimators_ = list(model.estimators_)
+    # A new stream per refresh: once the forest is capped the tree count no
+    # longer grows, and a fixed random_state would hand every batch of new
+    # trees the same seeds
+    seed = int(check_random_state(model.random_state).randint(np.iinfo(np.int32).max))
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + extra_trees, n_jobs=n_jobs,
+                     random_state=seed)
+    model.fit(df[FEATURE_COLS], df[TARGET_COL])
+    excess = len(model.estimators_) - max_trees
+    if excess > 0:
+        del model.estimators_[:excess]
+    model.set_params(warm_start=False, n_estimators=len(model.estimators_), n_jobs=None)
+    return model
+
+# ------------------- MODEL STORE -------------------
+def training_digest(csv_path, ingestor=None, n_rows=None):
+    # The rows a model is trained on: the base file plus the ingest ledger
+    # in memory, or the sample an out-of-core dataset of n_rows is trained
+    # on. The dashboard, the service and the CLIs all key models by this.
+    digest = dataset_fingerprint(csv_path)
+    if ingestor is not None:
+        return ingestor.fingerprint(digest)
+    if n_rows is not None and n_rows > TRAIN_SAMPLE_ROWS:
+        return f"{digest}:sample-{TRAIN_SAMPLE_ROWS}"
+    return digest
+
+def model_key(digest, params=None):
+    params = MODEL_PARAMS if params is None else params
+    blob = json.dumps({"data": digest, "params": params, "features": FEATURE_COLS,
+                       "version": MODEL_VERSION}, sort_keys=True)
+    return hashlib.blake2b(blob.encode(), digest_size=12).hexdigest()
+
+class ModelStore:
+    def __init__(self, root, dataset="default"):
+        self.root = root
+        self.dataset = dataset
+
+    @classmethod
+    def for_dataset(cls, csv_path):
+        stem = os.path.splitext(os.path.basename(csv_path))[0]
+        return cls(os.path.join(cache_dir(csv_path), "models"), stem)
+
+    def path(self, key):
+        return os.path.join(self.root, f"model-{key}.joblib")
+
+    def encoders_path(self, key):
+        return os.path.join(self.root, f"encoders-{key}.json")
+
+    def load(self, key):
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            import joblib
+            bundle = joblib.load(path)
+            return bundle["encoders"], bundle["model"]
+        except Exception:
+            return None  # truncated or incompatible pickle: retrain
+
+    def load_model(self, key):
+        cached = self.load(key)
+        return None if cached is None else cached[1]
+
+    def load_encoders(self, key):
+        # Plain JSON sidecar: lets the UI encode the frame before the model
+        # (and sklearn) has been unpickled
+        if not os.path.exists(self.path(key)):
+            return None
+        try:
+            with open(self.encoders_path(key)) as f:
+                classes = json.load(f)
+            return {col: CategoryEncoder(classes[col]) for col in ENCODED_COLS}
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def params_path(self):
+        return os.path.join(self.root, f"params-{self.dataset}.json")
+
+    def active_params(self):
+        # Parameters promoted by a tuning run, else the defaults
+        try:
+            with open(self.params_path()) as f:
+                return json.load(f)["params"]
+        except (OSError, ValueError, KeyError):
+            return dict(MODEL_PARAMS)
+
+    def promote(self, params, report=None):
+        os.makedirs(self.root, exist_ok=True)
+        path = self.params_path()
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"params": params, "report": report}, f, indent=1)
+        os.replace(tmp, path)
+        return path
+
+    def save(self, key, encoders, model):
+        import joblib
+        os.makedirs(self.root, exist_ok=True)
+        path = self.path(key)
+        sidecar = self.encoders_path(key)
+        # Per-process temp names: the dashboard, the service and the CLIs
+        # may save the same key at once
+        tmp = f"{sidecar}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({col: [str(c) for c in encoders[col].classes_] for col in ENCODED_COLS}, f)
+        os.replace(tmp, sidecar)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        joblib.dump({"encoders": encoders, "model": model}, tmp, compress=3)
+        os.replace(tmp, path)
+        return path
+
+# ------------------- HEADLESS LOADING -------------------
+def load_or_train(csv_path, params=None, n_jobs=-1, backend=None, watch_dir=None):
+    # Same cache, key and training rows as the dashboard on the same backend,
+    # for callers without a UI thread: the base file plus ingested rows in
+    # memory, a sample out of core. Returns (encoders, model, bundle path or
+    # None when it could not be saved).
+    # Imported here: salary_backend imports this module
+    from salary_backend import ArrowBackend, choose_backend, open_backend
+    from salary_ingest import Ingestor
+    store = ModelStore.for_dataset(csv_path)
+    params = store.active_params() if params is None else params
+    if choose_backend(csv_path, backend) == "arrow":
+        data = ArrowBackend.from_csv(csv_path)
+        key = model_key(training_digest(csv_path, n_rows=data.n_rows), params)
+    else:
+        data = None
+        key = model_key(training_digest(csv_path, Ingestor(csv_path, watch_dir)), params)
+    cached = store.load(key)
+    if cached is not None:
+        return cached[0], cached[1], store.path(key)
+    if data is None:
+        data, encoders = open_backend(csv_path, "pandas", watch_dir)
+        df = data.df
+    else:
+        encoders = data.fit_encoders()
+        df = encode_frame(data.sample(TRAIN_SAMPLE_ROWS), encoders)
+    model = train_model(df, params, n_jobs=n_jobs)
+    try:
+        path = store.save(key, encoders, model)
+    except OSError:
+        path = None
+    return encoders, model, path
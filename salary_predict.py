@@ -0,0 +1,164 @@
+# ------------------- IMPORTS & SETUP -------------------
+import os
+import sys
+import time
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import joblib
+from salary_data import ENCODED_COLS, FEATURE_COLS
+from salary_model import load_or_train
+from salary_forest import FlatForest
+
+PREDICTION_COL = "predicted_salary_in_usd"
+INTERVAL_COLS = ("predicted_salary_low", "predicted_salary_high", "prediction_std")
+STATUS_COL = "prediction_status"
+UNSEEN_POLICIES = ("error", "skip")
+DEFAULT_CHUNK_ROWS = 50_000
+
+class UnseenCategoryError(ValueError):
+    pass
+
+# ------------------- VECTORIZED ENCODING -------------------
+def category_lookups(encoders):
+    # classes_ as a pandas Index: get_indexer is a hash lookup per value
+    return {col: pd.Index(encoders[col].classes_) for col in ENCODED_COLS}
+
+def encode_features(frame, lookups, on_unseen="error"):
+    # Returns (feature frame, status array). Status is "" for scored rows
+    # and "unseen:<col>=<value>" for rows skipped under on_unseen="skip".
+    if on_unseen not in UNSEEN_POLICIES:
+        raise ValueError(f"on_unseen must be one of {UNSEEN_POLICIES}")
+    missing = [c for c in FEATURE_COLS if c not in frame.columns]
+    if missing:
+        raise ValueError(f"Input is missing columns: {', '.join(missing)}")
+    n = len(frame)
+    status = np.full(n, "", dtype=object)
+    features = {}
+    for col in FEATURE_COLS:
+        if col not in lookups:
+            values = pd.to_numeric(frame[col], errors="coerce")
+            bad = values.isna().to_numpy()
+            features[col] = values.fillna(0).to_numpy(dtype=np.int64)
+        else:
+            raw = frame[col].astype(str).to_numpy()
+            codes = lookups[col].get_indexer(raw)
+            bad = codes < 0
+            features[col] = np.where(bad, 0, codes)
+        if bad.any():
+            if on_unseen == "error":
+                examples = pd.unique(frame[col][bad].astype(str))[:5]
+                raise UnseenCategoryError(f"Unseen values in {col}: {', '.join(examples)}")
+            fresh = bad & (status == "")
+            status[fresh] = [f"unseen:{col}={v}" for v in frame[col][fresh].astype(str)]
+    return pd.DataFrame(features, columns=FEATURE_COLS), status
+
+def predict_frame(frame, encoders, model, on_unseen="error", lookups=None):
+    # model may be a fitted forest or an already compiled FlatForest; the
+    # interval columns come from the same per-tree matrix as the estimate
+    lookups = lookups or category_lookups(encoders)
+    forest = model if isinstance(model, FlatForest) else FlatForest(model)
+    X, status = encode_features(frame, lookups, on_unseen)
+    results = {col: np.full(len(frame), np.nan) for col in (PREDICTION_COL,) + INTERVAL_COLS}
+    ok = status == ""
+    if ok.any():
+        summary = forest.predict_interval(X[ok].to_numpy())
+        for col, key in zip((PREDICTION_COL,) + INTERVAL_COLS, ("mean", "low", "high", "std")):
+            results[col][ok] = summary[key]
+    out = frame.copy()
+    for col, values in results.items():
+        out[col] = np.round(values, 2)
+    if on_unseen == "skip":
+        out[STATUS_COL] = status
+    return out
+
+# ------------------- PROCESS POOL WORKERS -------------------
+_worker_state = {}
+
+def _init_worker(bundle_path):
+    bundle = joblib.load(bundle_path)
+    _worker_state["encoders"] = bundle["encoders"]
+    _worker_state["model"] = FlatForest(bundle["model"])
+    _worker_state["lookups"] = category_lookups(bundle["encoders"])
+
+def _predict_chunk(chunk, on_unseen):
+    return predict_frame(chunk, _worker_state["encoders"], _worker_state["model"],
+                         on_unseen, _worker_state["lookups"])
+
+# ------------------- STREAMING BATCH SCORING -------------------
+def predict_file(in_path, out_path, data_path="salaries.csv", workers=None,
+                 chunk_rows=DEFAULT_CHUNK_ROWS, on_unseen="error", progress=None):
+    # Reads in_path in chunks, scores them (across a process pool when
+    # workers > 1) and appends results to out_path in input order.
+    # Returns {"rows", "seconds", "rows_per_sec"}.
+    workers = workers or os.cpu_count() or 1
+    encoders, model, bundle_path = load_or_train(data_path)
+    reader = pd.read_csv(in_path, chunksize=chunk_rows)
+    t0 = time.perf_counter()
+    rows = 0
+    tmp_bundle = None
+    tmp_out = out_path + ".part"
+    try:
+        with open(tmp_out, "w", newline="") as handle:
+            def write(result):
+                nonlocal rows
+                result.to_csv(handle, index=False, header=(rows == 0))
+                rows += len(result)
+                if progress is not None:
+                    progress(rows)
+
+            if workers <= 1:
+                lookups = category_lookups(encoders)
+                forest = FlatForest(model)
+                for chunk in reader:
+                    write(predict_frame(chunk, encoders, forest, on_unseen, lookups))
+            else:
+                if bundle_path is None:
+                    fd, tmp_bundle = tempfile.mkstemp(suffix=".joblib")
+                    os.close(fd)
+                    joblib.dump({"encoders": encoders, "model": model}, tmp_bundle)
+                    bundle_path = tmp_bundle
+                # A bounded window of in-flight chunks keeps memory flat
+                # while results are still written in input order
+                with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(bundle_path,)) as pool:
+                    pending = []
+                    for chunk in reader:
+                        pending.append(pool.submit(_predict_chunk, chunk, on_unseen))
+                        if len(pending) >= 2 * workers:
+                            write(pending.pop(0).result())
+                    for future in pending:
+                        write(future.result())
+        os.replace(tmp_out, out_path)
+    finally:
+        if os.path.exists(tmp_out):
+            os.remove(tmp_out)
+        if tmp_bundle is not None:
+            os.remove(tmp_bundle)
+    seconds = time.perf_counter() - t0
+    return {"rows": rows, "seconds": seconds, "rows_per_sec": rows / seconds if seconds else 0.0}
+
+# ------------------- COMMAND LINE -------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score candidate profiles with the salary model.")
+    parser.add_argument("input", help="CSV with the model's feature columns")
+    parser.add_argument("-o", "--output", required=True, help="CSV to write predictions to")
+    parser.add_argument("--data", default="salaries.csv", help="training dataset (selects the cached model)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--on-unseen", choices=UNSEEN_POLICIES, default="error",
+                        help="fail on unknown categories, or skip those rows with a status note")
+    args = parser.parse_args(argv)
+    try:
+        report = predict_file(args.input, args.output, args.data, args.workers,
+                              args.chunk_rows, args.on_unseen)
+    except UnseenCategoryError as exc:
+        print(f"error: {exc} (use --on-unseen skip to score the rest)", file=sys.stderr)
+        return 2
+    print(f"{report['rows']:,} rows in {report['seconds']:.2f}s "
+          f"({report['rows_per_sec']:,.0f} rows/sec)", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+# ------------------- IMPORTS & SETUP -------------------
+import os
+import sys
+import json
+import time
+from contextlib import contextmanager
+
+# Set to a file path (or "1" for the default) to append one JSON line per launch
+PROFILE_ENV = "SALARY_PROFILE_STARTUP"
+DEFAULT_PROFILE_PATH = os.path.join(".salary_cache", "startup_profile.jsonl")
+
+# ------------------- STARTUP PROFILER -------------------
+class StartupProfiler:
+    # Records named, possibly nested phases relative to process start so a
+    # launch can be compared against earlier ones phase by phase.
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.phases = []
+        self.marks = {}
+        self.depth = 0
+        self.written = False
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        self.depth += 1
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            end = time.perf_counter()
+            self.phases.append({
+                "name": name,
+                "start_ms": round((start - self.t0) * 1e3, 2),
+                "ms": round((end - start) * 1e3, 2),
+                "depth": self.depth,
+            })
+
+    def mark(self, name):
+        self.marks[name] = round((time.perf_counter() - self.t0) * 1e3, 2)
+
+    def report(self):
+        return {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "marks": dict(self.marks),
+            "phases": sorted(self.phases, key=lambda p: p["start_ms"]),
+        }
+
+    def format_report(self):
+        lines = [f"{'phase':<40}{'start ms':>10}{'ms':>10}"]
+        for p in self.report()["phases"]:
+            lines.append(f"{'  ' * p['depth'] + p['name']:<40}{p['start_ms']:>10.1f}{p['ms']:>10.1f}")
+        for name, at in self.marks.items():
+            lines.append(f"{'@ ' + name:<40}{at:>10.1f}")
+        return "\n".join(lines)
+
+    def write(self, path=None):
+        # No-op unless a path is given or the environment variable is set
+        target = path or os.environ.get(PROFILE_ENV)
+        if not target or self.written:
+            return None
+        if target == "1":
+            target = DEFAULT_PROFILE_PATH
+        directory = os.path.dirname(target)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(target, "a") as f:
+            f.write(json.dumps(self.report()) + "\n")
+        print(self.format_report(), file=sys.stderr)
+        self.written = True
+        return target
+
+PROFILER = StartupProfiler()
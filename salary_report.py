@@ -0,0 +1,270 @@
+# ------------------- IMPORTS & SETUP -------------------
+import os
+import re
+import sys
+import html
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from salary_data import dataset_fingerprint, CATEGORICAL_COLS, TARGET_COL
+from salary_backend import choose_backend, open_backend
+from salary_aggregates import AggregateCache
+from salary_charts import CHART_TYPES, CHART_COLUMNS, CHART_AGGREGATES, chart_data, draw_chart
+from salary_ingest import Ingestor
+
+# Bump when chart styling changes so existing PNGs are redrawn
+REPORT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+FIGSIZE = (9, 6)
+DPI = 100
+# Columns each scope is broken down by (a "scope" is one report page)
+DEFAULT_SCOPE_COLS = ["employee_residence", "experience_level"]
+DEFAULT_GROUP_COLS = [
+    "work_year", "experience_level", "employment_type", "company_size",
+    "remote_ratio", "job_title", "employee_residence", "company_location",
+]
+
+# ------------------- DATA -------------------
+def data_fingerprint(csv_path, backend=None, watch_dir=None):
+    # What the dashboard would show: the base file plus ingested rows in
+    # memory, the base file alone out of core. Needs no parsing.
+    digest = dataset_fingerprint(csv_path)
+    if choose_backend(csv_path, backend) == "pandas":
+        digest = Ingestor(csv_path, watch_dir).fingerprint(digest)
+    return digest
+
+def _decode(kind, col, data, encoders):
+    # Aggregates are keyed by label code; reports show the labels
+    encoder = encoders.get(col)
+    if encoder is None or kind in ("hist", "insights"):
+        return data
+    classes = encoder.classes_
+    if kind == "box":
+        return [dict(s, label=str(classes[int(s["label"])])) for s in data]
+    index = pd.Index([classes[int(c)] for c in data.index], name=data.index.name)
+    return pd.Series(data.to_numpy(), index=index, name=data.name)
+
+def _is_empty(kind, data):
+    if kind == "hist":
+        return data["n"] == 0
+    return len(data) == 0
+
+def _content_digest(value, h=None):
+    # Hash of what a chart is drawn from, so a PNG is redrawn only when the
+    # numbers behind it change
+    h = h or hashlib.blake2b(digest_size=12)
+    if isinstance(value, pd.Series):
+        h.update(repr(list(value.index)).encode())
+        _content_digest(value.to_numpy(), h)
+    elif isinstance(value, np.ndarray):
+        h.update(str(value.dtype).encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        for k in sorted(value):
+            h.update(str(k).encode())
+            _content_digest(value[k], h)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            _content_digest(v, h)
+    else:
+        h.update(repr(value).encode())
+    return h.hexdigest()
+
+# ------------------- REPORT MATRIX -------------------
+def slug(text):
+    return re.sub(r"[^A-Za-z0-9]+", "_", str(text)).strip("_") or "_"
+
+def chart_matrix(backend, types=CHART_TYPES, group_cols=DEFAULT_GROUP_COLS, value_col=TARGET_COL):
+    # Every (chart type, columns) pair the Graphs page would accept
+    columns = backend.columns
+    numeric = [c for c in backend.numeric_columns if c in columns]
+    groups = [c for c in group_cols if c in columns and c != value_col]
+    charts = []
+    for chart_type in types:
+        if chart_type == "Histogram":
+            charts += [(chart_type, [c]) for c in numeric]
+        elif chart_type == "Pie":
+            charts += [(chart_type, [c]) for c in groups if c in CATEGORICAL_COLS]
+        elif CHART_COLUMNS[chart_type] == 2:
+            charts += [(chart_type, [g, value_col]) for g in groups]
+    return charts
+
+def report_scopes(backend, scope_cols=DEFAULT_SCOPE_COLS, min_rows=1):
+    # (directory, title, filters): all records, then one page per label
+    scopes = [("all", "All records", {})]
+    for col in scope_cols:
+        for label in backend.distinct(col):
+            filters = {col: label}
+            if min_rows <= 1 or backend.count(filters) >= min_rows:
+                scopes.append((f"{col}-{slug(label)}", f"{col.replace('_', ' ')}: {label}", filters))
+    return scopes
+
+# ------------------- RENDERING -------------------
+def _render(task):
+    # Runs in a pool worker: Agg canvas, no Qt and no pyplot state
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure(figsize=FIGSIZE)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    draw_chart(ax, task["chart"], task["cols"], task["data"])
+    fig.suptitle(task["scope"], color="#555", fontsize=10)
+    fig.tight_layout()
+    tmp = task["path"] + ".tmp"
+    fig.savefig(tmp, dpi=DPI, format="png")
+    os.replace(tmp, task["path"])
+    return task["path"]
+
+def insight_cards(store, encoders):
+    jobs = encoders["job_title"].classes_
+    countries = encoders["employee_residence"].classes_
+    def rows(col, labels):
+        return "".join(f"<li><b>{html.escape(str(labels[c]))}</b>: ${int(s):,}</li>" for c, s in store.top_k(col, 5))
+    return (f"<div class='card'><h3>Top 5 Highest Paying Roles</h3><ol>{rows('job_title', jobs)}</ol></div>"
+            f"<div class='card'><h3>Top 5 Countries by Avg. Salary</h3><ol>{rows('employee_residence', countries)}</ol></div>"
+            f"<div class='card'>Distinct roles: <b>{store.distinct('job_title')}</b> | "
+            f"Distinct countries: <b>{store.distinct('employee_residence')}</b> | "
+            f"Rows: <b>{store.n_rows:,}</b></div>")
+
+PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>body{{background:#102032;color:#e0ecec;font-family:sans-serif;margin:24px}}
+a{{color:#1de9b6}}.card{{background:#172230;border-radius:12px;padding:12px 20px;margin:10px 0}}
+img{{max-width:48%;margin:4px;background:#fff}}</style></head>
+<body><h1>{title}</h1>{body}</body></html>
+"""
+
+def _write_if_changed(path, text):
+    try:
+        with open(path, encoding="utf-8") as f:
+            if f.read() == text:
+                return False
+    except OSError:
+        pass
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(path + ".tmp", path)
+    return True
+
+# ------------------- REPORT BUILD -------------------
+def _load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def build_report(csv_path, out_dir, types=CHART_TYPES, group_cols=DEFAULT_GROUP_COLS, value_col=TARGET_COL,
+                 scope_cols=DEFAULT_SCOPE_COLS, min_rows=1, workers=None, backend=None, watch_dir=None,
+                 force=False, progress=None):
+    # Renders the chart matrix and insight cards for every scope into
+    # out_dir. Aggregates are computed once in this process through the
+    # shared cache (Line and Bar reuse one group mean); only drawing fans
+    # out to the pool. Returns counts of rendered and skipped charts.
+    config = {"version": REPORT_VERSION, "types": list(types), "groups": list(group_cols), "value": value_col,
+              "scopes": list(scope_cols), "min_rows": min_rows, "figsize": list(FIGSIZE), "dpi": DPI}
+    fingerprint = data_fingerprint(csv_path, backend, watch_dir)
+    manifest = _load_manifest(out_dir)
+    outputs = manifest.get("outputs", {})
+    if (not force and manifest.get("fingerprint") == fingerprint and manifest.get("config") == config
+            and all(os.path.exists(os.path.join(out_dir, rel)) for rel in outputs)):
+        return {"rendered": 0, "skipped": len(outputs), "scopes": len(manifest.get("scopes", [])), "up_to_date": True}
+
+    store, encoders = open_backend(csv_path, backend, watch_dir)
+    cache = AggregateCache()
+    charts = chart_matrix(store, types, group_cols, value_col)
+    scopes = report_scopes(store, scope_cols, min_rows)
+    tasks, keys, pages = [], {}, []
+    for directory, title, filters in scopes:
+        os.makedirs(os.path.join(out_dir, directory), exist_ok=True)
+        images = []
+        for chart_type, cols in charts:
+            # A chart grouped by the scope's own column would be one bar
+            if cols[0] in filters:
+                continue
+            kind = CHART_AGGREGATES[chart_type]
+            data = cache.query(store, kind, cols, filters)
+            if _is_empty(kind, data):
+                continue
+            data = chart_data(chart_type, _decode(kind, cols[0], data, encoders))
+            rel = f"{directory}/{slug(chart_type)}-{'-'.join(slug(c) for c in cols)}.png"
+            key = _content_digest([REPORT_VERSION, FIGSIZE, DPI, title, chart_type, cols, data])
+            keys[rel] = key
+            images.append(rel)
+            if force or outputs.get(rel) != key or not os.path.exists(os.path.join(out_dir, rel)):
+                tasks.append({"path": os.path.join(out_dir, rel), "chart": chart_type, "cols": cols,
+                              "data": data, "scope": title})
+        insights = cache.query(store, "insights", [], filters)
+        body = insight_cards(insights, encoders) + "".join(
+            f"<img src='{html.escape(os.path.basename(rel))}' loading='lazy'>" for rel in images)
+        _write_if_changed(os.path.join(out_dir, directory, "index.html"),
+                          PAGE.format(title=html.escape(title), body="<p><a href='../index.html'>All reports</a></p>" + body))
+        pages.append((directory, title, insights.n_rows))
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks)))
+    if workers == 1:
+        for done, task in enumerate(tasks, 1):
+            _render(task)
+            if progress is not None:
+                progress(done, len(tasks))
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            chunk = max(1, len(tasks) // (workers * 8))
+            for done, _ in enumerate(pool.map(_render, tasks, chunksize=chunk), 1):
+                if progress is not None:
+                    progress(done, len(tasks))
+
+    # Charts from scopes or configurations that no longer exist
+    for rel in set(outputs) - set(keys):
+        try:
+            os.remove(os.path.join(out_dir, rel))
+        except OSError:
+            pass
+    links = "".join(f"<li><a href='{d}/index.html'>{html.escape(t)}</a> ({n:,} rows)</li>" for d, t, n in pages)
+    _write_if_changed(os.path.join(out_dir, "index.html"),
+                      PAGE.format(title="Salary reports", body=f"<ul>{links}</ul>"))
+    manifest = {"fingerprint": fingerprint, "config": config, "scopes": [d for d, _, _ in pages], "outputs": keys}
+    _write_if_changed(os.path.join(out_dir, MANIFEST_NAME), json.dumps(manifest, indent=1, sort_keys=True))
+    return {"rendered": len(tasks), "skipped": len(keys) - len(tasks), "scopes": len(pages), "up_to_date": False}
+
+# ------------------- COMMAND LINE -------------------
+def _names(text):
+    return [] if text.strip().lower() == "none" else [t.strip() for t in text.split(",") if t.strip()]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render salary charts and insight cards headlessly.")
+    parser.add_argument("data", nargs="?", default="salaries.csv")
+    parser.add_argument("-o", "--output", default="reports", help="output directory")
+    parser.add_argument("--charts", type=_names, default=CHART_TYPES, help="chart types (default: all)")
+    parser.add_argument("--group-cols", type=_names, default=DEFAULT_GROUP_COLS,
+                        help="columns charts are grouped by")
+    parser.add_argument("--value-col", default=TARGET_COL)
+    parser.add_argument("--scopes", type=_names, default=DEFAULT_SCOPE_COLS,
+                        help="columns to make one page per label of, or 'none'")
+    parser.add_argument("--min-rows", type=int, default=1, help="skip scopes with fewer rows")
+    parser.add_argument("--workers", type=int, default=None, help="render processes (default: all cores)")
+    parser.add_argument("--backend", choices=["auto", "pandas", "arrow"], default=None)
+    parser.add_argument("--watch-dir", default=None, help="ingest directory the dashboard uses")
+    parser.add_argument("--force", action="store_true", help="redraw everything")
+    args = parser.parse_args(argv)
+
+    unknown = [c for c in args.charts if c not in CHART_TYPES]
+    if unknown:
+        parser.error(f"unknown chart types: {', '.join(unknown)} (choose from {', '.join(CHART_TYPES)})")
+    t0 = time.perf_counter()
+    result = build_report(args.data, args.output, args.charts, args.group_cols, args.value_col, args.scopes,
+                          args.min_rows, args.workers, args.backend, args.watch_dir, args.force,
+                          progress=lambda done, total: print(f"\r{done}/{total} charts", end="", file=sys.stderr))
+    if result["up_to_date"]:
+        print(f"Data unchanged; {result['skipped']} charts in {args.output} are up to date.")
+    else:
+        print(f"\n{result['scopes']} pages: {result['rendered']} charts drawn, {result['skipped']} unchanged "
+              f"in {time.perf_counter() - t0:.1f}s -> {os.path.join(args.output, 'index.html')}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,468 @@
+# ------------------- IMPORTS & SETUP -------------------
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+import http.client
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qsl, urlencode
+import numpy as np
+import pandas as pd
+from salary_data import FEATURE_COLS
+from salary_backend import choose_backend, open_backend
+from salary_aggregates import AggregateCache, AGGREGATES, filter_key
+from salary_insights import InsightStore, median_table, peer_median
+from salary_ingest import Ingestor
+from salary_model import CategoryEncoder, load_or_train, encode_frame, training_digest, TRAIN_SAMPLE_ROWS
+from salary_forest import FlatForest
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Shared by every client; entries are encoded response bodies
+RESPONSE_CACHE_BYTES = 256 * 1024 * 1024
+MAX_BODY_BYTES = 1 << 20
+MAX_PAGE_ROWS = 50_000
+MAX_PREDICT_ROWS = 10_000
+MAX_BATCH_ROWS = 4096
+REQUEST_TIMEOUT_S = 60
+
+class ServiceError(RuntimeError):
+    pass
+
+# ------------------- WIRE FORMAT -------------------
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+def encode_value(value):
+    # Aggregates, pages and insight stores as plain JSON; decode_value
+    # rebuilds the same types on the client
+    if isinstance(value, InsightStore):
+        return {"type": "insights", "value_col": value.value_col, "group_cols": value.group_cols,
+                "n_rows": value.n_rows, "sums": {c: value.sums[c] for c in value.group_cols},
+                "counts": {c: value.counts[c] for c in value.group_cols}}
+    if isinstance(value, pd.Series):
+        return {"type": "series", "name": value.name, "dtype": str(value.dtype),
+                "index_name": value.index.name, "index": value.index.tolist(), "values": value.to_numpy()}
+    if isinstance(value, pd.DataFrame):
+        return {"type": "frame", "columns": list(value.columns), "data": value.to_numpy(dtype=object).tolist()}
+    if isinstance(value, np.ndarray):
+        return {"type": "array", "dtype": str(value.dtype), "data": value}
+    if isinstance(value, dict):
+        return {"type": "dict", "items": {k: encode_value(v) for k, v in value.items()}}
+    if isinstance(value, list):
+        return {"type": "list", "items": [encode_value(v) for v in value]}
+    return value
+
+def decode_value(value):
+    if not isinstance(value, dict) or "type" not in value:
+        return value
+    kind = value["type"]
+    if kind == "insights":
+        store = InsightStore(value["value_col"], value["group_cols"])
+        for col in store.group_cols:
+            store.sums[col] = np.asarray(value["sums"][col], dtype=np.float64)
+            store.counts[col] = np.asarray(value["counts"][col], dtype=np.int64)
+        store.n_rows = value["n_rows"]
+        return store
+    if kind == "series":
+        return pd.Series(np.asarray(value["values"], dtype=value["dtype"]), name=value["name"],
+                         index=pd.Index(value["index"], name=value["index_name"]))
+    if kind == "frame":
+        return pd.DataFrame(value["data"], columns=value["columns"])
+    if kind == "array":
+        return np.asarray(value["data"], dtype=value["dtype"])
+    if kind == "dict":
+        return {k: decode_value(v) for k, v in value["items"].items()}
+    if kind == "list":
+        return [decode_value(v) for v in value["items"]]
+    return value
+
+def dumps(value):
+    return json.dumps(value, default=_json_default, separators=(",", ":")).encode()
+
+# ------------------- PREDICTION BATCHING -------------------
+class PredictionBatcher:
+    # Requests queue their feature rows; one task scores everything queued
+    # as a single trees x rows matrix. No timer: rows that arrive while a
+    # batch is being scored form the next batch, so an idle service adds no
+    # latency and a busy one batches more.
+    def __init__(self, forest, executor, max_rows=MAX_BATCH_ROWS):
+        self.forest = forest
+        self.executor = executor
+        self.max_rows = max_rows
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.rows = 0
+        self.largest = 0
+
+    async def predict(self, X):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((X, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self.queue.get()]
+            n = len(items[0][0])
+            while n < self.max_rows and not self.queue.empty():
+                items.append(self.queue.get_nowait())
+                n += len(items[-1][0])
+            X = np.concatenate([x for x, _ in items])
+            try:
+                summary = await loop.run_in_executor(self.executor, self.forest.predict_interval, X)
+            except Exception as exc:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            self.batches += 1
+            self.rows += n
+            self.largest = max(self.largest, len(items))
+            start = 0
+            for x, future in items:
+                if not future.done():
+                    future.set_result({k: v[start:start + len(x)] for k, v in summary.items()})
+                start += len(x)
+
+    def stats(self):
+        return {"batches": self.batches, "rows": self.rows, "largest_batch_requests": self.largest,
+                "rows_per_batch": self.rows / self.batches if self.batches else 0.0}
+
+# ------------------- SERVICE -------------------
+class AnalyticsService:
+    # One process holds the data, the forest and a response cache shared by
+    # every client. The event loop only parses and routes; queries and
+    # scoring run on a thread pool, and identical concurrent misses wait
+    # on the first one instead of computing the same response twice.
+    GET_ROUTES = ("/meta", "/count", "/distinct", "/aggregate", "/rows")
+
+    def __init__(self, csv_path, backend=None, watch_dir=None, workers=None, cache=True):
+        self.csv_path = csv_path
+        # The model the dashboard would train on these rows, under its key
+        encoders, model, _ = load_or_train(csv_path, backend=backend, watch_dir=watch_dir)
+        self.backend, self.encoders = open_backend(csv_path, backend, watch_dir, encoders)
+        self.backend_name = choose_backend(csv_path, backend)
+        # Arrow keeps page and row-group caches that are not thread-safe
+        self.backend_lock = nullcontext() if self.backend.in_memory else threading.Lock()
+        self.model = model
+        self.forest = FlatForest(model)
+        self.label_codes = {col: {label: i for i, label in enumerate(enc.classes_)}
+                            for col, enc in self.encoders.items()}
+        # Peer medians out of core come from the training sample, as in the dashboard
+        if self.backend.in_memory:
+            self.medians = median_table(self.backend.df)
+            self.fingerprint = training_digest(csv_path, Ingestor(csv_path, watch_dir))
+        else:
+            self.medians = median_table(encode_frame(self.backend.sample(TRAIN_SAMPLE_ROWS), self.encoders))
+            self.fingerprint = training_digest(csv_path, n_rows=self.backend.n_rows)
+        self.cache = AggregateCache(RESPONSE_CACHE_BYTES, max_entries=100_000) if cache else None
+        self.executor = ThreadPoolExecutor(workers or min(8, os.cpu_count() or 1))
+        self.inflight = {}
+        self.requests = {}
+        self.started = time.time()
+        self.batcher = None
+
+    # ------------------- QUERY HANDLERS -------------------
+    def _filters(self, params):
+        filters = {k: v for k, v in params.items() if k not in ("kind", "cols", "col", "start", "stop")}
+        unknown = [k for k in filters if k not in self.backend.columns]
+        if unknown:
+            raise ValueError(f"Unknown filter columns: {', '.join(unknown)}")
+        return filters
+
+    def meta(self, params):
+        medians = np.where(np.isnan(self.medians), None, self.medians).tolist()
+        return {"columns": self.backend.columns, "numeric_columns": self.backend.numeric_columns,
+                "n_rows": self.backend.n_rows, "backend": self.backend_name, "fingerprint": self.fingerprint,
+                "encoders": {col: [str(c) for c in enc.classes_] for col, enc in self.encoders.items()},
+                "feature_cols": FEATURE_COLS, "medians": medians,
+                "model": {"trees": len(self.model.estimators_), "params": self.model.get_params()}}
+
+    def count(self, params):
+        with self.backend_lock:
+            return {"count": self.backend.count(self._filters(params))}
+
+    def distinct(self, params):
+        col = params.get("col")
+        if col not in self.backend.columns:
+            raise ValueError(f"Unknown column: {col}")
+        with self.backend_lock:
+            return {"values": self.backend.distinct(col)}
+
+    def aggregate(self, params):
+        kind = params.get("kind")
+        if kind not in AGGREGATES:
+            raise ValueError(f"Unknown aggregate: {kind}")
+        cols = [c for c in params.get("cols", "").split(",") if c]
+        missing = [c for c in cols if c not in self.backend.columns]
+        if missing:
+            raise ValueError(f"Unknown columns: {', '.join(missing)}")
+        with self.backend_lock:
+            return encode_value(self.backend.aggregate(kind, cols, self._filters(params)))
+
+    def rows(self, params):
+        start = int(params.get("start", 0))
+        stop = int(params.get("stop", start + 500))
+        if stop - start > MAX_PAGE_ROWS or start < 0:
+            raise ValueError(f"Pages are limited to {MAX_PAGE_ROWS:,} rows")
+        with self.backend_lock:
+            return encode_value(self.backend.page(self._filters(params), start, stop))
+
+    def stats(self):
+        return {"uptime_s": time.time() - self.started, "requests": self.requests,
+                "cache": self.cache.stats() if self.cache is not None else None,
+                "predict": self.batcher.stats()}
+
+    def features(self, body):
+        # {"codes": [[...FEATURE_COLS order...]]} from clients sharing the
+        # encoders in /meta, or {"rows": [{column: label}]} from anyone
+        if "codes" in body:
+            X = np.asarray(body["codes"], dtype=np.int64)
+            if X.ndim != 2 or X.shape[1] != len(FEATURE_COLS):
+                raise ValueError(f"codes must be rows of {len(FEATURE_COLS)} values")
+            # Same 400 as an unseen label: a code outside classes_ would wrap
+            # around in the median table or score a category that never existed
+            for j, col in enumerate(FEATURE_COLS):
+                if col in self.encoders:
+                    bad = (X[:, j] < 0) | (X[:, j] >= len(self.encoders[col].classes_))
+                    if bad.any():
+                        raise ValueError(f"Unknown code in {col}: {int(X[bad, j][0])}")
+            return X
+        rows = body.get("rows")
+        if not isinstance(rows, list):
+            raise ValueError("Expected a 'rows' or 'codes' list")
+        X = np.empty((len(rows), len(FEATURE_COLS)), dtype=np.int64)
+        for i, row in enumerate(rows):
+            for j, col in enumerate(FEATURE_COLS):
+                value = row.get(col)
+                if col in self.label_codes:
+                    if value not in self.label_codes[col]:
+                        raise ValueError(f"Unseen value in {col}: {value}")
+                    X[i, j] = self.label_codes[col][value]
+                else:
+                    X[i, j] = int(value)
+        return X
+
+    async def predict(self, body):
+        X = self.features(json.loads(body or b"{}"))
+        if not 0 < len(X) <= MAX_PREDICT_ROWS:
+            raise ValueError(f"Send 1 to {MAX_PREDICT_ROWS:,} rows per request")
+        summary = await self.batcher.predict(X)
+        job, exp = FEATURE_COLS.index("job_title"), FEATURE_COLS.index("experience_level")
+        return {"predictions": [
+            {"mean": float(summary["mean"][i]), "low": float(summary["low"][i]),
+             "high": float(summary["high"][i]), "std": float(summary["std"][i]),
+             "median": peer_median(self.medians, int(X[i, job]), int(X[i, exp]))}
+            for i in range(len(X))]}
+
+    # ------------------- ROUTING -------------------
+    async def cached(self, key, compute):
+        # Response cache plus single-flight for concurrent identical misses
+        if self.cache is not None:
+            body = self.cache.get(key)
+            if body is not None:
+                return body
+        if key in self.inflight:
+            return await asyncio.shield(self.inflight[key])
+        future = asyncio.ensure_future(compute())
+        self.inflight[key] = future
+        try:
+            body = await future
+        finally:
+            del self.inflight[key]
+        if self.cache is not None:
+            self.cache.put(key, body)
+        return body
+
+    async def dispatch(self, method, target, body):
+        loop = asyncio.get_running_loop()
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+        self.requests[path] = self.requests.get(path, 0) + 1
+        if method == "GET" and path in self.GET_ROUTES:
+            params = dict(parse_qsl(url.query, keep_blank_values=True))
+            handler = getattr(self, path[1:])
+            key = (path, tuple(sorted(params.items())))
+            return await self.cached(key, lambda: loop.run_in_executor(self.executor, lambda: dumps(handler(params))))
+        if method == "GET" and path == "/stats":
+            return dumps(self.stats())
+        if method == "POST" and path == "/predict":
+            return await self.cached(("/predict", body), lambda: self._predict_body(body))
+        raise LookupError(f"No route for {method} {path}")
+
+    async def _predict_body(self, body):
+        return dumps(await self.predict(body))
+
+    # ------------------- HTTP/1.1 -------------------
+    async def handle(self, reader, writer):
+        # Minimal keep-alive HTTP/1.1: enough for the dashboard, curl and
+        # the load test, with no dependency beyond asyncio
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                method, target, version = line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY_BYTES:
+                    await self.respond(writer, 413, dumps({"error": "Request body too large"}), False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                try:
+                    status, payload = 200, await self.dispatch(method, target, body)
+                except LookupError as exc:
+                    status, payload = 404, dumps({"error": str(exc)})
+                except (ValueError, TypeError) as exc:
+                    status, payload = 400, dumps({"error": str(exc)})
+                except Exception as exc:
+                    status, payload = 500, dumps({"error": f"{type(exc).__name__}: {exc}"})
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, payload, keep_alive):
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large",
+                  500: "Internal Server Error"}[status]
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(payload)}\r\n"
+                     f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + payload)
+        await writer.drain()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None):
+        self.batcher = PredictionBatcher(self.forest, self.executor)
+        batcher_task = asyncio.create_task(self.batcher.run())
+        server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        if ready is not None:
+            ready(server)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher_task.cancel()
+
+# ------------------- THIN CLIENT -------------------
+class RemoteBackend:
+    # The query-backend interface over the service's HTTP API, so the
+    # dashboard runs its out-of-core code path against a shared process.
+    # One keep-alive connection per thread (the UI and the cache warmer).
+    in_memory = False
+
+    def __init__(self, url, timeout=REQUEST_TIMEOUT_S):
+        parts = urlsplit(url if "//" in url else "http://" + url)
+        self.url = f"http://{parts.hostname}:{parts.port or DEFAULT_PORT}"
+        self.host, self.port = parts.hostname, parts.port or DEFAULT_PORT
+        self.timeout = timeout
+        self._local = threading.local()
+        meta = self._request("GET", "/meta")
+        self.columns = meta["columns"]
+        self.numeric_columns = meta["numeric_columns"]
+        self.n_rows = meta["n_rows"]
+        self.model_info = meta["model"]
+        self.encoders = {col: CategoryEncoder(classes) for col, classes in meta["encoders"].items()}
+        self.medians = np.array([[np.nan if v is None else v for v in row] for row in meta["medians"]],
+                                dtype=np.float64).reshape(len(meta["medians"]), -1)
+
+    def _request(self, method, path, params=None, body=None):
+        if params:
+            path = f"{path}?{urlencode(params)}"
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        for attempt in (0, 1):
+            conn = getattr(self._local, "conn", None)
+            if conn is None:
+                conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                payload = response.read()
+                break
+            except (http.client.HTTPException, ConnectionError):
+                # The server closed an idle keep-alive connection: reconnect once
+                conn.close()
+                self._local.conn = None
+                if attempt:
+                    raise
+        result = json.loads(payload)
+        if response.status != 200:
+            raise ServiceError(result.get("error", f"HTTP {response.status}"))
+        return result
+
+    def _query(self, path, filters=None, **params):
+        params.update({k: v for k, v in filter_key(filters or {})})
+        return self._request("GET", path, params)
+
+    def count(self, filters):
+        return self._query("/count", filters)["count"]
+
+    def distinct(self, col):
+        return self._query("/distinct", col=col)["values"]
+
+    def aggregate(self, kind, cols, filters):
+        return decode_value(self._query("/aggregate", filters, kind=kind, cols=",".join(cols)))
+
+    def page(self, filters, start, stop):
+        return decode_value(self._query("/rows", filters, start=start, stop=stop))
+
+    def iter_frames(self, filters, chunk_rows=MAX_PAGE_ROWS):
+        chunk_rows = min(chunk_rows, MAX_PAGE_ROWS)
+        total = self.count(filters)
+        for start in range(0, total, chunk_rows):
+            yield self.page(filters, start, min(start + chunk_rows, total))
+
+    def predict_codes(self, rows):
+        body = json.dumps({"codes": [[int(v) for v in row] for row in rows]}).encode()
+        return self._request("POST", "/predict", body=body)["predictions"]
+
+    def interval_one(self, features):
+        # Same shape as FlatForest.interval_one, so the predictor page is unchanged
+        prediction = self.predict_codes([features])[0]
+        return {k: prediction[k] for k in ("mean", "low", "high", "std")}
+
+    def stats(self):
+        return self._request("GET", "/stats")
+
+# ------------------- COMMAND LINE -------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve salary data, aggregates and predictions over HTTP.")
+    parser.add_argument("data", nargs="?", default="salaries.csv")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--backend", choices=["auto", "pandas", "arrow"], default=None)
+    parser.add_argument("--watch-dir", default=None, help="ingest directory whose rows to include")
+    parser.add_argument("--workers", type=int, default=None, help="query threads (default: min(8, cores))")
+    parser.add_argument("--no-cache", action="store_true", help="disable the shared response cache")
+    args = parser.parse_args(argv)
+    t0 = time.perf_counter()
+    service = AnalyticsService(args.data, args.backend, args.watch_dir, args.workers, cache=not args.no_cache)
+    def ready(server):
+        print(f"Serving {service.backend.n_rows:,} rows ({service.backend_name}, "
+              f"{len(service.model.estimators_)} trees) on http://{args.host}:{args.port} "
+              f"after {time.perf_counter() - t0:.1f}s", file=sys.stderr, flush=True)
+    try:
+        asyncio.run(service.serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
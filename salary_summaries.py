@@ -0,0 +1,93 @@
+# ------------------- IMPORTS & SETUP -------------------
+import numpy as np
+import pandas as pd
+
+MAX_BINS = 120
+KDE_GRID = 512
+# Outliers drawn per box; the rest are summarised by the whisker extremes
+MAX_FLIERS = 60
+
+# ------------------- HISTOGRAM + KDE -------------------
+def _finite_values(s):
+    values = pd.to_numeric(s, errors="coerce").to_numpy(dtype=np.float64)
+    return values[np.isfinite(values)]
+
+def binned_kde(values, lo, hi, grid=KDE_GRID):
+    # Linear binning onto a regular grid, then a Gaussian convolution done
+    # with FFTs: O(n + grid log grid) instead of O(n * grid).
+    n = len(values)
+    if n < 2 or hi <= lo:
+        return np.array([]), np.array([])
+    std = values.std(ddof=1)
+    if std == 0:
+        return np.array([]), np.array([])
+    bw = std * n ** (-1 / 5)  # Scott's rule, as used by seaborn's KDE
+    # Pad the grid so the kernel tails do not wrap around
+    pad = 3 * bw
+    lo, hi = lo - pad, hi + pad
+    delta = (hi - lo) / (grid - 1)
+    pos = (values - lo) / delta
+    left = np.floor(pos).astype(np.int64)
+    frac = pos - left
+    counts = np.bincount(left, weights=1 - frac, minlength=grid + 1)
+    counts += np.bincount(left + 1, weights=frac, minlength=grid + 1)
+    counts = counts[:grid]
+    size = 2 * grid
+    offsets = np.arange(size)
+    offsets = np.where(offsets < grid, offsets, offsets - size) * delta
+    kernel = np.exp(-0.5 * (offsets / bw) ** 2) / (bw * np.sqrt(2 * np.pi))
+    dens = np.fft.irfft(np.fft.rfft(counts, size) * np.fft.rfft(kernel), size)[:grid]
+    xs = lo + delta * np.arange(grid)
+    return xs, np.clip(dens, 0, None) / n
+
+def histogram_summary(s):
+    values = _finite_values(s)
+    if len(values) == 0:
+        return {"edges": np.array([0.0, 1.0]), "counts": np.array([0]), "kde_x": np.array([]), "kde_y": np.array([]), "n": 0}
+    lo, hi = float(values.min()), float(values.max())
+    edges = np.histogram_bin_edges(values, bins="auto")
+    if len(edges) - 1 > MAX_BINS:
+        edges = np.linspace(lo, hi, MAX_BINS + 1)
+    counts, edges = np.histogram(values, bins=edges)
+    xs, dens = binned_kde(values, lo, hi)
+    # Like histplot, show the curve over the data range only
+    inside = (xs >= lo) & (xs <= hi)
+    xs, dens = xs[inside], dens[inside]
+    # Scale the density to the count axis like histplot(kde=True)
+    width = edges[1] - edges[0] if len(edges) > 1 else 1.0
+    return {"edges": edges, "counts": counts, "kde_x": xs, "kde_y": dens * len(values) * width, "n": len(values)}
+
+# ------------------- GROUPED BOX STATISTICS -------------------
+def _sorted_quantile(v, q):
+    pos = q * (len(v) - 1)
+    lo = int(np.floor(pos))
+    hi = min(lo + 1, len(v) - 1)
+    return v[lo] + (v[hi] - v[lo]) * (pos - lo)
+
+def box_summary(df, group_col, value_col):
+    # One lexsort over (group, value) puts every group's values in order, so
+    # quartiles and Tukey whiskers are index lookups per group.
+    codes, labels = pd.factorize(df[group_col], sort=True)
+    values = pd.to_numeric(df[value_col], errors="coerce").to_numpy(dtype=np.float64)
+    keep = np.isfinite(values) & (codes >= 0)
+    codes, values = codes[keep], values[keep]
+    order = np.lexsort((values, codes))
+    codes, values = codes[order], values[order]
+    bounds = np.searchsorted(codes, np.arange(len(labels) + 1))
+    stats = []
+    for i, label in enumerate(labels):
+        v = values[bounds[i]:bounds[i + 1]]
+        if len(v) == 0:
+            continue
+        q1, med, q3 = (_sorted_quantile(v, q) for q in (0.25, 0.5, 0.75))
+        iqr = q3 - q1
+        lo_idx = np.searchsorted(v, q1 - 1.5 * iqr, side="left")
+        hi_idx = np.searchsorted(v, q3 + 1.5 * iqr, side="right") - 1
+        fliers = np.concatenate((v[:lo_idx], v[hi_idx + 1:]))
+        if len(fliers) > MAX_FLIERS:
+            fliers = fliers[np.linspace(0, len(fliers) - 1, MAX_FLIERS).astype(np.int64)]
+        stats.append({
+            "label": str(label), "q1": q1, "med": med, "q3": q3,
+            "whislo": v[lo_idx], "whishi": v[hi_idx], "fliers": fliers, "n": len(v),
+        })
+    return stats
@@ -0,0 +1,151 @@
+# ------------------- IMPORTS & SETUP -------------------
+import os
+import json
+import time
+import inspect
+import threading
+from functools import wraps
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+# Set to "1" to start with instrumentation on (it can also be toggled in the app)
+TRACE_ENV = "SALARY_TRACE"
+MAX_SPANS = 20_000
+# A handler that keeps the UI thread busy longer than this is flagged
+DEFAULT_STALL_MS = 100.0
+
+# ------------------- SPAN RECORDER -------------------
+class Tracer:
+    # Records timing spans and event-loop stalls in bounded ring buffers.
+    # When disabled, span() hands back a shared no-op context, so the
+    # wrapped handlers pay one attribute check per call.
+    def __init__(self, enabled=False, max_spans=MAX_SPANS, stall_ms=DEFAULT_STALL_MS):
+        self.enabled = bool(enabled)
+        self.stall_ms = stall_ms
+        self.t0 = time.perf_counter()
+        self.spans = deque(maxlen=max_spans)
+        self.stalls = deque(maxlen=max_spans)
+        self.main_thread = threading.main_thread().ident
+        self._local = threading.local()
+        self._noop = nullcontext()
+
+    def span(self, name, **args):
+        if not self.enabled:
+            return self._noop
+        return self._span(name, args)
+
+    @contextmanager
+    def _span(self, name, args):
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            stack.pop()
+            self.spans.append({
+                "name": name,
+                "start": start - self.t0,
+                "dur": end - start,
+                "depth": len(stack),
+                "tid": threading.get_ident(),
+                "args": args,
+            })
+
+    def traced(self, name=None):
+        # Decorator form of span(). Qt passes every signal argument to a
+        # Python callable that accepts *args, so extra positional arguments
+        # beyond what the wrapped function takes are dropped, as Qt would.
+        def decorate(fn):
+            label = name or fn.__name__
+            params = inspect.signature(fn).parameters.values()
+            if any(p.kind is p.VAR_POSITIONAL for p in params):
+                arity = None
+            else:
+                arity = sum(p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD) for p in params)
+
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                if arity is not None:
+                    args = args[:arity]
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with self._span(label, {}):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def stall(self, start, end):
+        # Records an event-loop stall (perf_counter times) and blames the
+        # top-level UI-thread spans that overlap it
+        blamed = [s["name"] for s in list(self.spans)
+                  if s["tid"] == self.main_thread and s["depth"] == 0
+                  and s["start"] + s["dur"] >= start - self.t0 and s["start"] <= end - self.t0]
+        record = {"start": start - self.t0, "dur": end - start, "handlers": blamed or ["(untraced)"]}
+        self.stalls.append(record)
+        return record
+
+    def clear(self):
+        self.spans.clear()
+        self.stalls.clear()
+
+    # ------------------- REPORTS -------------------
+    def summary(self):
+        # Per span name: count, total, p50, p95 and max in milliseconds,
+        # slowest total first; "stalls" counts UI-thread runs over stall_ms
+        by_name = {}
+        for s in list(self.spans):
+            by_name.setdefault(s["name"], []).append(s)
+        rows = []
+        for name, spans in by_name.items():
+            ms = sorted(s["dur"] * 1e3 for s in spans)
+            rows.append({
+                "name": name,
+                "count": len(ms),
+                "total_ms": sum(ms),
+                "p50_ms": ms[len(ms) // 2],
+                "p95_ms": ms[min(len(ms) - 1, int(len(ms) * 0.95))],
+                "max_ms": ms[-1],
+                "stalls": sum(1 for s in spans if s["tid"] == self.main_thread
+                              and s["dur"] * 1e3 > self.stall_ms),
+            })
+        return sorted(rows, key=lambda r: r["total_ms"], reverse=True)
+
+    def format_summary(self, limit=20):
+        lines = [f"{'span':<34}{'n':>6}{'total':>11}{'p50':>9}{'p95':>9}{'max':>9}{'slow':>6}"]
+        for r in self.summary()[:limit]:
+            lines.append(f"{r['name'][:33]:<34}{r['count']:>6}{r['total_ms']:>11.1f}"
+                         f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['max_ms']:>9.1f}{r['stalls']:>6}")
+        return "\n".join(lines)
+
+    def format_stalls(self, limit=10):
+        stalls = list(self.stalls)[-limit:]
+        if not stalls:
+            return f"No event-loop stalls over {self.stall_ms:.0f} ms."
+        return "\n".join(f"{s['start']:>9.2f}s  blocked {s['dur'] * 1e3:>7.1f} ms  {', '.join(s['handlers'])}"
+                         for s in reversed(stalls))
+
+    def chrome_trace(self):
+        # Trace Event Format: load in chrome://tracing or ui.perfetto.dev
+        pid = os.getpid()
+        events = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": self.main_thread,
+                   "args": {"name": "UI thread"}}]
+        for s in list(self.spans):
+            events.append({"name": s["name"], "cat": "handler" if s["depth"] == 0 else "step",
+                           "ph": "X", "ts": s["start"] * 1e6, "dur": s["dur"] * 1e6,
+                           "pid": pid, "tid": s["tid"], "args": s["args"]})
+        for s in list(self.stalls):
+            events.append({"name": "event loop stall", "cat": "stall", "ph": "X",
+                           "ts": s["start"] * 1e6, "dur": s["dur"] * 1e6, "pid": pid, "tid": 0,
+                           "args": {"handlers": s["handlers"]}})
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": 0,
+                       "args": {"name": "event loop stalls"}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path):
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+        return path
+
+TRACER = Tracer(enabled=os.environ.get(TRACE_ENV, "") not in ("", "0"))
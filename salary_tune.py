@@ -0,0 +1,255 @@
+# ------------------- IMPORTS & SETUP -------------------
+import os
+import sys
+import json
+import time
+import pickle
+import hashlib
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from salary_data import load_data, dataset_fingerprint, cache_dir, FEATURE_COLS, TARGET_COL
+from salary_model import (
+    MODEL_PARAMS, MODEL_VERSION, ModelStore, load_or_train, fit_encoders, encode_frame, train_model
+)
+from salary_forest import FlatForest
+
+DEFAULT_GRID = {
+    "n_estimators": [25, 50, 100],
+    "max_depth": [None, 12, 20],
+    "max_features": [1.0, "sqrt", 0.5],
+}
+DEFAULT_FOLDS = 5
+FOLD_SEED = 42
+# Single-row predictions timed per fold, through the same flat forest the UI uses
+LATENCY_ROWS = 200
+METRICS = ("mae", "rmse", "r2")
+
+# ------------------- FOLDS -------------------
+def fold_indices(n_rows, n_folds=DEFAULT_FOLDS, seed=FOLD_SEED):
+    # Shuffled K-fold: the same (n_rows, n_folds, seed) always gives the same
+    # split, which is what makes cached fold results reusable
+    order = np.random.default_rng(seed).permutation(n_rows)
+    return np.array_split(order, n_folds)
+
+def fold_key(digest, params, fold, n_folds, sample_rows):
+    blob = json.dumps({"data": digest, "params": params, "fold": fold, "folds": n_folds,
+                       "seed": FOLD_SEED, "sample": sample_rows, "features": FEATURE_COLS,
+                       "version": MODEL_VERSION}, sort_keys=True)
+    return hashlib.blake2b(blob.encode(), digest_size=12).hexdigest()
+
+# ------------------- FOLD RESULT CACHE -------------------
+class FoldCache:
+    # One small JSON file per finished (dataset, params, fold), so an
+    # interrupted, repeated or widened search only runs what is missing
+    def __init__(self, root):
+        self.root = root
+
+    @classmethod
+    def for_dataset(cls, csv_path):
+        return cls(os.path.join(cache_dir(csv_path), "tuning"))
+
+    def path(self, key):
+        return os.path.join(self.root, f"fold-{key}.json")
+
+    def get(self, key):
+        try:
+            with open(self.path(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, result):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self.path(key) + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(result, f)
+        os.replace(tmp, self.path(key))
+
+# ------------------- PROCESS POOL WORKERS -------------------
+_worker_state = {}
+
+def load_frame(csv_path, sample_rows=None):
+    df = load_data(csv_path)
+    encode_frame(df, fit_encoders(df))
+    frame = df[FEATURE_COLS + [TARGET_COL]]
+    if sample_rows and len(frame) > sample_rows:
+        frame = frame.sample(sample_rows, random_state=FOLD_SEED).reset_index(drop=True)
+    return frame
+
+def _init_worker(csv_path, sample_rows, n_folds):
+    # Each worker parses the (binary-cached) dataset once, not per task
+    frame = load_frame(csv_path, sample_rows)
+    _worker_state["frame"] = frame
+    _worker_state["folds"] = fold_indices(len(frame), n_folds)
+
+def _score(y, pred):
+    err = pred - y
+    ss_tot = float(((y - y.mean()) ** 2).sum())
+    return {
+        "mae": float(np.abs(err).mean()),
+        "rmse": float(np.sqrt((err ** 2).mean())),
+        "r2": 1.0 - float((err ** 2).sum()) / ss_tot if ss_tot else 0.0,
+    }
+
+def _run_fold(params, fold):
+    frame, folds = _worker_state["frame"], _worker_state["folds"]
+    test = folds[fold]
+    train = np.concatenate([f for i, f in enumerate(folds) if i != fold])
+    t0 = time.perf_counter()
+    model = train_model(frame.iloc[train], params, n_jobs=1)
+    fit_s = time.perf_counter() - t0
+    X_test = frame.iloc[test][FEATURE_COLS]
+    result = _score(frame.iloc[test][TARGET_COL].to_numpy(dtype=np.float64), model.predict(X_test))
+    flat = FlatForest(model)
+    rows = X_test.to_numpy()[:LATENCY_ROWS]
+    t0 = time.perf_counter()
+    for row in rows:
+        flat._predict_one(tuple(row))
+    result.update({
+        "fit_s": fit_s,
+        "predict_us": (time.perf_counter() - t0) / max(len(rows), 1) * 1e6,
+        "size_bytes": len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)),
+        "nodes": int(sum(est.tree_.node_count for est in model.estimators_)),
+    })
+    return result
+
+# ------------------- SEARCH -------------------
+def expand_grid(grid, base=None):
+    base = dict(MODEL_PARAMS if base is None else base)
+    names = list(grid)
+    return [dict(base, **dict(zip(names, values))) for values in itertools.product(*(grid[n] for n in names))]
+
+def summarize(params, folds):
+    row = {"params": params, "folds": len(folds)}
+    for name in METRICS + ("fit_s", "predict_us", "size_bytes", "nodes"):
+        values = np.array([f[name] for f in folds], dtype=np.float64)
+        row[name] = float(values.mean())
+        if name in METRICS:
+            row[name + "_std"] = float(values.std())
+    return row
+
+def search(csv_path, candidates, n_folds=DEFAULT_FOLDS, workers=None, sample_rows=None, progress=None):
+    # Cross-validates every candidate. Finished folds are read from the cache;
+    # the rest run across a process pool and are cached as they complete.
+    # Returns one summary row per candidate, plus how many folds were reused.
+    digest = dataset_fingerprint(csv_path)
+    cache = FoldCache.for_dataset(csv_path)
+    results = {i: {} for i in range(len(candidates))}
+    todo = []
+    for i, params in enumerate(candidates):
+        for fold in range(n_folds):
+            key = fold_key(digest, params, fold, n_folds, sample_rows)
+            cached = cache.get(key)
+            if cached is not None:
+                results[i][fold] = cached
+            else:
+                todo.append((i, fold, key))
+    reused = sum(len(r) for r in results.values())
+    if todo:
+        workers = min(workers or os.cpu_count() or 1, len(todo))
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(csv_path, sample_rows, n_folds)) as pool:
+            futures = {pool.submit(_run_fold, candidates[i], fold): (i, fold, key) for i, fold, key in todo}
+            for done, future in enumerate(as_completed(futures), 1):
+                i, fold, key = futures[future]
+                result = future.result()
+                cache.put(key, result)
+                results[i][fold] = result
+                if progress is not None:
+                    progress(done, len(todo))
+    rows = [summarize(params, [results[i][f] for f in range(n_folds)]) for i, params in enumerate(candidates)]
+    return rows, reused
+
+def pick_best(rows, metric="mae", max_latency_us=None, max_size_bytes=None):
+    # Best accuracy among candidates inside the latency and size budgets
+    eligible = [r for r in rows
+                if (max_latency_us is None or r["predict_us"] <= max_latency_us)
+                and (max_size_bytes is None or r["size_bytes"] <= max_size_bytes)]
+    if not eligible:
+        return None
+    return max(eligible, key=lambda r: r[metric]) if metric == "r2" else min(eligible, key=lambda r: r[metric])
+
+def promote(csv_path, params, report=None, n_jobs=-1, backend=None, watch_dir=None):
+    # Fits the chosen parameters on the rows the dashboard trains on (base
+    # file plus ingested rows, or the out-of-core sample), stores the model
+    # under the key the dashboard, service and batch CLI look up, and makes
+    # the parameters the defaults
+    _, _, path = load_or_train(csv_path, params, n_jobs=n_jobs, backend=backend, watch_dir=watch_dir)
+    ModelStore.for_dataset(csv_path).promote(params, report)
+    return path
+
+# ------------------- REPORT -------------------
+def _label(params):
+    shown = {k: v for k, v in params.items() if k != "random_state"}
+    return ", ".join(f"{k}={v}" for k, v in shown.items())
+
+def format_report(rows, metric="mae", best=None):
+    rows = sorted(rows, key=lambda r: r[metric], reverse=(metric == "r2"))
+    lines = [f"{'params':<52}{'MAE':>10}{'RMSE':>10}{'R2':>8}{'fit s':>8}{'pred us':>9}{'size MB':>9}"]
+    for r in rows:
+        mark = " *" if best is not None and r["params"] == best["params"] else ""
+        lines.append(f"{_label(r['params'])[:51]:<52}{r['mae']:>10,.0f}{r['rmse']:>10,.0f}{r['r2']:>8.3f}"
+                     f"{r['fit_s']:>8.2f}{r['predict_us']:>9.0f}{r['size_bytes'] / 1e6:>9.1f}{mark}")
+    return "\n".join(lines)
+
+# ------------------- COMMAND LINE -------------------
+def _values(text):
+    out = []
+    for item in text.split(","):
+        item = item.strip()
+        if item.lower() == "none":
+            out.append(None)
+            continue
+        for cast in (int, float):
+            try:
+                out.append(cast(item))
+                break
+            except ValueError:
+                continue
+        else:
+            out.append(item)
+    return out
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cross-validated search over salary forest settings.")
+    parser.add_argument("data", nargs="?", default="salaries.csv")
+    for name, default in DEFAULT_GRID.items():
+        parser.add_argument("--" + name.replace("_", "-"), type=_values, default=default,
+                            help=f"comma-separated values (default: {','.join(str(v) for v in default)})")
+    parser.add_argument("--folds", type=int, default=DEFAULT_FOLDS)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--sample-rows", type=int, default=None, help="cross-validate on a sample of this size")
+    parser.add_argument("--metric", choices=METRICS, default="mae")
+    parser.add_argument("--max-latency-us", type=float, default=None, help="only promote models this fast per row")
+    parser.add_argument("--max-size-mb", type=float, default=None, help="only promote models this small")
+    parser.add_argument("--promote", action="store_true", help="train the best candidate as the dashboard would and use it")
+    parser.add_argument("-o", "--output", help="write the full report as JSON")
+    args = parser.parse_args(argv)
+
+    grid = {name: getattr(args, name) for name in DEFAULT_GRID}
+    candidates = expand_grid(grid)
+    t0 = time.perf_counter()
+    rows, reused = search(args.data, candidates, args.folds, args.workers, args.sample_rows,
+                          progress=lambda done, total: print(f"\r{done}/{total} folds", end="", file=sys.stderr))
+    print(f"\n{len(candidates)} candidates x {args.folds} folds in {time.perf_counter() - t0:.1f}s "
+          f"({reused} folds from cache)", file=sys.stderr)
+    max_size = None if args.max_size_mb is None else args.max_size_mb * 1e6
+    best = pick_best(rows, args.metric, args.max_latency_us, max_size)
+    print(format_report(rows, args.metric, best))
+    report = {"data": args.data, "folds": args.folds, "sample_rows": args.sample_rows,
+              "metric": args.metric, "results": rows, "best": best}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if best is None:
+        print("No candidate meets the latency/size limits.", file=sys.stderr)
+        return 1
+    if args.promote:
+        path = promote(args.data, best["params"], {k: v for k, v in best.items() if k != "params"})
+        print(f"Promoted {_label(best['params'])} -> {path}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,21 @@
+import pytest
+
+from salary_bench import generate_salaries
+
+
+@pytest.fixture(scope="session")
+def salary_csv(tmp_path_factory):
+    # A small synthetic dataset in the salaries.csv schema, in its own
+    # directory so its .salary_cache and incoming/ stay private to the run
+    path = tmp_path_factory.mktemp("data") / "salaries.csv"
+    return generate_salaries(str(path), 2000, seed=7)
+
+
+@pytest.fixture
+def salary_frame(salary_csv):
+    # (label-encoded frame, encoders) as the dashboard holds them
+    from salary_data import load_data
+    from salary_model import fit_encoders, encode_frame
+    df = load_data(salary_csv)
+    encoders = fit_encoders(df)
+    return encode_frame(df, encoders), encoders
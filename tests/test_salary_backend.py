@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow.dataset")
+
+import salary_backend
+from salary_backend import ArrowBackend, csv_to_parquet, open_backend
+from salary_data import ENCODED_COLS, TARGET_COL
+
+# Several row groups and scan batches even on a small file
+ROW_GROUP_ROWS = 300
+SCAN_BATCH_ROWS = 128
+
+
+@pytest.fixture(scope="module")
+def backends(salary_csv, tmp_path_factory):
+    pandas_backend, encoders = open_backend(salary_csv, "pandas", watch_dir=str(tmp_path_factory.mktemp("none")))
+    path = csv_to_parquet(salary_csv, str(tmp_path_factory.mktemp("arrow") / "salaries.parquet"),
+                          row_group_rows=ROW_GROUP_ROWS)
+    return pandas_backend, ArrowBackend(path, encoders)
+
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch):
+    monkeypatch.setattr(salary_backend, "SCAN_BATCH_ROWS", SCAN_BATCH_ROWS)
+
+
+def _filter_cases(encoders):
+    exp = [str(c) for c in encoders["experience_level"].classes_]
+    jobs = [str(c) for c in encoders["job_title"].classes_]
+    return [{}, {"experience_level": exp[-1]}, {"job_title": jobs[0]},
+            {"job_title": jobs[1], "experience_level": exp[0]},
+            {"job_title": "Chief Vibes Officer"}]
+
+
+def _same(a, b):
+    if isinstance(a, dict):
+        assert a.keys() == b.keys()
+        for k in a:
+            _same(a[k], b[k])
+    elif isinstance(a, list):
+        assert len(a) == len(b)
+        for x, y in zip(a, b):
+            _same(x, y)
+    elif isinstance(a, np.ndarray):
+        np.testing.assert_allclose(a, b, rtol=1e-12)
+    else:
+        assert a == pytest.approx(b, rel=1e-12)
+
+
+def test_shape_and_encoders(backends, salary_csv):
+    pandas_backend, arrow_backend = backends
+    assert arrow_backend.n_rows == pandas_backend.n_rows
+    assert arrow_backend.columns == pandas_backend.columns
+    assert sorted(arrow_backend.numeric_columns) == sorted(pandas_backend.numeric_columns)
+    fitted = ArrowBackend(arrow_backend.path).fit_encoders()
+    for col in ENCODED_COLS:
+        assert list(fitted[col].classes_) == list(pandas_backend.encoders[col].classes_)
+        assert arrow_backend.distinct(col) == pandas_backend.distinct(col)
+
+
+def test_count_and_pages(backends):
+    pandas_backend, arrow_backend = backends
+    for filters in _filter_cases(pandas_backend.encoders):
+        n = pandas_backend.count(filters)
+        assert arrow_backend.count(filters) == n
+        # Pages crossing row-group boundaries, and one past the end
+        for start, stop in [(0, 50), (250, 650), (max(n - 7, 0), n + 10)]:
+            got = arrow_backend.page(filters, start, stop)
+            expected = pandas_backend.page(filters, start, stop)
+            assert len(got) == len(expected) == len(range(start, min(stop, n)))
+            pd.testing.assert_frame_equal(got.astype(str), expected.astype(str).reset_index(drop=True))
+
+
+@pytest.mark.parametrize("kind,cols", [
+    ("mean", ["job_title", TARGET_COL]),
+    ("mean", ["experience_level", TARGET_COL]),
+    ("counts", ["company_size"]),
+    ("counts", ["employee_residence"]),
+    ("hist", [TARGET_COL]),
+    ("box", ["experience_level", TARGET_COL]),
+])
+def test_aggregates(backends, kind, cols):
+    pandas_backend, arrow_backend = backends
+    for filters in _filter_cases(pandas_backend.encoders):
+        got = arrow_backend.aggregate(kind, cols, filters)
+        expected = pandas_backend.aggregate(kind, cols, filters)
+        if isinstance(expected, pd.Series):
+            # Label codes in the index; count ties may be listed in any order
+            got, expected = got.sort_index(), expected.sort_index()
+            np.testing.assert_array_equal(got.index.to_numpy(), expected.index.to_numpy())
+            _same(got.to_numpy(dtype=np.float64), expected.to_numpy(dtype=np.float64))
+        else:
+            _same(got, expected)
+
+
+def test_insights(backends):
+    pandas_backend, arrow_backend = backends
+    for filters in _filter_cases(pandas_backend.encoders):
+        got = arrow_backend.aggregate("insights", [], filters)
+        expected = pandas_backend.aggregate("insights", [], filters)
+        assert got.n_rows == expected.n_rows
+        for col in expected.group_cols:
+            size = len(pandas_backend.encoders[col].classes_)
+            for name in ("sums", "counts"):
+                a, b = np.zeros(size), np.zeros(size)
+                a[:len(getattr(got, name)[col])] = getattr(got, name)[col]
+                b[:len(getattr(expected, name)[col])] = getattr(expected, name)[col]
+                np.testing.assert_allclose(a, b, rtol=1e-12)
+            assert got.top_k(col) == expected.top_k(col)
+
+
+@pytest.mark.parametrize("n", [1, 500, 1999, 2000, 10_000])
+def test_sample_size(backends, n):
+    pandas_backend, arrow_backend = backends
+    for seed in range(5):
+        got, expected = arrow_backend.sample(n, seed), pandas_backend.sample(n, seed)
+        assert len(got) == len(expected) == min(n, pandas_backend.n_rows)
+        assert list(got.columns) == list(expected.columns)
+        assert arrow_backend.sample(n, seed).equals(got)
@@ -0,0 +1,85 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from salary_export import EXPORT_FORMATS, decode_chunk, export_frames, export_rows, format_for_path
+from salary_filter import FilterIndex
+
+CHUNK_ROWS = 300
+SUFFIX = {"csv": ".csv", "csv.gz": ".csv.gz", "parquet": ".parquet"}
+
+
+def _read(path, fmt):
+    if fmt == "parquet":
+        pytest.importorskip("pyarrow")
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def _as_text(frame):
+    return frame.reset_index(drop=True).astype(str)
+
+
+def test_decode_chunk_restores_labels(salary_frame):
+    df, encoders = salary_frame
+    chunk = df.iloc[100:400]
+    decoded = decode_chunk(chunk, encoders)
+    for col, encoder in encoders.items():
+        np.testing.assert_array_equal(decoded[col].astype(str).to_numpy(),
+                                      encoder.classes_[chunk[col].to_numpy()].astype(str))
+    # The encoded frame itself is left alone
+    assert df[list(encoders)].dtypes.map(lambda d: d.kind).eq("i").all()
+
+
+@pytest.mark.parametrize("fmt", list(EXPORT_FORMATS))
+def test_round_trip(salary_frame, tmp_path, fmt):
+    df, encoders = salary_frame
+    label = str(encoders["experience_level"].classes_[0])
+    rows = FilterIndex(df, encoders).select({"experience_level": label})
+    path = str(tmp_path / f"export{SUFFIX[fmt]}")
+    assert format_for_path(path) == fmt
+    seen = []
+    assert export_rows(df, rows, encoders, path, chunk_rows=CHUNK_ROWS, progress=lambda d, t: seen.append((d, t)))
+    back = _read(path, fmt)
+    assert (back["experience_level"] == label).all()
+    pd.testing.assert_frame_equal(_as_text(back), _as_text(decode_chunk(df.iloc[rows], encoders)))
+    assert seen[-1] == (len(rows), len(rows))
+    assert not os.path.exists(path + ".part")
+
+
+@pytest.mark.parametrize("fmt", list(EXPORT_FORMATS))
+def test_empty_selection_writes_header(salary_frame, tmp_path, fmt):
+    df, encoders = salary_frame
+    path = str(tmp_path / f"empty{SUFFIX[fmt]}")
+    assert export_rows(df, np.empty(0, dtype=np.int64), encoders, path)
+    back = _read(path, fmt)
+    assert len(back) == 0 and list(back.columns) == list(df.columns)
+
+
+@pytest.mark.parametrize("fmt", list(EXPORT_FORMATS))
+def test_cancel_leaves_nothing_behind(salary_frame, tmp_path, fmt):
+    df, encoders = salary_frame
+    path = str(tmp_path / f"cancelled{SUFFIX[fmt]}")
+    progress = []
+    ok = export_rows(df, np.arange(len(df)), encoders, path, chunk_rows=CHUNK_ROWS,
+                     progress=lambda done, total: progress.append(done),
+                     is_cancelled=lambda: len(progress) >= 2)
+    assert ok is False
+    assert progress == [CHUNK_ROWS, 2 * CHUNK_ROWS]
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize("fmt", list(EXPORT_FORMATS))
+def test_failure_leaves_nothing_behind(salary_frame, tmp_path, fmt):
+    df, encoders = salary_frame
+    path = str(tmp_path / f"failed{SUFFIX[fmt]}")
+
+    def chunks():
+        yield decode_chunk(df.iloc[:CHUNK_ROWS], encoders)
+        raise OSError("backend went away")
+
+    with pytest.raises(OSError):
+        export_frames(chunks(), len(df), list(df.columns), path)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+from salary_filter import FilterIndex, _mask_and_copy
+
+
+def _mask_rows(df, encoders, filters):
+    # Reference: one boolean mask per filter over the encoded frame
+    mask = np.ones(len(df), dtype=bool)
+    for col, label in filters.items():
+        if label in (None, "All"):
+            continue
+        classes = list(encoders[col].classes_)
+        if label not in classes:
+            return np.empty(0, dtype=np.int64)
+        mask &= df[col].to_numpy() == classes.index(label)
+    return np.flatnonzero(mask)
+
+
+def _labels(encoders, col):
+    return [str(c) for c in encoders[col].classes_]
+
+
+def test_single_filters_match_mask(salary_frame):
+    df, encoders = salary_frame
+    index = FilterIndex(df, encoders)
+    for col in ("job_title", "experience_level", "company_size", "employee_residence"):
+        for label in _labels(encoders, col):
+            filters = {col: label}
+            np.testing.assert_array_equal(index.select(filters), _mask_rows(df, encoders, filters))
+
+
+def test_combined_filters_match_mask_and_copy(salary_frame):
+    df, encoders = salary_frame
+    index = FilterIndex(df, encoders)
+    for job in ["All"] + _labels(encoders, "job_title"):
+        for exp in ["All"] + _labels(encoders, "experience_level"):
+            rows = index.select({"job_title": job, "experience_level": exp})
+            expected = _mask_and_copy(df, encoders, job, exp).index.to_numpy()
+            np.testing.assert_array_equal(rows, expected)
+
+
+def test_three_way_filter_matches_mask(salary_frame):
+    df, encoders = salary_frame
+    index = FilterIndex(df, encoders)
+    row = df.iloc[0]
+    filters = {col: str(encoders[col].classes_[row[col]])
+               for col in ("job_title", "company_size", "employment_type")}
+    rows = index.select(filters)
+    assert 0 in rows
+    np.testing.assert_array_equal(rows, _mask_rows(df, encoders, filters))
+
+
+def test_empty_result(salary_frame):
+    df, encoders = salary_frame
+    index = FilterIndex(df, encoders)
+    # A pair of labels that never occur together
+    seen = set(zip(df["job_title"], df["employee_residence"]))
+    pair = next((j, r) for j in range(len(encoders["job_title"].classes_))
+                for r in range(len(encoders["employee_residence"].classes_)) if (j, r) not in seen)
+    filters = {"job_title": _labels(encoders, "job_title")[pair[0]],
+               "employee_residence": _labels(encoders, "employee_residence")[pair[1]]}
+    assert len(_mask_rows(df, encoders, filters)) == 0
+    assert len(index.select(filters)) == 0
+
+
+@pytest.mark.parametrize("filters", [
+    {"job_title": "Chief Vibes Officer"},
+    {"job_title": "Chief Vibes Officer", "experience_level": "SE"},
+    {"experience_level": "SE", "company_size": "XXL"},
+])
+def test_unknown_label_selects_nothing(salary_frame, filters):
+    df, encoders = salary_frame
+    rows = FilterIndex(df, encoders).select(filters)
+    assert len(rows) == 0
+    assert len(_mask_rows(df, encoders, filters)) == 0
+
+
+def test_unfiltered_selects_everything(salary_frame):
+    df, encoders = salary_frame
+    index = FilterIndex(df, encoders)
+    np.testing.assert_array_equal(index.select({}), np.arange(len(df)))
+    np.testing.assert_array_equal(index.select({"job_title": "All", "experience_level": None}), np.arange(len(df)))
+
+
+def test_append_matches_mask_and_rebuild(salary_frame):
+    from salary_bench import generate_chunk
+    from salary_data import parse_csv_bytes
+    from salary_ingest import append_frame
+    from salary_model import encode_frame, extend_encoders
+    df, encoders = salary_frame
+    index = FilterIndex(df, encoders)
+    # Ingested rows, some with a label the index has not seen
+    raw = generate_chunk(np.random.default_rng(11), 300)
+    raw.loc[::4, "job_title"] = "Aardvark Wrangler"
+    new = parse_csv_bytes(raw.to_csv(index=False).encode())
+    extend_encoders(encoders, new)
+    encode_frame(new, encoders)
+    index.append(new, encoders)
+    merged = append_frame(df, new)
+
+    rebuilt = FilterIndex(merged, encoders)
+    assert index.n_rows == len(merged)
+    for col in index.codes:
+        np.testing.assert_array_equal(index.order[col], rebuilt.order[col])
+        np.testing.assert_array_equal(index.offsets[col], rebuilt.offsets[col])
+    for job in ["All"] + _labels(encoders, "job_title"):
+        for exp in ["All"] + _labels(encoders, "experience_level"):
+            rows = index.select({"job_title": job, "experience_level": exp})
+            np.testing.assert_array_equal(rows, _mask_and_copy(merged, encoders, job, exp).index.to_numpy())
+    assert len(index.select({"job_title": "Aardvark Wrangler"})) == 75
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from salary_forest import BATCH_ROWS, INTERVAL_QUANTILES, FlatForest, verify_against
+
+# Row counts on either side of BATCH_ROWS: the numpy walk and sklearn's apply
+PATHS = {"numpy": BATCH_ROWS // 4, "batch": BATCH_ROWS * 2}
+
+
+def _data(rng, n, nan_share=0.0):
+    # Label-code-like integer features with a noisy linear target
+    X = rng.integers(0, 12, size=(n, 6)).astype(np.float64)
+    y = X @ np.array([3.0, -1.0, 2.0, 0.5, 0.0, 1.5]) + rng.normal(0, 1, n)
+    if nan_share:
+        X[rng.random(X.shape) < nan_share] = np.nan
+    return X, y
+
+
+@pytest.fixture(scope="module", params=[0.0, 0.1], ids=["fit-dense", "fit-nan"])
+def model(request):
+    X, y = _data(np.random.default_rng(0), 800, request.param)
+    return RandomForestRegressor(n_estimators=20, max_depth=8, random_state=0).fit(X, y)
+
+
+def _expected_interval(model, X):
+    per_tree = np.stack([est.predict(X) for est in model.estimators_])
+    low, high = np.quantile(per_tree, INTERVAL_QUANTILES, axis=0)
+    return {"mean": model.predict(X), "low": low, "high": high, "std": per_tree.std(axis=0)}
+
+
+@pytest.mark.parametrize("nan_share", [0.0, 0.2], ids=["dense", "nan"])
+@pytest.mark.parametrize("path", PATHS)
+def test_predict_matches_sklearn(model, path, nan_share):
+    X, _ = _data(np.random.default_rng(1), PATHS[path], nan_share)
+    np.testing.assert_array_equal(FlatForest(model).predict(X), model.predict(X))
+    assert verify_against(model, X) == 0
+
+
+@pytest.mark.parametrize("nan_share", [0.0, 0.2], ids=["dense", "nan"])
+@pytest.mark.parametrize("path", PATHS)
+def test_predict_interval_matches_sklearn(model, path, nan_share):
+    X, _ = _data(np.random.default_rng(2), PATHS[path], nan_share)
+    got = FlatForest(model).predict_interval(X)
+    expected = _expected_interval(model, X)
+    for key in expected:
+        np.testing.assert_array_equal(got[key], expected[key], err_msg=key)
+
+
+def test_paths_agree_on_nan_rows(model):
+    X, _ = _data(np.random.default_rng(3), BATCH_ROWS * 2, 0.3)
+    flat = FlatForest(model)
+    batch = flat.predict(X)
+    small = np.concatenate([flat.predict(X[i:i + 16]) for i in range(0, len(X), 16)])
+    np.testing.assert_array_equal(small, batch)
+
+
+def test_cached_single_row(model):
+    X, _ = _data(np.random.default_rng(4), 5, 0.3)
+    flat = FlatForest(model)
+    for row in X:
+        assert flat.predict_one(tuple(row)) == model.predict(row[None, :])[0]
+        assert flat.interval_one(tuple(row))["mean"] == model.predict(row[None, :])[0]
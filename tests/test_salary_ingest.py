@@ -0,0 +1,116 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from salary_bench import generate_chunk, generate_salaries
+from salary_data import load_data
+from salary_ingest import Ingestor, append_frame
+from salary_model import CategoryEncoder, encode_frame, extend_encoders, fit_encoders
+
+NEW_JOB = "Aardvark Wrangler"  # sorts before every existing title
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    path = generate_salaries(str(tmp_path / "salaries.csv"), 400, seed=3)
+    os.makedirs(tmp_path / "incoming")
+    return path, str(tmp_path / "incoming")
+
+
+def _rows(seed, n, new_job=False):
+    frame = generate_chunk(np.random.default_rng(seed), n)
+    if new_job:
+        frame.loc[::3, "job_title"] = NEW_JOB
+    return frame
+
+
+def _write(path, frame, header=True, mode="w"):
+    with open(path, mode, newline="") as f:
+        frame.to_csv(f, index=False, header=header)
+
+
+def _columns(csv_path):
+    return list(load_data(csv_path).columns)
+
+
+def test_scan_reads_only_appended_bytes(dataset):
+    csv_path, watch = dataset
+    incoming = os.path.join(watch, "batch.csv")
+    first, second = _rows(1, 50), _rows(2, 30)
+    _write(incoming, first)
+    ingestor = Ingestor(csv_path, watch)
+    batches = ingestor.scan(_columns(csv_path))
+    assert [(b["start"], b["rows"]) for b in batches] == [(0, 50)]
+    ingestor.commit(batches)
+    assert ingestor.scan(_columns(csv_path)) == []
+
+    size = os.path.getsize(incoming)
+    _write(incoming, second, header=False, mode="a")
+    # A row still being written (no newline yet) is left for the next scan
+    with open(incoming, "a") as f:
+        f.write("2024,SE,FT,Data")
+    batches = ingestor.scan(_columns(csv_path))
+    assert [(b["start"], b["rows"]) for b in batches] == [(size, 30)]
+    assert batches[0]["end"] == os.path.getsize(incoming) - len("2024,SE,FT,Data")
+    got = batches[0]["frame"]
+    assert got["salary_in_usd"].tolist() == second["salary_in_usd"].tolist()
+    assert got["job_title"].astype(str).tolist() == second["job_title"].tolist()
+    ingestor.commit(batches)
+    assert ingestor.ledger["batch.csv"]["rows"] == 80
+
+
+@pytest.mark.parametrize("change", ["rewritten", "truncated"])
+def test_changed_file_is_dropped_not_half_read(dataset, change):
+    csv_path, watch = dataset
+    incoming = os.path.join(watch, "batch.csv")
+    _write(incoming, _rows(1, 50))
+    ingestor = Ingestor(csv_path, watch)
+    ingestor.commit(ingestor.scan(_columns(csv_path)))
+    if change == "rewritten":
+        _write(incoming, _rows(9, 80))
+    else:
+        _write(incoming, _rows(1, 20))
+
+    # While running: nothing from the changed file is applied
+    assert ingestor.scan(_columns(csv_path)) == []
+    assert any("rewritten" in w for w in ingestor.take_warnings())
+
+    # After a restart: its old rows are not replayed, and the file is then
+    # read again from the start as a new one
+    restarted = Ingestor(csv_path, watch)
+    assert restarted.replay(_columns(csv_path)) == []
+    assert "batch.csv" not in restarted.ledger
+    assert restarted.take_warnings()
+    batches = restarted.scan(_columns(csv_path))
+    assert [(b["start"], b["rows"]) for b in batches] == [(0, 80 if change == "rewritten" else 20)]
+
+
+def test_replay_restores_frame_and_codes(dataset):
+    csv_path, watch = dataset
+    columns = _columns(csv_path)
+    _write(os.path.join(watch, "a.csv"), _rows(1, 40, new_job=True))
+    _write(os.path.join(watch, "b.csv"), _rows(2, 25))
+
+    # First session: load, ingest, extend the encoders
+    base = load_data(csv_path)
+    encoders = fit_encoders(base)
+    ingestor = Ingestor(csv_path, watch)
+    batches = ingestor.scan(columns)
+    new = pd.concat([b["frame"] for b in batches], ignore_index=True)
+    live = append_frame(base, new)
+    extend_encoders(encoders, new)
+    ingestor.commit(batches)
+    saved = {col: list(enc.classes_) for col, enc in encoders.items()}
+    live_codes = encode_frame(live.copy(), encoders)
+
+    # Restart: replay the ledger, reuse the saved classes
+    restarted = Ingestor(csv_path, watch)
+    replayed = append_frame(load_data(csv_path), pd.concat(restarted.replay(columns), ignore_index=True))
+    pd.testing.assert_frame_equal(replayed, live)
+    reloaded = {col: CategoryEncoder(classes) for col, classes in saved.items()}
+    assert extend_encoders(reloaded, replayed) == {}
+    pd.testing.assert_frame_equal(encode_frame(replayed, reloaded), live_codes)
+    assert restarted.fingerprint("base") == ingestor.fingerprint("base") != "base"
+    assert restarted.scan(columns) == []
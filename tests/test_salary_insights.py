@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from salary_data import TARGET_COL
+from salary_insights import InsightStore
+
+GROUPS = ["job_title", "employee_residence"]
+
+
+def _expected(df, col, k):
+    means = df.groupby(col)[TARGET_COL].agg("mean").nlargest(k)
+    return [(int(c), float(m)) for c, m in means.items()]
+
+
+def _check(store, df, col, k):
+    got = store.top_k(col, k)
+    expected = _expected(df, col, k)
+    assert [c for c, _ in got] == [c for c, _ in expected]
+    assert [m for _, m in got] == pytest.approx([m for _, m in expected], rel=1e-12)
+
+
+@pytest.fixture
+def frame():
+    # Codes 2 and 7 never occur; codes 1, 4 and 6 tie on the mean
+    return pd.DataFrame({
+        "job_title": np.array([0, 1, 1, 3, 4, 5, 6, 6, 8, 9, 9, 0], dtype=np.int8),
+        "employee_residence": np.array([3, 3, 1, 1, 0, 0, 5, 5, 5, 2, 2, 2], dtype=np.int8),
+        TARGET_COL: np.array([50, 90, 110, 70, 100, 20, 80, 120, 10, 60, 60, 30], dtype=np.int64) * 1000,
+    })
+
+
+@pytest.mark.parametrize("k", [1, 2, 3, 5, 8, 20])
+@pytest.mark.parametrize("col", GROUPS)
+def test_top_k_matches_groupby(frame, col, k):
+    _check(InsightStore.from_frame(frame, group_cols=GROUPS), frame, col, k)
+
+
+def test_top_k_breaks_ties_by_code(frame):
+    store = InsightStore.from_frame(frame, group_cols=GROUPS)
+    assert [c for c, _ in store.top_k("job_title", 2)] == [1, 4]
+    assert [c for c, _ in store.top_k("job_title", 3)] == [1, 4, 6]
+
+
+def test_top_k_with_many_ties():
+    codes = np.arange(60, dtype=np.int16)
+    df = pd.DataFrame({"job_title": codes, "employee_residence": codes[::-1],
+                       TARGET_COL: np.where(codes % 3 == 0, 90_000, 50_000)})
+    store = InsightStore.from_frame(df, group_cols=GROUPS)
+    for col in GROUPS:
+        for k in (5, 20, 25):
+            _check(store, df, col, k)
+
+
+def test_top_k_skips_empty_groups(frame):
+    store = InsightStore.from_frame(frame, group_cols=GROUPS)
+    codes = [c for c, _ in store.top_k("job_title", 20)]
+    assert 2 not in codes and 7 not in codes
+    assert len(codes) == store.distinct("job_title") == frame["job_title"].nunique()
+
+
+def test_top_k_after_append(frame):
+    store = InsightStore.from_frame(frame.iloc[:6], group_cols=GROUPS)
+    store.top_k("job_title", 3)
+    store.append(frame.iloc[6:0])  # empty append keeps the cache valid
+    store.append(frame.iloc[6:])
+    for col in GROUPS:
+        _check(store, frame, col, 3)
+
+
+def test_top_k_on_random_frame():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "job_title": rng.integers(0, 40, 2_000).astype(np.int16),
+        "employee_residence": rng.choice([0, 3, 5, 11], 2_000).astype(np.int16),
+        TARGET_COL: rng.integers(20, 400, 2_000) * 1000,
+    })
+    store = InsightStore.from_frame(df, group_cols=GROUPS)
+    for col in GROUPS:
+        for k in (1, 5, 10):
+            _check(store, df, col, k)
+
+
+def test_top_k_on_empty_store():
+    assert InsightStore(group_cols=GROUPS).top_k("job_title", 5) == []
@@ -0,0 +1,61 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from salary_data import ENCODED_COLS
+from salary_model import CategoryEncoder, ModelStore, extend_encoders, fit_encoders, train_model
+
+
+def test_extend_keeps_existing_codes():
+    old = pd.Series(["Data Scientist", "ML Engineer", "Analyst", "ML Engineer"], dtype="category")
+    encoder = CategoryEncoder().fit(old)
+    before = encoder.transform(old)
+    # New labels sort before, between and after the existing ones
+    added = encoder.extend(pd.Series(["Aardvark", "ML Engineer", "Kernel Hacker", "Zookeeper"]))
+    assert added == ["Aardvark", "Kernel Hacker", "Zookeeper"]
+    np.testing.assert_array_equal(encoder.transform(old), before)
+    assert list(encoder.classes_[:3]) == ["Analyst", "Data Scientist", "ML Engineer"]
+    fresh = pd.Series(["Aardvark", "Zookeeper", "Kernel Hacker"])
+    np.testing.assert_array_equal(encoder.transform(fresh), [3, 5, 4])
+    assert encoder.extend(["Analyst", "Zookeeper"]) == []
+
+
+def test_extend_encoders_reports_only_grown_columns(salary_frame):
+    df, encoders = salary_frame
+    raw = pd.DataFrame({col: [str(encoders[col].classes_[0])] for col in encoders})
+    raw["job_title"] = ["Aardvark"]
+    sizes = {col: len(enc.classes_) for col, enc in encoders.items()}
+    before = df.copy()
+    assert extend_encoders(encoders, raw) == {"job_title": ["Aardvark"]}
+    grown = {col: len(enc.classes_) for col, enc in encoders.items()}
+    assert grown == dict(sizes, job_title=sizes["job_title"] + 1)
+    for col in encoders:
+        decoded = encoders[col].classes_[before[col].to_numpy()]
+        np.testing.assert_array_equal(encoders[col].transform(pd.Series(decoded)), before[col].to_numpy())
+
+
+def test_fit_matches_sorted_labels():
+    frame = pd.DataFrame({col: ["b", "a", "c"] for col in ENCODED_COLS})
+    for enc in fit_encoders(frame).values():
+        assert list(enc.classes_) == ["a", "b", "c"]
+
+
+def test_save_uses_per_process_temp_names(salary_frame, tmp_path, monkeypatch):
+    df, encoders = salary_frame
+    model = train_model(df.iloc[:300], {"n_estimators": 3, "random_state": 0}, n_jobs=1)
+    store = ModelStore(str(tmp_path))
+    replaced, replace = [], os.replace
+    monkeypatch.setattr(os, "replace", lambda src, dst: (replaced.append((src, dst)), replace(src, dst)))
+    path = store.save("k", encoders, model)
+    store.promote({"n_estimators": 3})
+    pid = os.getpid()
+    assert replaced == [(f"{store.encoders_path('k')}.{pid}.tmp", store.encoders_path("k")),
+                        (f"{path}.{pid}.tmp", path),
+                        (f"{store.params_path()}.{pid}.tmp", store.params_path())]
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+    loaded, _ = store.load("k")
+    for col in ENCODED_COLS:
+        assert list(store.load_encoders("k")[col].classes_) == list(encoders[col].classes_)
+        assert list(loaded[col].classes_) == list(encoders[col].classes_)
+    assert store.active_params() == {"n_estimators": 3}
@@ -0,0 +1,185 @@
+import json
+import asyncio
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from salary_aggregates import AggregateCache
+from salary_data import FEATURE_COLS, TARGET_COL
+from salary_insights import InsightStore, peer_median
+from salary_service import AnalyticsService, RemoteBackend, ServiceError, decode_value, dumps, encode_value
+
+
+@pytest.fixture(scope="module")
+def service(salary_csv):
+    return AnalyticsService(salary_csv, backend="pandas", workers=2)
+
+
+@pytest.fixture(scope="module")
+def url(service):
+    # serve() on its own loop in a thread, on a free port
+    state, started = {}, threading.Event()
+
+    def ready(server):
+        state["port"] = server.sockets[0].getsockname()[1]
+        started.set()
+
+    def run():
+        loop = state["loop"] = asyncio.new_event_loop()
+        state["task"] = loop.create_task(service.serve("127.0.0.1", 0, ready))
+        try:
+            loop.run_until_complete(state["task"])
+        except asyncio.CancelledError:
+            pass
+        finally:
+            loop.close()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert started.wait(30)
+    yield f"http://127.0.0.1:{state['port']}"
+    state["loop"].call_soon_threadsafe(state["task"].cancel)
+    thread.join(10)
+
+
+@pytest.fixture
+def client(url):
+    client = RemoteBackend(url)
+    yield client
+    client._local.conn.close()
+
+
+def _valid_codes(service):
+    return [0 if col not in service.encoders else len(service.encoders[col].classes_) - 1 for col in FEATURE_COLS]
+
+
+@pytest.mark.parametrize("col", ["job_title", "experience_level", "company_location"])
+def test_codes_outside_encoder_are_rejected(service, client, col):
+    j = FEATURE_COLS.index(col)
+    for bad in (-1, len(service.encoders[col].classes_)):
+        row = _valid_codes(service)
+        row[j] = bad
+        with pytest.raises(ValueError, match=f"Unknown code in {col}"):
+            service.features({"codes": [row]})
+        with pytest.raises(ServiceError, match=f"Unknown code in {col}"):
+            client.predict_codes([row])
+
+
+def test_valid_codes_match_labels(service, client):
+    row = _valid_codes(service)
+    labels = {col: (str(service.encoders[col].classes_[code]) if col in service.encoders else code)
+              for col, code in zip(FEATURE_COLS, row)}
+    by_label = client._request("POST", "/predict", body=json.dumps({"rows": [labels]}).encode())
+    assert client.predict_codes([row]) == by_label["predictions"]
+
+
+def test_peer_median_ignores_negative_codes():
+    table = np.arange(6, dtype=np.float64).reshape(2, 3)
+    assert peer_median(table, 1, 2) == 5.0
+    assert peer_median(table, -1, 0) is None
+    assert peer_median(table, 0, -1) is None
+    assert peer_median(table, 2, 0) is None
+
+
+def _round_trip(value):
+    return decode_value(json.loads(dumps(encode_value(value))))
+
+
+def test_wire_round_trip_series_and_arrays():
+    series = pd.Series([1.5, np.nan, 3.0], index=pd.Index(["SE", "MI", "EN"], name="experience_level"),
+                       name=TARGET_COL)
+    pd.testing.assert_series_equal(_round_trip(series), series)
+    counts = pd.Series(np.array([4, 0, 7], dtype=np.int64), index=pd.Index([0, 1, 2], name="job_title"))
+    pd.testing.assert_series_equal(_round_trip(counts), counts)
+    for array in (np.arange(5, dtype=np.int16), np.array([0.25, np.inf, -1.0]), np.zeros(0)):
+        got = _round_trip(array)
+        assert got.dtype == array.dtype
+        np.testing.assert_array_equal(got, array)
+
+
+def test_wire_round_trip_frame_and_containers():
+    frame = pd.DataFrame({"job_title": ["Data Scientist", "ML Engineer"], "work_year": [2023, 2024],
+                          TARGET_COL: [120_000.5, 98_000.0]})
+    got = _round_trip(frame)
+    pd.testing.assert_frame_equal(got, frame)
+    nested = {"counts": [np.int64(3), np.float64(2.5)], "array": np.arange(3), "label": "SE", "none": None}
+    got = _round_trip(nested)
+    assert got["counts"] == [3, 2.5] and got["label"] == "SE" and got["none"] is None
+    np.testing.assert_array_equal(got["array"], np.arange(3))
+
+
+def test_wire_round_trip_insight_store():
+    df = pd.DataFrame({"job_title": np.array([0, 2, 2], dtype=np.int8),
+                       "employee_residence": np.array([1, 1, 0], dtype=np.int8),
+                       "company_location": np.array([3, 0, 3], dtype=np.int8),
+                       TARGET_COL: [100_000, 50_000, 70_000]})
+    store = InsightStore.from_frame(df)
+    got = _round_trip(store)
+    assert isinstance(got, InsightStore) and got.n_rows == store.n_rows and got.group_cols == store.group_cols
+    for col in store.group_cols:
+        np.testing.assert_array_equal(got.sums[col], store.sums[col])
+        np.testing.assert_array_equal(got.counts[col], store.counts[col])
+        assert got.top_k(col, 2) == store.top_k(col, 2)
+
+
+def _counting(calls, body=b"{}", delay=0.05):
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return body
+    return compute
+
+
+@pytest.mark.parametrize("cache", [True, False], ids=["cache", "no-cache"])
+def test_concurrent_identical_misses_compute_once(service, monkeypatch, cache):
+    monkeypatch.setattr(service, "cache", AggregateCache() if cache else None)
+    calls = []
+
+    async def run():
+        compute = _counting(calls)
+        bodies = await asyncio.gather(*(service.cached(("/probe",), compute) for _ in range(8)))
+        assert service.inflight == {}
+        return bodies, await service.cached(("/probe",), compute)
+
+    bodies, again = asyncio.run(run())
+    assert bodies == [b"{}"] * 8 and again == b"{}"
+    # A later call is a cache hit, or a new computation without the cache
+    assert len(calls) == (1 if cache else 2)
+
+
+def test_single_flight_shares_errors(service, monkeypatch):
+    monkeypatch.setattr(service, "cache", AggregateCache())
+
+    async def fail():
+        await asyncio.sleep(0.05)
+        raise ValueError("boom")
+
+    async def run():
+        return await asyncio.gather(*(service.cached(("/fail",), fail) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert service.inflight == {} and service.cache.get(("/fail",)) is None
+
+
+def test_dispatch_runs_one_handler_for_identical_requests(service, monkeypatch):
+    monkeypatch.setattr(service, "cache", AggregateCache())
+    calls, count = [], service.count
+
+    def slow_count(params):
+        calls.append(params)
+        threading.Event().wait(0.1)
+        return count(params)
+
+    monkeypatch.setattr(service, "count", slow_count)
+
+    async def run():
+        return await asyncio.gather(*(service.dispatch("GET", "/count?experience_level=SE", b"")
+                                      for _ in range(6)),
+                                    service.dispatch("GET", "/count?experience_level=MI", b""))
+
+    bodies = asyncio.run(run())
+    assert len(set(bodies[:6])) == 1 and len(calls) == 2
+    assert json.loads(bodies[0])["count"] == service.backend.count({"experience_level": "SE"})
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from salary_summaries import MAX_BINS, MAX_FLIERS, binned_kde, box_summary, histogram_summary
+
+
+def _salaries(rng, n):
+    return np.round(rng.lognormal(11.5, 0.45, n), -2)
+
+
+def _direct_kde(values, xs):
+    # O(n * grid) Gaussian KDE with the same Scott bandwidth
+    bw = values.std(ddof=1) * len(values) ** (-1 / 5)
+    z = (xs[:, None] - values[None, :]) / bw
+    return np.exp(-0.5 * z ** 2).sum(axis=1) / (len(values) * bw * np.sqrt(2 * np.pi))
+
+
+@pytest.mark.parametrize("n", [50, 2_000, 40_000])
+def test_histogram_matches_numpy(n):
+    values = _salaries(np.random.default_rng(n), n)
+    summary = histogram_summary(pd.Series(values))
+    expected_edges = np.histogram_bin_edges(values, bins="auto")
+    if len(expected_edges) - 1 > MAX_BINS:
+        expected_edges = np.linspace(values.min(), values.max(), MAX_BINS + 1)
+    counts, edges = np.histogram(values, bins=expected_edges)
+    np.testing.assert_array_equal(summary["edges"], edges)
+    np.testing.assert_array_equal(summary["counts"], counts)
+    assert summary["n"] == n == summary["counts"].sum()
+
+
+def test_histogram_caps_bins_and_skips_gaps():
+    values = np.concatenate([_salaries(np.random.default_rng(0), 200_000), [5e6], [np.nan] * 10])
+    summary = histogram_summary(pd.Series(values))
+    assert len(summary["counts"]) == MAX_BINS
+    np.testing.assert_array_equal(summary["counts"], np.histogram(values[:-10], bins=summary["edges"])[0])
+    assert summary["n"] == len(values) - 10
+
+
+@pytest.mark.parametrize("n", [200, 5_000])
+def test_fft_kde_matches_direct_kde(n):
+    values = _salaries(np.random.default_rng(7), n)
+    xs, dens = binned_kde(values, values.min(), values.max())
+    expected = _direct_kde(values, xs)
+    np.testing.assert_allclose(dens, expected, rtol=0, atol=2e-3 * expected.max())
+    # The curve is a density over the padded grid
+    assert np.trapezoid(dens, xs) == pytest.approx(1.0, abs=2e-3)
+
+
+def test_histogram_kde_is_scaled_to_counts():
+    values = _salaries(np.random.default_rng(3), 3_000)
+    summary = histogram_summary(pd.Series(values))
+    width = summary["edges"][1] - summary["edges"][0]
+    assert summary["kde_x"].min() >= values.min() and summary["kde_x"].max() <= values.max()
+    expected = _direct_kde(values, summary["kde_x"]) * len(values) * width
+    np.testing.assert_allclose(summary["kde_y"], expected, rtol=0, atol=2e-3 * expected.max())
+
+
+def test_degenerate_histograms():
+    empty = histogram_summary(pd.Series([], dtype=np.float64))
+    assert empty["n"] == 0 and len(empty["kde_x"]) == 0
+    constant = histogram_summary(pd.Series([100_000.0] * 20))
+    assert constant["counts"].sum() == 20 and len(constant["kde_x"]) == 0
+
+
+def test_box_matches_percentile_and_matplotlib():
+    cbook = pytest.importorskip("matplotlib.cbook")
+    rng = np.random.default_rng(5)
+    groups = np.array(["EN", "MI", "SE", "EX"])[rng.integers(0, 4, 600)]
+    values = _salaries(rng, 600)
+    values[:5] = [1e6, 2e6, 5e3, 4e3, 3e6]  # outliers on both sides
+    df = pd.DataFrame({"experience_level": groups, "salary_in_usd": values})
+    stats = box_summary(df, "experience_level", "salary_in_usd")
+    assert [s["label"] for s in stats] == sorted(set(groups))
+    for s in stats:
+        v = values[groups == s["label"]]
+        q1, med, q3 = np.percentile(v, [25, 50, 75])
+        assert (s["q1"], s["med"], s["q3"]) == pytest.approx((q1, med, q3), rel=1e-12)
+        (ref,) = cbook.boxplot_stats(v, whis=1.5)
+        assert s["whislo"] == ref["whislo"] and s["whishi"] == ref["whishi"]
+        assert len(ref["fliers"]) <= MAX_FLIERS
+        np.testing.assert_array_equal(np.sort(s["fliers"]), np.sort(ref["fliers"]))
+        assert s["n"] == len(v)
+
+
+def test_box_thins_fliers_and_skips_missing():
+    rng = np.random.default_rng(9)
+    values = np.concatenate([100_000.0 + rng.normal(0, 10, 900), rng.uniform(1e6, 2e6, 100)])
+    df = pd.DataFrame({"g": ["a"] * 1000 + ["b"], "v": np.append(values, np.nan)})
+    (stats,) = box_summary(df, "g", "v")
+    assert stats["n"] == 1000 and len(stats["fliers"]) == MAX_FLIERS
+    assert stats["fliers"].max() == values.max()